@@ -0,0 +1,108 @@
+"""Benchmark of the itemgetter extraction against the generic extraction path
+
+Usage : python benchmarks/bench_extraction.py [number of matches]
+"""
+import json
+import os
+import sys
+import timeit
+
+# The benchmark runs against the sources of the repository, installed or not
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from solari import Leona
+from solari.stats import (
+    ChampionPickrate, ChampionWinrate, ChampionBanrate, ChampionPresenceRate, ChampionPickCount,
+    ChampionKDA, ChampionKillParticipation, ItemPickrate, ItemWinrate, PlayerWinrate
+)
+
+CONFIGURATIONS = {
+    "champion rates":lambda: [
+        ChampionPickrate(), ChampionBanrate(), ChampionWinrate(), ChampionPresenceRate(), ChampionPickCount()
+    ],
+    "champion rates by league":lambda: [
+        ChampionPickrate(by_league=True), ChampionBanrate(by_league=True), ChampionWinrate(by_league=True)
+    ],
+    "mixed":lambda: [
+        ChampionPickrate(), ChampionKDA(), ChampionKillParticipation(), ItemPickrate(), ItemWinrate(), PlayerWinrate()
+    ],
+}
+
+def extract_generic(extractor, matches):
+    """Extract the required fields from a batch of matches, field by field for each match
+    
+    Reference the extraction of the configuration getters is benchmarked against.
+    
+    Parameters
+    ----------
+    extractor : FieldExtractor
+        Extractor giving the fields of the configuration
+        
+    matches : list of dict
+        Raw data from Riot API match-v4 endpoint
+        
+    Returns
+    -------
+    participants : dict
+        Dict matching each field to the list of its values, one per participant
+        
+    bans : dict
+        Dict matching each field to the list of its values, one per ban
+    """
+    participant_fields = extractor._participant_fields
+    stats_fields = extractor._stats_fields
+    game_fields = extractor._game_fields
+    id_fields = extractor._id_fields
+    ban_fields = extractor._ban_fields
+    
+    participants = {f:[] for f in participant_fields + stats_fields + game_fields + id_fields}
+    bans = {f:[] for f in ban_fields}
+    
+    for match_data in matches:
+        match_participants = match_data["participants"]
+        
+        players = {}
+        if len(id_fields) > 0:
+            players = {p["participantId"]:p["player"] for p in match_data["participantIdentities"]}
+        
+        for f in participant_fields:
+            participants[f].extend([p[f] for p in match_participants])
+        for f in stats_fields:
+            participants[f].extend([p["stats"][f] for p in match_participants])
+        for f in game_fields:
+            participants[f].extend([match_data[f]] * len(match_participants))
+        for f in id_fields:
+            participants[f].extend([players[p["participantId"]][f] for p in match_participants])
+        
+        if len(ban_fields) > 0:
+            match_bans = [b for t in match_data["teams"] for b in t["bans"]]
+            for f in ban_fields:
+                if f == "gameId":
+                    bans[f].extend([match_data["gameId"]] * len(match_bans))
+                elif f in id_fields:
+                    bans[f].extend([players[b["pickTurn"]][f] for b in match_bans])
+                else:
+                    bans[f].extend([b[f] for b in match_bans])
+    
+    return participants, bans
+
+def load_matches(n):
+    with open(os.path.join(os.path.dirname(__file__), "..", "tests", "data", "match_set_2.json"), "r") as f:
+        matches = json.load(f)
+    return (matches * (n // len(matches) + 1))[:n]
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 10000
+    matches = load_matches(n)
+    
+    print("%d matches" % n)
+    for name, stats in CONFIGURATIONS.items():
+        extractor = Leona(stats())._extractor
+        
+        generic = min(timeit.repeat(lambda: extract_generic(extractor, matches), number=1, repeat=5))
+        fast = min(timeit.repeat(lambda: extractor._extract_fast(matches), number=1, repeat=5))
+        
+        print("%-26s generic %8.1f ms   fast %8.1f ms   x%.2f" % (name, generic * 1000, fast * 1000, generic / fast))
+
+if __name__ == "__main__":
+    main()
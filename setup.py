@@ -11,7 +11,8 @@ setup(
     packages=find_packages(),
     python_requires='>=3.8',
     version="0.2.0",
-    install_requires=["pandas","sortedcontainers"],
+    install_requires=["numpy","pandas","sortedcontainers"],
+    extras_require={"zstd":["zstandard"]},
     description="Library for high level statistical analysis on bulk match data",
     long_description=long_description,
     long_description_content_type="text/markdown",
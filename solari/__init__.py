@@ -1 +1,3 @@
-from .solari import Leona
\ No newline at end of file
+from .solari import Leona
+from .async_leona import AsyncLeona
+from .checkpoint import CheckpointedIngestion
\ No newline at end of file
@@ -0,0 +1,168 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
+from .solari import Leona
+
+class AsyncLeona:
+    """Asyncio front-end for Leona
+    
+    Matches are consumed from an async iterator through a bounded queue, and pushed off the event loop.
+    When the queue is full, the iterator is not read anymore until batches are processed, so pending matches can't grow memory without bound.
+    
+    All the operations on the underlying Leona instance run one at a time in a dedicated thread.
+
+    Parameters
+    ----------
+    stats : list of Stats
+        List of all instantiated Stats to be computed
+        
+    batch_size : int
+        Number of matches processed at once
+        
+    queue_size : int
+        Maximum number of batches waiting to be processed
+        
+    **options
+        Keyword arguments of the Leona instance, such as spill_threshold, keep_rows, window or partition_by
+    ...
+    Methods
+    -------
+    push_match(match_data)
+        Forward the raw match data from Riot API to Leona
+        
+    push_matches(matches)
+        Consume an async iterable of raw match data and forward them by batches to Leona
+        
+    push_league(league_data)
+        Process the league_data according to create a list of players ranks
+        
+    set_players_rank(players_rank)
+        Provide directly the players rank
+        
+    get_stats(key=None)
+        Return a list of key:DataFrame giving the computed stats
+    """
+    
+    def __init__(self, stats, batch_size=100, queue_size=4, **options):
+        self._leona = Leona(stats, **options)
+        self._batch_size = batch_size
+        self._queue_size = queue_size
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="solari")
+        
+    @property
+    def leona(self):
+        """The underlying Leona instance"""
+        return self._leona
+        
+    async def _run(self, function, *args):
+        """Run a function in the dedicated thread"""
+        return await asyncio.get_running_loop().run_in_executor(self._executor, function, *args)
+        
+    async def push_match(self, match_data):
+        """Forward the raw match data from Riot API to Leona
+
+        Parameters
+        ----------
+        match_data : dict
+            Raw data from Riot API match-v4 endpoint
+        """
+        await self._run(self._leona.push_match, match_data)
+        
+    async def push_matches(self, matches):
+        """Consume an iterable of raw match data and forward them by batches to Leona
+        
+        Reading the matches and processing them overlap.
+
+        Parameters
+        ----------
+        matches : async iterable or iterable of dict
+            Raw data from Riot API match-v4 endpoint
+        """
+        queue = asyncio.Queue(maxsize=self._queue_size)
+        producer = asyncio.ensure_future(self._produce(matches, queue))
+        
+        try:
+            while (batch := await queue.get()) is not None:
+                await self._run(self._leona.push_matches, batch, len(batch))
+        except BaseException:
+            # Unblock the producer so it can be cancelled cleanly
+            producer.cancel()
+            while not queue.empty():
+                queue.get_nowait()
+            await asyncio.gather(producer, return_exceptions=True)
+            raise
+        
+        # Raise the exceptions of the iterator, if any
+        await producer
+        
+    async def _produce(self, matches, queue):
+        """Read the matches and put them by batches in the queue, ended by None
+        
+        Parameters
+        ----------
+        matches : async iterable or iterable of dict
+            Raw data from Riot API match-v4 endpoint
+            
+        queue : asyncio.Queue
+            Queue receiving the batches
+        """
+        try:
+            if hasattr(matches, "__aiter__"):
+                batch = []
+                async for m in matches:
+                    batch.append(m)
+                    if len(batch) == self._batch_size:
+                        await queue.put(batch)
+                        batch = []
+                if len(batch) > 0:
+                    await queue.put(batch)
+            else:
+                matches = iter(matches)
+                while batch := list(islice(matches, self._batch_size)):
+                    await queue.put(batch)
+        finally:
+            await queue.put(None)
+            
+    async def push_league(self, league_data):
+        """Process the league_data according to create a list of players ranks
+        
+        Parameters
+        ----------
+        league_data : dict
+            Raw data from Riot API league-v4 endpoint
+        """
+        await self._run(self._leona.push_league, league_data)
+        
+    async def set_players_rank(self, players_rank):
+        """Provide directly the players rank
+        
+        Parameters
+        ----------
+        players_rank : dict
+            Dict containing the rank of each summoner
+        """
+        await self._run(self._leona.set_players_rank, players_rank)
+        
+    async def get_stats(self, key=None):
+        """Return a list of key:DataFrame giving the computed stats
+        
+        Parameters
+        ----------
+        key : tuple
+            Specific key to consider when computing and returning stats.
+            
+        Raises
+        ------
+        NoMatchPushed
+            If no match has been pushed (then no stats)
+        
+        Returns
+        -------
+        stats : DataFrame or dict<key,DataFrame>
+            The computed stats
+        """
+        return await self._run(self._leona.get_stats, key)
+    
+    def close(self):
+        """Stop the dedicated thread once the pending operations are done"""
+        self._executor.shutdown(wait=True)
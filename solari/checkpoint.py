@@ -0,0 +1,186 @@
+import os
+import time
+from itertools import islice
+from .solari import Leona
+from .exceptions import MismatchingLeona
+from .snapshot import SnapshotWriter
+from .streams import iter_matches
+
+class CheckpointedIngestion:
+    """Ingestion of matches into a Leona instance, resumed from its last checkpoint when restarted
+
+    Checkpoints are snapshots of the Leona instance, written in the same directory every checkpoint_matches matches or checkpoint_seconds seconds.
+    Each checkpoint only writes the rows pushed since the previous one, so writing it doesn't stall the ingestion.
+
+    Each input is named by a source, the path for files. A checkpoint records the offset of each source:
+    the number of matches consumed, the gameId of the last one, and whether the source was fully consumed.
+    When restarted, the Leona instance is read from the last checkpoint, and the matches already consumed are skipped without being pushed.
+    Skipping the matches of a file still decodes them, as the position in a compressed stream can't be sought.
+
+    Parameters
+    ----------
+    path : string
+        Directory of the checkpoints
+
+    stats : list of Stats
+        List of all instantiated Stats to be computed
+
+    checkpoint_matches : int, optional
+        Default at 100000, number of matches pushed between two checkpoints
+
+    checkpoint_seconds : number, optional
+        Time between two checkpoints, in seconds
+
+    batch_size : int
+        Number of matches processed at once, checkpoints being written between batches
+
+    **options
+        Keyword arguments of the Leona instance
+
+    Raises
+    ------
+    MismatchingLeona
+        If the last checkpoint holds a Leona instance with another configuration
+    ...
+    Methods
+    -------
+    push_matches(matches, source="matches")
+        Push the matches of a source not consumed yet, writing checkpoints along the way
+
+    push_match_file(path)
+        Push the matches of a file not consumed yet, writing checkpoints along the way
+
+    push_match_files(paths)
+        Push the matches of many files not consumed yet, writing checkpoints along the way
+
+    checkpoint()
+        Write a checkpoint now
+
+    get_offset(source)
+        Return the offset of a source recorded by the last checkpoint
+    """
+
+    def __init__(self, path, stats, checkpoint_matches=100000, checkpoint_seconds=None, batch_size=1000, **options):
+        self._writer = SnapshotWriter(path)
+        self._checkpoint_matches = checkpoint_matches
+        self._checkpoint_seconds = checkpoint_seconds
+        self._batch_size = batch_size
+
+        if self._writer.exists():
+            self._leona, info = self._writer.read()
+            self._offsets = info["offsets"]
+            if not self._leona._same_configuration(Leona(stats, **options)):
+                raise MismatchingLeona()
+        else:
+            self._leona = Leona(stats, **options)
+            self._offsets = {}
+
+        self._pending = 0
+        self._last_checkpoint = time.monotonic()
+
+    @property
+    def leona(self):
+        """The Leona instance the matches are pushed to"""
+        return self._leona
+
+    def get_offset(self, source):
+        """Return the offset of a source
+
+        Parameters
+        ----------
+        source : string
+            Name of the source
+
+        Returns
+        -------
+        offset : dict or None
+            Number of matches consumed ("matches"), gameId of the last one ("gameId"), and if all of them were ("done"),
+            None if no match of the source was consumed
+        """
+        if source not in self._offsets:
+            return None
+        return dict(self._offsets[source])
+
+    def push_matches(self, matches, source="matches"):
+        """Push the matches of a source not consumed yet, writing checkpoints along the way
+
+        When resuming, the source must give the same matches in the same order, the ones already consumed being skipped.
+        The gameId of the last match skipped is checked against the one recorded by the checkpoint.
+        A checkpoint is written once the source is fully consumed.
+
+        Parameters
+        ----------
+        matches : iterable of dict
+            Raw data from Riot API match-v4 endpoint, can be a generator
+
+        source : string
+            Name of the source, each source of the ingestion having its own offset
+
+        Raises
+        ------
+        ValueError
+            If the last match consumed isn't the one recorded by the checkpoint, the source having changed
+        """
+        offset = self._offsets.setdefault(source, {"matches":0, "gameId":None, "done":False})
+        if offset["done"]:
+            return
+
+        matches = iter(matches)
+        if offset["matches"] > 0:
+            last = next(islice(matches, offset["matches"] - 1, None), None)
+            if last is None or last["gameId"] != offset["gameId"]:
+                raise ValueError("Source %s doesn't give the matches it gave before the checkpoint." % source)
+
+        while batch := list(islice(matches, self._batch_size)):
+            self._leona.push_matches(batch, self._batch_size)
+
+            offset["matches"] += len(batch)
+            offset["gameId"] = batch[-1]["gameId"]
+            self._pending += len(batch)
+
+            if self._should_checkpoint():
+                self.checkpoint()
+
+        offset["done"] = True
+        self.checkpoint()
+
+    def push_match_file(self, path):
+        """Push the matches of a file not consumed yet, writing checkpoints along the way
+
+        The file can contain a JSON array of matches or one match per line, and can be compressed (gzip, bz2, xz, zstd).
+        The source of the matches is the absolute path of the file.
+
+        Parameters
+        ----------
+        path : string
+            Path to the file containing raw data from Riot API match-v4 endpoint
+        """
+        source = os.path.abspath(path)
+        if source in self._offsets and self._offsets[source]["done"]:
+            return
+
+        with open(path, "rb") as f:
+            self.push_matches(iter_matches(f), source)
+
+    def push_match_files(self, paths):
+        """Push the matches of many files not consumed yet, writing checkpoints along the way
+
+        Parameters
+        ----------
+        paths : list of strings
+            Paths to the files containing raw data from Riot API match-v4 endpoint
+        """
+        for path in paths:
+            self.push_match_file(path)
+
+    def checkpoint(self):
+        """Write a checkpoint now, recording the offset of each source"""
+        self._writer.write(self._leona, {"offsets":self._offsets})
+        self._pending = 0
+        self._last_checkpoint = time.monotonic()
+
+    def _should_checkpoint(self):
+        """Return if enough matches were pushed, or enough time passed, since the last checkpoint"""
+        if self._checkpoint_matches is not None and self._pending >= self._checkpoint_matches:
+            return True
+        return self._checkpoint_seconds is not None and time.monotonic() - self._last_checkpoint >= self._checkpoint_seconds
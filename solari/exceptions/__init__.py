@@ -1 +1 @@
-from .leona_exceptions import NoMatchPushed, MissingRequiredStats, MismatchingLeona
\ No newline at end of file
+from .leona_exceptions import NoMatchPushed, MissingRequiredStats, MismatchingLeona, RedundantAggregatedGames, UnsupportedSnapshot
\ No newline at end of file
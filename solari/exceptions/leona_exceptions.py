@@ -18,4 +18,18 @@ class MismatchingLeona(Exception):
     """
     def __init__(self):
         Exception.__init__(self, " The given Leona instance has another configuration.")
-    
\ No newline at end of file
+    
+        
+class RedundantAggregatedGames(Exception):
+    """
+    Redundant games can't be removed from the given Leona instance, as only their aggregates were kept
+    """
+    def __init__(self):
+        Exception.__init__(self, "Redundant games were already aggregated in the given Leona instance and can't be removed.")
+        
+class UnsupportedSnapshot(Exception):
+    """
+    The snapshot was not written by save, or by a version of its format that can't be read
+    """
+    def __init__(self):
+        Exception.__init__(self, "The snapshot can't be read, it is missing or has an unsupported format.")
@@ -0,0 +1,140 @@
+import multiprocessing
+import queue
+from itertools import islice
+
+# Time waited on a queue before checking that the workers are still alive
+_POLL_SECONDS = 1
+
+def _ingestion_worker(index, stats, options, tasks, results):
+    """Process pushing the batches it receives into its own Leona instance
+    
+    The Leona instance is sent back once a None batch is received.
+    If pushing fails, the remaining batches are ignored and the exception is sent back instead.
+    
+    Parameters
+    ----------
+    index : int
+        Index of the worker
+        
+    stats : list of Stats
+        Configuration of the Leona instance
+        
+    options : dict
+        Keyword arguments of the Leona instance
+        
+    tasks : Queue
+        Batches of matches to push, ended by None
+        
+    results : Queue
+        Queue receiving (index, Leona or exception)
+    """
+    from .solari import Leona
+    
+    error = None
+    try:
+        leona = Leona(stats, **options)
+    except Exception as e:
+        error = e
+    
+    while (batch := tasks.get()) is not None:
+        if error is None:
+            try:
+                leona._push_batch(batch)
+            except Exception as e:
+                error = e
+    
+    results.put((index, leona if error is None else error))
+
+def _put_task(tasks, batch, process):
+    """Send a batch to a worker, raising if it exited before receiving it"""
+    while True:
+        try:
+            tasks.put(batch, timeout=_POLL_SECONDS)
+            return
+        except queue.Full:
+            if not process.is_alive():
+                raise RuntimeError("Ingestion worker exited with code %s." % process.exitcode)
+
+def _get_results(results, processes):
+    """Receive the Leona instance of every worker, raising if one of them exited without sending it"""
+    shards = {}
+    while len(shards) < len(processes):
+        try:
+            index, shard = results.get(timeout=_POLL_SECONDS)
+            shards[index] = shard
+        except queue.Empty:
+            # Workers only exit successfully after sending their result
+            for i, p in enumerate(processes):
+                if i not in shards and p.exitcode not in (None, 0):
+                    raise RuntimeError("Ingestion worker exited with code %s." % p.exitcode)
+    return shards
+
+def push_matches_parallel(leona, matches, batch_size, workers):
+    """Push matches into a Leona instance using a pool of processes
+    
+    Batches are deduplicated against the Leona instance, then dispatched in turn to the workers.
+    Each worker holds its own Leona instance with the same configuration, and all of them are merged into the given one at the end.
+    
+    Parameters
+    ----------
+    leona : Leona
+        Instance receiving the matches
+        
+    matches : iterable of dict
+        Raw data from Riot API match-v4 endpoint, can be a generator
+        
+    batch_size : int
+        Number of matches sent at once to a worker
+        
+    workers : int
+        Number of processes
+        
+    Raises
+    ------
+    RuntimeError
+        If a worker exits unexpectedly, the other ones being terminated
+    """
+    context = multiprocessing.get_context()
+    
+    # Bounded queues so that a slow worker doesn't let the batches accumulate in memory
+    tasks = [context.Queue(maxsize=2) for _ in range(workers)]
+    results = context.Queue()
+    processes = [
+        context.Process(target=_ingestion_worker, args=(i, leona._stats, leona._get_worker_options(), tasks[i], results), daemon=True)
+        for i in range(workers)
+    ]
+    for p in processes:
+        p.start()
+    
+    try:
+        matches = iter(matches)
+        game_ids = set()
+        n = 0
+        while batch := list(islice(matches, batch_size)):
+            batch = leona._deduplicate(batch, game_ids)
+            if len(batch) > 0:
+                _put_task(tasks[n % workers], batch, processes[n % workers])
+                n += 1
+        
+        for i in range(workers):
+            _put_task(tasks[i], None, processes[i])
+    
+        shards = _get_results(results, processes)
+    except BaseException:
+        # The remaining workers would otherwise wait for batches forever
+        for p in processes:
+            p.terminate()
+        raise
+    finally:
+        for p in processes:
+            p.join()
+    
+    for i in range(workers):
+        if isinstance(shards[i], Exception):
+            raise shards[i]
+    
+    leona.merge_all([shards[i] for i in range(workers)])
+    
+    # The chunks of the workers were written again by the instance they were merged into
+    for i in range(workers):
+        shards[i]._remove_spill()
@@ -0,0 +1,407 @@
+import json
+import os
+import pickle
+import shutil
+import tempfile
+from sortedcontainers import SortedSet
+
+from .exceptions import UnsupportedSnapshot
+from .stats.buffers import Column, ColumnBuffer, SpillStore
+from .stats.interner import Interner
+
+# Version of the layout of the snapshots, increased each time it changes
+SNAPSHOT_VERSION = 1
+
+_MANIFEST = "manifest.json"
+# Prefixes of the files written in the directory of the snapshots, other files being left untouched
+_PREFIXES = ("state_", "segment_", "matches_", "chunk_")
+
+class _SnapshotPickler(pickle.Pickler):
+    """Pickler writing the rows, the pushed gameIds and the identities as columns next to the pickled state
+
+    Parameters
+    ----------
+    file : file object
+        File receiving the pickled state
+
+    writer : SnapshotWriter
+        Writer of the snapshot, holding the segments already written
+
+    matches : list of SortedSet
+        Pushed gameIds of the Leona instance and of its partitions
+    """
+
+    def __init__(self, file, writer, matches):
+        pickle.Pickler.__init__(self, file, protocol=pickle.HIGHEST_PROTOCOL)
+        self._writer = writer
+        self._matches = set([id(m) for m in matches])
+        self._written = {}
+
+    def persistent_id(self, obj):
+        # Objects referenced several times, like the interner, are only written once
+        if id(obj) in self._written:
+            return self._written[id(obj)][1]
+
+        writer = self._writer
+        pid = None
+        if isinstance(obj, ColumnBuffer):
+            paths = writer._write_segments(obj, obj.get_generation(), len(obj), lambda path, start, stop: obj.slice(start, stop).save(path))
+            pid = ("buffer", writer._new_path("buffer"), obj.get_fields(), paths)
+
+        elif isinstance(obj, SortedSet) and id(obj) in self._matches:
+            path = writer._new_path("matches")
+            writer._save_values(list(obj), path)
+            pid = ("matches", path)
+
+        elif isinstance(obj, Interner):
+            # Codes are given in order of appearance, so values are only appended
+            values = obj.get_values()
+            paths = writer._write_segments(obj, 0, len(values), lambda path, start, stop: writer._save_values(values[start:stop], path))
+            pid = ("interner", writer._new_path("interner"), paths)
+
+        elif isinstance(obj, SpillStore):
+            # Chunks are copied, so the snapshot doesn't depend on the spill directory, which may be temporary
+            pid = ("spill", writer._new_path("spill"), obj._threshold, obj._root, writer._write_chunks(obj))
+
+        if pid is not None:
+            # The object is kept along with its id, so the id can't be reused
+            self._written[id(obj)] = (obj, pid)
+        return pid
+
+
+class _SnapshotUnpickler(pickle.Unpickler):
+    """Unpickler reading back the columns written by _SnapshotPickler
+
+    Parameters
+    ----------
+    file : file object
+        File holding the pickled state
+
+    writer : SnapshotWriter
+        Writer of the snapshot, told the segments of the objects read
+
+    mmap : boolean
+        Determine if the columns are memory-mapped instead of read
+    """
+
+    def __init__(self, file, writer, mmap):
+        pickle.Unpickler.__init__(self, file)
+        self._writer = writer
+        self._mmap = mmap
+        self._loaded = {}
+
+    def persistent_load(self, pid):
+        kind, key = pid[0], pid[1]
+        if key not in self._loaded:
+            self._loaded[key] = self._load(kind, key, pid[2:])
+        return self._loaded[key]
+
+    def _load(self, kind, key, args):
+        writer = self._writer
+
+        if kind == "buffer":
+            fields, paths = args
+            buffers = [ColumnBuffer.load(writer._get_path(p), fields, self._mmap) for p in paths]
+            if len(buffers) == 1:
+                buffer = buffers[0]
+            else:
+                # Segments written by successive snapshots are gathered in memory
+                buffer = ColumnBuffer(fields)
+                buffer.reserve(sum([len(b) for b in buffers]))
+                for b in buffers:
+                    buffer.extend_buffer(b)
+            writer._add_segments(buffer, buffer.get_generation(), paths, [len(b) for b in buffers])
+            return buffer
+
+        if kind == "matches":
+            return SortedSet(writer._load_values(key).tolist())
+
+        if kind == "interner":
+            interner = Interner()
+            segments = [writer._load_values(p) for p in args[0]]
+            for values in segments:
+                interner.encode(values)
+            writer._add_segments(interner, 0, args[0], [len(v) for v in segments])
+            return interner
+
+        if kind == "spill":
+            threshold, directory, chunks = args
+            # Chunks are linked into a new subdirectory of the spill directory, so the snapshot can be replaced while they are used
+            store = SpillStore(threshold, directory)
+            for path, fields in chunks:
+                store.add_chunk(writer._get_path(path), fields)
+            writer._chunks[id(store)] = (store, chunks)
+            return store
+
+        raise pickle.UnpicklingError("Unknown persistent id %r" % (kind,))
+
+
+class SnapshotWriter:
+    """Writer of the successive snapshots of a Leona instance in the same directory
+
+    Rows and identities are only appended between two snapshots, unless rows are removed, so they are written as segments.
+    Each snapshot only writes the rows appended since the previous one, as a new segment replacing the previous segments that are not larger.
+    Each row is then only written again a logarithmic number of times, and the number of files stays low.
+
+    Once a snapshot is complete, the manifest is replaced at once, then the files only used by the previous snapshot are removed.
+
+    Parameters
+    ----------
+    path : string
+        Path of the directory of the snapshots
+    """
+
+    def __init__(self, path):
+        self._path = os.path.abspath(path)
+        self._sequence = 0
+        self._count = 0
+        self._created = set()
+        # Segments of the last snapshot, by object : (object, generation, [(path, start, stop)])
+        self._segments = {}
+        # Spilled chunks of the last snapshot, by store : (store, [(path, fields)])
+        self._chunks = {}
+
+    def _get_path(self, path):
+        """Return the absolute path of a file of the snapshot"""
+        return os.path.join(self._path, path)
+
+    def _new_path(self, prefix):
+        """Return the path of a new file of the snapshot, relative to its directory"""
+        self._count += 1
+        path = "%s_%05d_%05d" % (prefix, self._sequence, self._count)
+        self._created.add(path)
+        return path
+
+    def _save_values(self, values, path):
+        column = Column()
+        column.extend(values)
+        column.save(self._get_path(path) + ".npy")
+
+    def _load_values(self, path):
+        return Column.load(self._get_path(path) + ".npy", mmap=False).view()
+
+    def _add_segments(self, obj, generation, paths, sizes):
+        """Record the segments holding the rows of an object read from the snapshot"""
+        starts = [sum(sizes[:i]) for i in range(len(sizes))]
+        self._segments[id(obj)] = (obj, generation, [(p, start, start + size) for p, start, size in zip(paths, starts, sizes)])
+
+    def _write_segments(self, obj, generation, size, write):
+        """Write the rows of an object appended since the previous snapshot
+
+        Parameters
+        ----------
+        obj : object
+            Object holding the rows
+
+        generation : int
+            Number of times rows were removed from the object, all the rows being written again once it changes
+
+        size : int
+            Number of rows of the object
+
+        write : callable
+            Function writing the rows from start to stop, given (path, start, stop)
+
+        Returns
+        -------
+        paths : list of strings
+            Path of each segment holding the rows, in order
+        """
+        segments = []
+        if id(obj) in self._segments and self._segments[id(obj)][1] == generation:
+            segments = list(self._segments[id(obj)][2])
+
+        start = segments[-1][2] if len(segments) > 0 else 0
+        if start < size or len(segments) == 0:
+            while len(segments) > 0 and segments[-1][2] - segments[-1][1] <= size - start:
+                start = segments.pop()[1]
+            path = self._new_path("segment")
+            write(self._get_path(path), start, size)
+            segments.append((path, start, size))
+
+        self._written_segments[id(obj)] = (obj, generation, segments)
+        return [s[0] for s in segments]
+
+    def _write_chunks(self, store):
+        """Copy the chunks spilled since the previous snapshot
+
+        Parameters
+        ----------
+        store : SpillStore
+            Store holding the chunks
+
+        Returns
+        -------
+        chunks : list of tuples
+            Path and fields of each chunk
+        """
+        chunks = list(self._chunks[id(store)][1]) if id(store) in self._chunks else []
+
+        for i, buffers in enumerate(store.iter_chunks()):
+            if i < len(chunks):
+                continue
+            path = self._new_path("chunk")
+            for name, b in buffers.items():
+                b.save(os.path.join(self._get_path(path), name))
+            chunks.append((path, {name:b.get_fields() for name, b in buffers.items()}))
+
+        self._written_chunks[id(store)] = (store, chunks)
+        return chunks
+
+    def write(self, leona, info=None):
+        """Write a new snapshot of a Leona instance
+
+        Parameters
+        ----------
+        leona : Leona
+            Instance to write
+
+        info : dict, optional
+            Information stored along with the snapshot, which must be serializable in JSON
+        """
+        os.makedirs(self._path, exist_ok=True)
+
+        self._sequence += 1
+        self._count = 0
+        self._created = set()
+        self._written_segments = {}
+        self._written_chunks = {}
+
+        state = self._new_path("state") + ".pkl"
+        with open(self._get_path(state), "wb") as f:
+            _SnapshotPickler(f, self, _get_matches(leona)).dump(leona)
+
+        # The manifest is replaced once everything else is written, so an interrupted snapshot leaves the previous one
+        manifest = {"format":"solari", "version":SNAPSHOT_VERSION, "sequence":self._sequence, "state":state, "info":info}
+        with open(self._get_path(_MANIFEST + ".tmp"), "w") as f:
+            json.dump(manifest, f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(self._get_path(_MANIFEST + ".tmp"), self._get_path(_MANIFEST))
+
+        self._segments = self._written_segments
+        self._chunks = self._written_chunks
+
+        # Files are unlinked rather than overwritten, so the ones still memory-mapped stay readable
+        used = self._created | set([s[0] for _, _, segments in self._segments.values() for s in segments] + [c[0] for _, chunks in self._chunks.values() for c in chunks])
+        for f in os.listdir(self._path):
+            if not f.startswith(_PREFIXES) or f.split(".")[0] in used:
+                continue
+            if os.path.isdir(self._get_path(f)):
+                shutil.rmtree(self._get_path(f), True)
+            else:
+                os.remove(self._get_path(f))
+
+    def exists(self):
+        """Return if a snapshot was written in the directory
+
+        Returns
+        -------
+        exists : bool
+            True if the directory holds a complete snapshot
+        """
+        return os.path.exists(self._get_path(_MANIFEST))
+
+    def read(self, mmap=True):
+        """Read the last snapshot
+
+        The segments of the snapshot are kept, so the next snapshot only writes the rows appended since.
+
+        Parameters
+        ----------
+        mmap : boolean
+            Default at True, determine if the columns are memory-mapped instead of read
+
+        Raises
+        ------
+        UnsupportedSnapshot
+            If the directory doesn't hold a complete snapshot, or one written with another version of the format
+
+        Returns
+        -------
+        leona : Leona
+            The Leona instance
+
+        info : dict or None
+            Information stored along with the snapshot
+        """
+        try:
+            with open(self._get_path(_MANIFEST)) as f:
+                manifest = json.load(f)
+        except (OSError, ValueError):
+            raise UnsupportedSnapshot()
+
+        if manifest.get("format") != "solari" or manifest.get("version") != SNAPSHOT_VERSION:
+            raise UnsupportedSnapshot()
+
+        self._sequence = manifest["sequence"]
+        self._segments = {}
+        self._chunks = {}
+
+        with open(self._get_path(manifest["state"]), "rb") as f:
+            leona = _SnapshotUnpickler(f, self, mmap).load()
+
+        return leona, manifest["info"]
+
+
+def _get_matches(leona):
+    """Return the pushed gameIds of a Leona instance and of its partitions"""
+    return [leona._matches] + [m for l in leona._partitions.values() for m in _get_matches(l)]
+
+def save_snapshot(leona, path):
+    """Write the state of a Leona instance as a snapshot
+
+    The configuration and the small parts of the state are pickled, while the rows, the pushed gameIds and the identities
+    are written as one .npy file per column, so they can be memory-mapped when the snapshot is loaded.
+    An existing snapshot at the same path is only replaced once the new one is complete.
+
+    Parameters
+    ----------
+    leona : Leona
+        Instance to write
+
+    path : string
+        Path of the directory of the snapshot
+    """
+    path = os.path.abspath(path)
+    parent = os.path.dirname(path)
+    os.makedirs(parent, exist_ok=True)
+
+    directory = tempfile.mkdtemp(prefix=".solari-", dir=parent)
+    try:
+        SnapshotWriter(directory).write(leona)
+    except BaseException:
+        shutil.rmtree(directory, True)
+        raise
+
+    replaced = None
+    if os.path.exists(path):
+        # The old snapshot may be memory-mapped by a loaded instance, so its files are unlinked instead of overwritten
+        replaced = tempfile.mkdtemp(prefix=".solari-", dir=parent)
+        os.rename(path, os.path.join(replaced, "snapshot"))
+    os.rename(directory, path)
+    if replaced is not None:
+        shutil.rmtree(replaced, True)
+
+def load_snapshot(path, mmap=True):
+    """Read a Leona instance written by save_snapshot
+
+    Parameters
+    ----------
+    path : string
+        Path of the directory of the snapshot
+
+    mmap : boolean
+        Default at True, determine if the columns are memory-mapped instead of read
+
+    Raises
+    ------
+    UnsupportedSnapshot
+        If the directory doesn't hold a complete snapshot, or one written with another version of the format
+
+    Returns
+    -------
+    leona : Leona
+        The Leona instance
+    """
+    return SnapshotWriter(path).read(mmap)[0]
@@ -1,7 +1,30 @@
+import os
+import copy
+import numpy as np
+import pandas as pd
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+from itertools import islice
 from sortedcontainers import SortedSet
 
 # from .stats.stats_managers import ChampionStatsManager, ItemStatsManager
 from .exceptions import NoMatchPushed, MismatchingLeona
+from .stats.extraction import FieldExtractor
+from .stats.interner import Interner, INTERNED_FIELDS
+from .stats.partials import add_partials
+from .streams import iter_matches
+from .parallel import push_matches_parallel
+from .snapshot import save_snapshot, load_snapshot
+
+# Number of matches pushed one by one held before they are processed as a batch
+PENDING_MATCHES = 1000
+
+def _as_array(game_ids):
+    """Convert a set of gameIds to an array, without going through a list"""
+    try:
+        return np.fromiter(game_ids, dtype=np.int64, count=len(game_ids))
+    except (TypeError, ValueError):
+        return np.array(game_ids, dtype=object)
 
 class Leona:
     """
@@ -11,28 +34,120 @@ class Leona:
     ----------
     stats : list of Stats
         List of all instantiated Stats to be computed
+        
+    spill_threshold : int, optional
+        Size in bytes of the rows a stats manager holds in memory above which they are written on disk, everything is kept in memory if not given
+        
+    spill_directory : string, optional
+        Directory where the rows are written on disk, a temporary directory if not given
+        
+    keep_rows : bool
+        Default at True, if False the rows of the stats managers whose stats are all incremental are released once aggregated
+        
+    window : timedelta or number, optional
+        Only keep the games more recent than the newest one minus the window, a number being in the unit of the time field
+        
+    time_field : string
+        Default at "gameCreation", game level field holding the time of the games, in milliseconds
+        
+    partition_by : tuple of strings, optional
+        Game level fields (e.g. "gameVersion", "queueId") splitting the matches into partitions, whose stats are computed separately
     ...
     Methods
     -------
     push_match(match_data)
         Forward the raw match data from Riot API to the stats manager which will handle the stats
         
-    get_stats(key=None)
+    push_matches(matches, batch_size=1000, workers=None)
+        Forward many raw match data by batches to the stats managers, optionally in parallel
+        
+    push_match_stream(fileobj, batch_size=1000)
+        Decode matches from a stream and forward them by batches to the stats managers
+        
+    push_match_file(path, batch_size=1000)
+        Decode matches from a file and forward them by batches to the stats managers
+        
+    get_stats(key=None, partition=None, workers=None)
         Return a list of key:DataFrame giving the computed stats
         
+    get_partition_stats(key=None, workers=None)
+        Return the stats of each partition
+        
+    get_partitions()
+        Get the list of partitions matches were pushed to
+        
     get_keys()
         Get the list of keys that are used for the stats
+        
+    get_duplicate_count()
+        Return the number of pushed matches that were skipped because they had already been pushed
+        
+    save(path)
+        Write the whole state of the instance as a snapshot
+        
+    load(path, mmap=True)
+        Read a Leona instance from a snapshot written by save
+        
+    With a time window, only the games more recent than the newest pushed one minus the window are kept, older ones being evicted as new games arrive.
     """
     
-    def __init__(self, stats):
+    def __init__(self, stats, spill_threshold=None, spill_directory=None, keep_rows=True, window=None, time_field="gameCreation", partition_by=None):
+        self._init(stats, spill_threshold, spill_directory, keep_rows, window, time_field, partition_by)
+        
+    def _init(self, stats, spill_threshold=None, spill_directory=None, keep_rows=True, window=None, time_field="gameCreation", partition_by=None, rank_manager=None):
+        """Initialize the instance, with the parameters of Leona
+        
+        Parameters
+        ----------
+        rank_manager : RankManager, optional
+            Manager for players rank shared with another instance, a new one if not given
+        """
+        self._stats = stats
+        
+        self._window = None
+        self._time_field = time_field
+        if window is not None:
+            if spill_threshold is not None or not keep_rows:
+                raise ValueError("A time window can't be combined with spill_threshold or keep_rows=False.")
+            self._window = int(window.total_seconds() * 1000) if isinstance(window, timedelta) else window
+            # (time, gameId) of the games in the window, oldest first
+            self._window_games = SortedSet()
+            self._window_end = None
         
         self._matches = SortedSet()
+        self._duplicate_count = 0
+        # Matches pushed one by one, processed as a batch once there are enough of them or the state is read
+        self._pending_matches = []
         
-        self._rank_manager = RankManager()
+        self._rank_manager = rank_manager if rank_manager is not None else RankManager()
         
+        # Partitions hold their own Leona instance, created along with the first match routed to them
+        self._partition_by = tuple(partition_by) if partition_by is not None else None
+        self._partitions = {}
+        self._partition_options = {"spill_threshold":spill_threshold, "spill_directory":spill_directory, "keep_rows":keep_rows, "window":window, "time_field":time_field}
+        
+        if self._partition_by is None:
+            self._create_managers(spill_threshold, spill_directory, keep_rows)
+        else:
+            self._create_managers()
+            
+    def _create_managers(self, spill_threshold=None, spill_directory=None, keep_rows=True):
+        """Create the stats managers, and the extractor walking the matches for all of them
+        
+        Parameters
+        ----------
+        spill_threshold : int, optional
+            Size in bytes of the rows a stats manager holds in memory above which they are written on disk
+            
+        spill_directory : string, optional
+            Directory where the rows are written on disk
+            
+        keep_rows : bool
+            If False the rows of the stats managers whose stats are all incremental are released once aggregated
+        """
         keys_managers = []
         
-        for s in stats:
+        for s in self._stats:
             keys_managers.append({"keys":s.get_keys(),"manager":s.get_manager()})
             
         self._keys_managers = [i for n, i in enumerate(keys_managers) if i not in keys_managers[n + 1:]]
@@ -40,8 +155,62 @@ class Leona:
         self._stats_manager = {}
         
         for k in self._keys_managers:
-            self._stats_manager[k["keys"]] = k["manager"]([s for s in stats if s.get_keys() == k["keys"]], self._rank_manager)
+            self._stats_manager[k["keys"]] = k["manager"]([s for s in self._stats if s.get_keys() == k["keys"]], self._rank_manager)
+            
+            if spill_threshold is not None:
+                directory = os.path.join(spill_directory, "_".join(k["keys"])) if spill_directory is not None else None
+                self._stats_manager[k["keys"]].enable_spill(spill_threshold, directory)
+            
+            self._stats_manager[k["keys"]].set_keep_rows(keep_rows)
+            
+            if self._window is not None:
+                self._stats_manager[k["keys"]].set_window(self._time_field)
+            
+        # Each match is walked only once for all the stats managers
+        self._extractor = FieldExtractor(list(self._stats_manager.values()), self._rank_manager.get_interner())
+        
+    def _create_partition(self, partition):
+        """Create the Leona instance of a partition
+        
+        It shares the rank manager of this instance, so players have the same codes in all the partitions.
+        
+        Parameters
+        ----------
+        partition : tuple
+            Values of the partition fields
             
+        Returns
+        -------
+        leona : Leona
+            Empty Leona instance with the same configuration, without partitions
+        """
+        options = dict(self._partition_options)
+        if options["spill_directory"] is not None:
+            options["spill_directory"] = os.path.join(options["spill_directory"], "_".join([str(v) for v in partition]))
+        
+        # Stats are copied, as special stats hold their own data
+        leona = Leona.__new__(Leona)
+        leona._init(copy.deepcopy(self._stats), rank_manager=self._rank_manager, **options)
+        
+        return leona
+    
+    def _get_partition(self, partition):
+        """Return the Leona instance of a partition, created if needed"""
+        if partition not in self._partitions:
+            self._partitions[partition] = self._create_partition(partition)
+        return self._partitions[partition]
+    
+    def get_partitions(self):
+        """Get the list of partitions matches were pushed to
+        
+        Returns
+        -------
+        partitions : list of tuples
+            Values of the partition fields of each partition
+        """
+        self._flush_matches()
+        return list(self._partitions.keys())
+    
     def get_keys(self):
         """Get the list of keys that are used for the stats
         
@@ -54,6 +223,10 @@ class Leona:
         
     def push_match(self, match_data):
         """Forward the raw match data from Riot API to the stats manager which will handle the stats
+        
+        Matches pushed one by one are held, then processed by batches of PENDING_MATCHES, or before the stats or counts are read,
+        so each call stays cheap. Errors in the match data are therefore raised when its batch is processed.
+        push_matches remains faster for many matches at once.
 
         Parameters
         ----------
@@ -61,10 +234,208 @@ class Leona:
             Raw data from Riot API match-v4 endpoint
         """
         
-        for s in self._stats_manager:
-            self._stats_manager[s].push_game(match_data)
+        self._pending_matches.append(match_data)
+        if len(self._pending_matches) >= PENDING_MATCHES:
+            self._flush_matches()
             
-        self._matches.add(match_data["gameId"])
+    def _flush_matches(self):
+        """Process the matches pushed one by one and not processed yet"""
+        if len(self._pending_matches) > 0:
+            batch = self._pending_matches
+            self._pending_matches = []
+            self._push_batch(batch)
+        
+    def push_matches(self, matches, batch_size=1000, workers=None):
+        """Forward many raw match data by batches to the stats managers
+        
+        Each stats manager extracts a whole batch at once, which is much faster than pushing matches one by one.
+        
+        If workers is given, batches are spread over a pool of processes, each one holding its own Leona instance with the same configuration.
+        They are merged into this instance once all the matches are pushed.
+
+        Parameters
+        ----------
+        matches : iterable of dict
+            Raw data from Riot API match-v4 endpoint, can be a generator
+            
+        batch_size : int
+            Number of matches processed at once
+            
+        workers : int, optional
+            Number of processes used for the ingestion
+        """
+        # Matches pushed one by one before are processed first, in order
+        self._flush_matches()
+        
+        if workers is not None and workers > 1:
+            push_matches_parallel(self, matches, batch_size, workers)
+            return
+        
+        matches = iter(matches)
+        
+        while batch := list(islice(matches, batch_size)):
+            self._push_batch(batch)
+        
+    def push_match_stream(self, fileobj, batch_size=1000):
+        """Decode matches from a stream and forward them by batches to the stats managers
+        
+        The stream can contain a JSON array of matches or one match per line, and can be compressed (gzip, bz2, xz, zstd).
+        Matches are decoded one at a time, so only one batch is held in memory.
+
+        Parameters
+        ----------
+        fileobj : file object
+            Stream containing raw data from Riot API match-v4 endpoint
+            
+        batch_size : int
+            Number of matches processed at once
+        """
+        self.push_matches(iter_matches(fileobj), batch_size)
+        
+    def push_match_file(self, path, batch_size=1000):
+        """Decode matches from a file and forward them by batches to the stats managers
+        
+        The file can contain a JSON array of matches or one match per line, and can be compressed (gzip, bz2, xz, zstd).
+        Matches are decoded one at a time, so only one batch is held in memory.
+
+        Parameters
+        ----------
+        path : string
+            Path to the file containing raw data from Riot API match-v4 endpoint
+            
+        batch_size : int
+            Number of matches processed at once
+        """
+        with open(path, "rb") as f:
+            self.push_match_stream(f, batch_size)
+        
+    def _push_batch(self, batch):
+        """Forward a batch of raw match data to the stats managers
+        
+        Parameters
+        ----------
+        batch : list of dict
+            Raw data from Riot API match-v4 endpoint
+        """
+        if self._partition_by is not None:
+            # Each match is routed once to its partition
+            partitions = {}
+            for m in batch:
+                partitions.setdefault(tuple([m[f] for f in self._partition_by]), []).append(m)
+            for partition, matches in partitions.items():
+                self._get_partition(partition)._push_batch(matches)
+            return
+        
+        game_ids = set()
+        unique_batch = self._deduplicate(batch, game_ids)
+        
+        if self._window is not None:
+            unique_batch = self._filter_window(unique_batch, game_ids)
+        
+        if len(unique_batch) == 0:
+            return
+        
+        extraction = self._extractor.extract(unique_batch)
+        
+        for manager in self._stats_manager.values():
+            manager.push_extracted(extraction)
+            
+        self._matches.update(game_ids)
+        
+        if self._window is not None:
+            self._window_games.update([(m[self._time_field], m["gameId"]) for m in unique_batch])
+            self._evict_window()
+        
+    def _filter_window(self, batch, game_ids):
+        """Move the end of the window to the newest match, and filter out the matches already out of it
+        
+        Parameters
+        ----------
+        batch : list of dict
+            Raw data from Riot API match-v4 endpoint
+            
+        game_ids : set
+            gameIds of the batch, the ones filtered out are removed
+            
+        Returns
+        -------
+        batch : list of dict
+            The matches within the window
+        """
+        if len(batch) == 0:
+            return batch
+        
+        newest = max([m[self._time_field] for m in batch])
+        if self._window_end is None or newest > self._window_end:
+            self._window_end = newest
+        
+        cutoff = self._window_end - self._window
+        window_batch = [m for m in batch if m[self._time_field] >= cutoff]
+        game_ids.difference_update([m["gameId"] for m in batch if m[self._time_field] < cutoff])
+        
+        return window_batch
+    
+    def _evict_window(self):
+        """Remove the games out of the window from the pushed matches and from the stats managers"""
+        cutoff = self._window_end - self._window
+        
+        while len(self._window_games) > 0 and self._window_games[0][0] < cutoff:
+            self._matches.discard(self._window_games.pop(0)[1])
+        
+        for manager in self._stats_manager.values():
+            manager.evict(cutoff)
+            
+    def _get_worker_options(self):
+        """Return the options of the Leona instances holding part of the matches of this one
+        
+        Returns
+        -------
+        options : dict
+            Keyword arguments for Leona
+        """
+        options = {"partition_by":self._partition_by, "keep_rows":self._partition_options["keep_rows"]}
+        if self._partition_options["spill_threshold"] is not None:
+            # Workers spill as well, so they don't hold their whole part of the matches in memory
+            options.update({"spill_threshold":self._partition_options["spill_threshold"], "spill_directory":self._partition_options["spill_directory"]})
+        if self._window is not None:
+            options.update({"window":self._window, "time_field":self._time_field})
+        return options
+        
+    def _remove_spill(self):
+        """Remove the rows written on disk by the stats managers, once they were merged into another instance"""
+        for m in self._stats_manager.values():
+            if m._spill is not None:
+                m._spill.remove()
+        for l in self._partitions.values():
+            l._remove_spill()
+        
+    def _deduplicate(self, batch, game_ids):
+        """Filter out the matches already pushed, or already seen, and count them as duplicates
+        
+        Parameters
+        ----------
+        batch : list of dict
+            Raw data from Riot API match-v4 endpoint
+            
+        game_ids : set
+            gameIds already seen but not pushed yet, updated with the ones of the batch
+            
+        Returns
+        -------
+        unique_batch : list of dict
+            The matches to push
+        """
+        matches = self._matches
+        unique_batch = []
+        for m in batch:
+            if m["gameId"] in matches or m["gameId"] in game_ids:
+                continue
+            game_ids.add(m["gameId"])
+            unique_batch.append(m)
+        
+        self._duplicate_count += len(batch) - len(unique_batch)
+        
+        return unique_batch
         
         
     def push_league(self, league_data):
@@ -89,17 +460,25 @@ class Leona:
         """
         self._rank_manager.set_players_rank(players_rank)
         
-    def get_stats(self, key=None):
+    def get_stats(self, key=None, partition=None, workers=None):
         """Return a list of key:DataFrame giving the computed stats
         
         If a key is given, return only the corresponding DataFrame.
         If there is only one key available, return only the corresponding DataFrame.
+        
+        For a partitioned instance, the stats of one partition are returned if it is given, otherwise the stats over all the partitions.
 
         Parameters
         ----------
         key : tuple
             Specific key to consider when computing and returning stats.
             
+        partition : tuple, optional
+            Values of the partition fields, a single value being accepted if there is only one field
+            
+        workers : int, optional
+            Number of threads computing the partitions
+            
         Raises
         ------
         NoMatchPushed
@@ -110,17 +489,117 @@ class Leona:
         stats : DataFrame or dict<key,DataFrame>
             The computed stats
         """
+        self._flush_matches()
+        
+        if self._partition_by is not None:
+            if partition is not None:
+                if not isinstance(partition, tuple):
+                    partition = (partition,)
+                if partition not in self._partitions:
+                    raise NoMatchPushed
+                return self._partitions[partition].get_stats(key)
+            
+            get_stats = lambda k: self._get_rollup(k, workers)
+        else:
+            if partition is not None:
+                raise ValueError("The Leona instance is not partitioned.")
+            
+            get_stats = lambda k: self._stats_manager[k].get_stats()
         
         if self.get_match_count() == 0:
             raise NoMatchPushed
         
         if key is None:
             if len(self._stats_manager) > 1:
-                return {k:v.get_stats() for k,v in self._stats_manager.items()}
+                return {k:get_stats(k) for k in self._stats_manager.keys()}
+            
+            return get_stats(next(iter(self._stats_manager.keys())))
+        
+        return get_stats(key)
+    
+    def get_partition_stats(self, key=None, workers=None):
+        """Return the stats of each partition
+        
+        Parameters
+        ----------
+        key : tuple
+            Specific key to consider when computing and returning stats.
+            
+        workers : int, optional
+            Number of threads computing the partitions
+            
+        Returns
+        -------
+        stats : dict
+            Dict matching each partition to its stats, as returned by get_stats
+        """
+        self._flush_matches()
+        partitions = list(self._partitions.items())
+        stats = self._map_partitions(lambda l: l.get_stats(key), [l for p, l in partitions], workers)
+        return {p:v for (p, l), v in zip(partitions, stats)}
+    
+    def _get_rollup(self, key, workers):
+        """Compute the stats over all the partitions
+        
+        The partial aggregates of the partitions are added, the matches being merged only if some stats can't be computed by parts.
+        
+        Parameters
+        ----------
+        key : tuple
+            Key of the stats
+            
+        workers : int, optional
+            Number of threads computing the partitions
+            
+        Returns
+        -------
+        stats : Pandas DataFrame
+            Value of the computed stats grouped by the key
+        """
+        leonas = [l for l in self._partitions.values() if l.get_match_count() > 0]
+        managers = [l._stats_manager[key] for l in leonas]
+        
+        partials = self._map_partitions(lambda m: m.get_partials(), managers, workers)
+        
+        if any([p is None for p in partials]) or len(managers[0]._special_stats) > 0:
+            rollup = self._create_partition(())
+            for l in leonas:
+                rollup.merge(l)
+            return rollup.get_stats(key)
+        
+        combined = None
+        for p in partials:
+            combined = add_partials(combined, p)
+        
+        return managers[0].get_stats_from_partials(combined)
+    
+    def _map_partitions(self, function, items, workers):
+        """Apply a function to the items of each partition, in threads if workers is given
+        
+        Parameters
+        ----------
+        function : callable
+            Function to apply
+            
+        items : list
+            One item per partition
             
-            return next(iter(self._stats_manager.values())).get_stats()
+        workers : int, optional
+            Number of threads
+            
+        Returns
+        -------
+        results : list
+            Result for each item
+        """
+        if workers is None or workers <= 1 or len(items) <= 1:
+            return [function(i) for i in items]
         
-        return self._stats_manager[key].get_stats()
+        # Caches of the shared rank manager are filled beforehand, so the threads only read it
+        self._rank_manager.get_ranks([])
+        
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            return list(executor.map(function, items))
     
     def get_match_count(self):
         """Return the number of matches that have been pushed
@@ -130,8 +609,69 @@ class Leona:
         match_count : int
             Number of matches
         """
+        self._flush_matches()
+        if self._partition_by is not None:
+            return sum([l.get_match_count() for l in self._partitions.values()])
         return len(self._matches)
     
+    def get_duplicate_count(self):
+        """Return the number of pushed matches that were skipped because they had already been pushed
+        
+        Redundant matches omitted during a merge are counted as well.
+
+        Returns
+        -------
+        duplicate_count : int
+            Number of duplicate matches
+        """
+        self._flush_matches()
+        if self._partition_by is not None:
+            return self._duplicate_count + sum([l.get_duplicate_count() for l in self._partitions.values()])
+        return self._duplicate_count
+    
+    
+    def save(self, path):
+        """Write the whole state of the instance as a snapshot
+        
+        The snapshot is a directory holding the configuration, the ranks and the aggregates, pickled,
+        and the rows, pushed gameIds and players identity as one .npy file per column.
+        An existing snapshot at the same path is replaced once the new one is fully written.
+        
+        Parameters
+        ----------
+        path : string
+            Path of the directory of the snapshot
+        """
+        self._flush_matches()
+        save_snapshot(self, path)
+        
+    @classmethod
+    def load(cls, path, mmap=True):
+        """Read a Leona instance from a snapshot written by save
+        
+        The columns of the rows are memory-mapped, so they are only read from the disk when used,
+        and copied in memory once new matches are pushed.
+        Snapshots of instances with the same configuration, for instance from different workers, can be loaded then merged.
+        
+        Parameters
+        ----------
+        path : string
+            Path of the directory of the snapshot
+            
+        mmap : boolean
+            Default at True, determine if the columns are memory-mapped instead of read
+            
+        Raises
+        ------
+        UnsupportedSnapshot
+            If the directory doesn't hold a complete snapshot, or one written with another version of the format
+            
+        Returns
+        -------
+        leona : Leona
+            The Leona instance
+        """
+        return load_snapshot(path, mmap)
     
     def merge(self, l2):
         """Merge the data from the given Leona instance
@@ -149,20 +689,94 @@ class Leona:
         ------
         MismatchingLeona
             If the given Leona instance has another configuration
+            
+        RedundantAggregatedGames
+            If both instances have games in common, while the given one only kept their aggregates
         """
         
-        if not self._same_configuration(l2):
-            raise MismatchingLeona()
+        self.merge_all([l2])
+    
+    def merge_all(self, instances, workers=None):
+        """Merge the data from many Leona instances at once
         
-        # Update the rank manager
-        self._rank_manager.merge(l2._rank_manager)
+        The current instance becomes the merge results
+        All the Leona instances need to have the same configuration
         
-        redundant_matches = list(self._matches.intersection(l2._matches))
+        Configurations are checked and games common to several instances found once for all of them,
+        then the rows of all the instances are appended at once, or their aggregates added.
         
-        for k in self._stats_manager.keys():
-            self._stats_manager[k].merge(l2._stats_manager[k], redundant_matches)
+        Parameters
+        ----------
+        instances : list of Leona
+            Other Leona instances to merge with
+            
+        workers : int, optional
+            Number of threads computing the aggregates of the instances, when only the aggregates are merged
+            
+        Raises
+        ------
+        MismatchingLeona
+            If one of the given Leona instances has another configuration
             
-        self._matches = self._matches.union(l2._matches)
+        RedundantAggregatedGames
+            If instances have games in common, while one only kept their aggregates
+        """
+        instances = list(instances)
+        if len(instances) == 0:
+            return
+        
+        for l in [self] + instances:
+            l._flush_matches()
+        
+        for l2 in instances:
+            if not self._same_configuration(l2):
+                raise MismatchingLeona()
+        
+        if self._partition_by is not None:
+            partitions = {}
+            for l2 in instances:
+                self._rank_manager.merge(l2._rank_manager)
+                for partition, l in l2._partitions.items():
+                    partitions.setdefault(partition, []).append(l)
+                self._duplicate_count += l2._duplicate_count
+            
+            for partition, ls in partitions.items():
+                self._get_partition(partition).merge_all(ls, workers)
+            return
+        
+        # A game is only kept in the first instance holding it, this one coming first
+        game_ids = [_as_array(l._matches) for l in [self] + instances]
+        all_game_ids = np.concatenate(game_ids)
+        redundant = np.ones(len(all_game_ids), dtype=bool)
+        redundant[np.unique(all_game_ids, return_index=True)[1]] = False
+        
+        offsets = np.cumsum([len(g) for g in game_ids])
+        redundant_matches = [all_game_ids[offsets[i]:offsets[i + 1]][redundant[offsets[i]:offsets[i + 1]]] for i in range(len(instances))]
+        
+        for k in self._stats_manager.keys():
+            for l2, r in zip(instances, redundant_matches):
+                self._stats_manager[k]._check_merge(l2._stats_manager[k], r)
+        
+        # Update the rank manager
+        remaps = []
+        for l2 in instances:
+            self._rank_manager.merge(l2._rank_manager)
+            remaps.append(self._rank_manager.get_remap(l2._rank_manager))
+        
+        for k in self._stats_manager.keys():
+            self._stats_manager[k].merge_all([l2._stats_manager[k] for l2 in instances], redundant_matches, remaps, workers)
+        
+        for l2, r in zip(instances, redundant_matches):
+            self._matches.update(l2._matches)
+            self._duplicate_count += l2._duplicate_count + len(r)
+        
+        if self._window is not None:
+            for l2 in instances:
+                if l2._window_end is not None:
+                    self._window_games.update(l2._window_games)
+                    self._window_end = l2._window_end if self._window_end is None else max(self._window_end, l2._window_end)
+            if self._window_end is not None:
+                self._evict_window()
     
     def _same_configuration(self, l2):
         """Compare to another Leona instance to return if they have the same configuration
@@ -184,27 +798,63 @@ class Leona:
         if not self._stats_manager.keys() == l2._stats_manager.keys():
             return False
         
+        if self._window != l2._window or (self._window is not None and self._time_field != l2._time_field):
+            return False
+        
+        if self._partition_by != l2._partition_by:
+            return False
+        
         return all([self._stats_manager[k]._same_configuration(l2._stats_manager[k]) for k in self._stats_manager.keys()])
 
     
+# Tiers ordered from the lowest to the highest
+TIERS = ["UNRANKED", "IRON", "BRONZE", "SILVER", "GOLD", "PLATINUM", "DIAMOND", "MASTER", "GRANDMASTER", "CHALLENGER"]
+
 class RankManager:
     """Global manager for players rank
     
+    It also holds the dictionary encoding the players identity, shared by all the stats managers.
+    Ranks are looked up by code.
+    
     ...
     Methods
     -------
     set_rank(player, rank)
-        Forward the raw match data from Riot API to the stats manager which will handle the stats
+        Set the rank for one player
         
-    get_stats(key=None)
-        Return a list of key:DataFrame giving the computed stats
+    set_players_rank(players_rank)
+        Set the whole dict matching players summonerId to their rank
         
-    get_keys()
-        Get the list of keys that are used for the stats
+    get_rank(player)
+        Get the rank for one player
+        
+    get_ranks(codes)
+        Get the rank of many players, given by their code
+        
+    get_interner()
+        Get the dictionary encoding the players identity
     """
     
     def __init__(self):
         self._players_rank = {}
+        self._interner = Interner()
+        # Incremented each time ranks change
+        self._version = 0
+        # Tiers as an ordinal enum, other ranks being added after the known ones
+        self._tiers = list(TIERS)
+        self._tier_codes = {t:i for i, t in enumerate(self._tiers)}
+        # Tier code of each player code, extended as players are added to the interner
+        self._ranks = None
+        
+    def get_interner(self):
+        """Get the dictionary encoding the players identity
+        
+        Returns
+        -------
+        interner : Interner
+            The dictionary matching summonerId and accountId to codes
+        """
+        return self._interner
         
     def set_rank(self, player, rank):
         """Set the rank for one player
@@ -218,6 +868,13 @@ class RankManager:
             Rank of the player
         """
         self._players_rank[player] = rank
+        self._version += 1
+        tier_code = self._get_tier_code(rank)
+        
+        # Only the cached code of this player changes
+        code = self._interner.get_code(player)
+        if self._ranks is not None and code is not None and code < len(self._ranks):
+            self._ranks = self._set_code(self._ranks, code, tier_code)
         
     def set_players_rank(self, players_rank):
         """Set the whole dict matching players summonerId to their rank
@@ -228,6 +885,10 @@ class RankManager:
             Dict matching players summonerId to their rank
         """
         self._players_rank = players_rank
+        self._ranks = None
+        self._version += 1
+        for rank in set(players_rank.values()):
+            self._get_tier_code(rank)
         
     def get_rank(self, player):
         """Get the rank for one player
@@ -247,5 +908,108 @@ class RankManager:
         else: 
             return "UNRANKED"
         
+    def get_version(self):
+        """Get the version of the ranks, incremented each time they change
+        
+        Returns
+        -------
+        version : int
+            Version of the ranks
+        """
+        return self._version
+        
+    def get_tiers(self):
+        """Get the tiers matching the rank codes, ordered from the lowest
+        
+        Returns
+        -------
+        tiers : list of strings
+            Known tiers, followed by the other ranks in order of appearance
+        """
+        return list(self._tiers)
+        
+    def get_rank_codes(self, codes):
+        """Get the tier code of many players, given by their code
+        
+        Parameters
+        ----------
+        codes : array of int
+            Codes of the players in the interner
+            
+        Returns
+        -------
+        ranks : numpy array of int8
+            Tier code of each player, -1 for the players without rank
+        """
+        values = self._interner.get_values()
+        
+        if self._ranks is None:
+            self._ranks = np.empty(0, dtype=np.int8)
+            
+        if len(self._ranks) < len(values):
+            new_ranks = [self._get_tier_code(self.get_rank(p)) for p in values[len(self._ranks):]]
+            self._ranks = np.concatenate([self._ranks, np.array(new_ranks, dtype=self._get_code_dtype())])
+        
+        return self._ranks[np.asarray(codes, dtype=np.int64)]
+        
+    def get_ranks(self, codes):
+        """Get the rank of many players, given by their code
+        
+        Parameters
+        ----------
+        codes : array of int
+            Codes of the players in the interner
+            
+        Returns
+        -------
+        ranks : Pandas Categorical
+            Rank of each player, categories being ordered from the lowest tier
+        """
+        rank_codes = self.get_rank_codes(codes)
+        return pd.Categorical.from_codes(rank_codes, categories=self._tiers, ordered=True)
+        
+    def _get_tier_code(self, rank):
+        """Return the code of a rank, adding it to the tiers if unknown"""
+        if rank is None:
+            return -1
+        if rank not in self._tier_codes:
+            self._tier_codes[rank] = len(self._tiers)
+            self._tiers.append(rank)
+        return self._tier_codes[rank]
+    
+    def _get_code_dtype(self):
+        """Return the smallest integer type holding all the tier codes"""
+        return np.int8 if len(self._tiers) <= np.iinfo(np.int8).max else np.int32
+    
+    def _set_code(self, ranks, code, tier_code):
+        """Set the tier code of one player, promoting the array if needed"""
+        ranks = ranks.astype(self._get_code_dtype(), copy=False)
+        ranks[code] = tier_code
+        return ranks
+        
+    def get_remap(self, rank_manager):
+        """Get the translation of the identity codes of another rank manager into the ones of this one
+        
+        The identities unknown to this one are added to its interner.
+        
+        Parameters
+        ----------
+        rank_manager : RankManager
+            Another rank manager
+            
+        Returns
+        -------
+        remap : dict or None
+            Dict matching each identity field to the array translating its codes, None if both share the same interner
+        """
+        if rank_manager._interner is self._interner:
+            return None
+        codes = self._interner.encode(rank_manager._interner.get_values())
+        return {f:codes for f in INTERNED_FIELDS}
+        
     def merge(self, rank_manager):
-        self._players_rank.update(rank_manager._players_rank)
\ No newline at end of file
+        self._players_rank.update(rank_manager._players_rank)
+        self._ranks = None
+        self._version += 1
+        for rank in rank_manager._tiers:
+            self._get_tier_code(rank)
\ No newline at end of file
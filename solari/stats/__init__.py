@@ -11,7 +11,8 @@ from .champions_stats import (
     ChampionGeneric,
     ChampionGenericPerMin,
     ChampionKDA,
-    ChampionKillParticipation
+    ChampionKillParticipation,
+    ChampionTeamShare
 )
 
 from .items_rate_stats import (
@@ -30,5 +31,6 @@ from .player_stats import (
     PlayerGeneric,
     PlayerGenericPerMin,
     PlayerKDA,
-    PlayerKillParticipation
+    PlayerKillParticipation,
+    PlayerTeamShare
 )
\ No newline at end of file
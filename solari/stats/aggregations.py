@@ -0,0 +1,85 @@
+class Aggregation:
+    """Abstract class defining an aggregation of one field of the rows, grouped by keys
+
+    Stats declaring their partial aggregates as aggregations let their manager compute each distinct aggregation only once,
+    and share it between all the stats requiring it.
+
+    Parameters
+    ----------
+    keys : tuple of strings
+        Fields to group by, the aggregation being done over all the rows if empty
+
+    field : string
+        Field aggregated, default is gameId
+
+    bans : boolean
+        Default at False, determine if the aggregation is done over the bans instead of the participants
+
+    where : tuple, optional
+        Field and value the rows must match to be aggregated
+    """
+
+    def __init__(self, keys=(), field="gameId", bans=False, where=None):
+        self.keys = tuple(keys)
+        self.field = field
+        self.bans = bans
+        self.where = where
+
+    def _get_id(self):
+        return (self.__class__.__name__, self.keys, self.field, self.bans, self.where)
+
+    def __eq__(self, other):
+        return isinstance(other, Aggregation) and self._get_id() == other._get_id()
+
+    def __hash__(self):
+        return hash(self._get_id())
+
+    def __repr__(self):
+        return "%s(keys=%r, field=%r, bans=%r, where=%r)" % self._get_id()
+
+    def compute(self, frames):
+        """Compute the aggregation
+
+        Parameters
+        ----------
+        frames : Pandas DataFrame or tuple of Pandas DataFrames (df, df_bans)
+            Rows to aggregate
+
+        Returns
+        -------
+        aggregate : Pandas Series or number
+            Value of the aggregation grouped by the keys, or over all the rows if there is no key
+        """
+        df = frames if not isinstance(frames, tuple) else frames[1] if self.bans else frames[0]
+
+        if self.where is not None:
+            df = df[df[self.where[0]] == self.where[1]]
+
+        if len(self.keys) == 0:
+            return self._aggregate(df[self.field])
+        return self._aggregate(df.groupby(list(self.keys), observed=True)[self.field])
+
+    def _aggregate(self, values): # pragma: no cover
+        """Aggregate a column, or each group of a grouped column"""
+        pass
+
+
+class Count(Aggregation):
+    """Number of rows"""
+
+    def _aggregate(self, values):
+        return values.count()
+
+
+class Sum(Aggregation):
+    """Sum of the field"""
+
+    def _aggregate(self, values):
+        return values.sum()
+
+
+class NUnique(Aggregation):
+    """Number of distinct values of the field, for instance the number of games"""
+
+    def _aggregate(self, values):
+        return values.nunique()
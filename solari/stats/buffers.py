@@ -0,0 +1,620 @@
+import os
+import shutil
+import tempfile
+import weakref
+import numpy as np
+import pandas as pd
+
+def as_array(values):
+    """Convert values to a numpy array, strings being stored as Python objects
+
+    Parameters
+    ----------
+    values : list or array
+        Values to convert
+
+    Returns
+    -------
+    values : numpy array
+        The converted values
+    """
+    values = np.asarray(values)
+    if values.dtype.kind in "US":
+        values = values.astype(object)
+    return values
+
+def read_only(values):
+    """Return a read-only view of an array
+
+    Parameters
+    ----------
+    values : numpy array
+        The array
+
+    Returns
+    -------
+    values : numpy array
+        View of the array which can't be written
+    """
+    values = values.view()
+    values.flags.writeable = False
+    return values
+
+
+class Column:
+    """Growable typed array holding the values of one field
+
+    The dtype is inferred from the first values pushed, and promoted if later values do not fit in it.
+    Strings are stored as Python objects.
+
+    Parameters
+    ----------
+    capacity : int
+        Number of values allocated at first push
+    """
+
+    def __init__(self, capacity=1024):
+        self._data = None
+        self._size = 0
+        self._capacity = capacity
+
+    def __len__(self):
+        return self._size
+
+    def extend(self, values):
+        """Append values at the end of the column
+
+        Parameters
+        ----------
+        values : list or array
+            Values to append
+        """
+        n = len(values)
+        if n == 0:
+            return
+
+        values = as_array(values)
+
+        if self._data is None:
+            self._data = np.empty(max(self._capacity, n), dtype=values.dtype)
+        elif not np.can_cast(values.dtype, self._data.dtype, "safe"):
+            self._data = self._data.astype(np.result_type(self._data.dtype, values.dtype))
+
+        if self._size + n > len(self._data):
+            self._grow(self._size + n)
+
+        self._data[self._size:self._size + n] = values
+        self._size += n
+
+    def reserve(self, capacity):
+        """Allocate room for at least capacity values, so they can be appended without reallocating
+
+        Parameters
+        ----------
+        capacity : int
+            Number of values the column should be able to hold
+        """
+        if self._data is None:
+            self._capacity = max(self._capacity, capacity)
+        elif capacity > len(self._data):
+            data = np.empty(capacity, dtype=self._data.dtype)
+            data[:self._size] = self._data[:self._size]
+            self._data = data
+
+    def _grow(self, size):
+        """Reallocate the underlying array so it can hold at least size values"""
+        capacity = max(size, 2 * len(self._data))
+        data = np.empty(capacity, dtype=self._data.dtype)
+        data[:self._size] = self._data[:self._size]
+        self._data = data
+
+    def view(self):
+        """Return the filled part of the column, without copying
+
+        Returns
+        -------
+        values : numpy array
+            The values of the column
+        """
+        if self._data is None:
+            return np.empty(0)
+        return self._data[:self._size]
+
+    def save(self, path):
+        """Write the values of the column in a .npy file
+
+        Strings are written as fixed width unicode, so the file can be memory-mapped.
+
+        Parameters
+        ----------
+        path : string
+            Path of the file
+        """
+        values = self.view()
+        if values.dtype == object and all([isinstance(v, str) for v in values]):
+            values = values.astype(str)
+        np.save(path, values, allow_pickle=values.dtype == object)
+
+    @classmethod
+    def load(cls, path, mmap=True):
+        """Read a column written by save
+
+        Numeric values are memory-mapped, and only copied in memory once new values are appended.
+        Strings are read back as Python objects.
+
+        Parameters
+        ----------
+        path : string
+            Path of the file
+
+        mmap : boolean
+            Default at True, determine if the file is memory-mapped instead of read
+
+        Returns
+        -------
+        column : Column
+            The column read
+        """
+        column = cls()
+        try:
+            data = np.load(path, mmap_mode="r" if mmap else None)
+        except ValueError:
+            # Columns of Python objects can't be memory-mapped
+            data = np.load(path, allow_pickle=True)
+        if len(data) == 0:
+            # The dtype of an empty column is inferred from the first values pushed
+            return column
+        if data.dtype.kind in "US":
+            data = data.astype(object)
+        column._data = data
+        column._size = len(data)
+        return column
+
+
+class ColumnBuffer:
+    """Table of typed columns sharing the same number of rows
+
+    Rows are pushed column-wise, as a dict of lists of the same length.
+
+    Parameters
+    ----------
+    fields : list of strings
+        Name of the columns
+    """
+
+    def __init__(self, fields):
+        self._columns = {f:Column() for f in fields}
+        self._size = 0
+        # Ranges of consecutive rows sharing a value, by field
+        self._ranges = {}
+        # Incremented each time rows are removed, so rows are otherwise known to be only appended
+        self._generation = 0
+
+    def __len__(self):
+        return self._size
+
+    @property
+    def nbytes(self):
+        """Size of the stored values, in bytes
+
+        For strings, only the size of the references is considered.
+        """
+        return sum([c.view().nbytes for c in self._columns.values()])
+
+    def clear(self):
+        """Remove all the rows, releasing the memory"""
+        self._columns = {f:Column() for f in self._columns}
+        self._size = 0
+        self._ranges = {}
+        self._generation += 1
+
+    def get_generation(self):
+        """Return the number of times rows were removed from the buffer
+
+        As long as it doesn't change, the rows of the buffer are the same, followed by the ones appended since.
+
+        Returns
+        -------
+        generation : int
+            Number of removals
+        """
+        return self._generation
+
+    def get_fields(self):
+        """Return the name of the columns
+
+        Returns
+        -------
+        fields : list of strings
+            Name of the columns
+        """
+        return list(self._columns.keys())
+
+    def append_columns(self, columns):
+        """Append rows given as columns
+
+        Parameters
+        ----------
+        columns : dict
+            Dict matching each field to the list of its values, all lists having the same length
+        """
+        n = None
+        for f, c in self._columns.items():
+            values = columns[f]
+            c.extend(values)
+            n = len(values)
+
+        if n is not None:
+            self._size += n
+
+    def reserve(self, size):
+        """Allocate room for at least size rows in each column
+
+        Parameters
+        ----------
+        size : int
+            Number of rows the buffer should be able to hold
+        """
+        for c in self._columns.values():
+            c.reserve(size)
+
+    def extend_buffer(self, buffer, mask=None, remap=None):
+        """Append the rows of another buffer with the same fields
+
+        Parameters
+        ----------
+        buffer : ColumnBuffer
+            Buffer whose rows are appended
+
+        mask : numpy array of bool, optional
+            Rows of the other buffer to keep, all of them if not given
+
+        remap : dict, optional
+            Dict matching fields holding codes to the array translating them, values being used as indices
+        """
+        n = None
+        for f, c in self._columns.items():
+            values = buffer._columns[f].view()
+            if mask is not None:
+                values = values[mask]
+            if remap is not None and f in remap and len(values) > 0:
+                values = remap[f][values]
+            c.extend(values)
+            n = len(values)
+
+        if n is not None:
+            self._size += n
+
+    def extend_ranges(self, buffer, starts, stops, remap=None):
+        """Append ranges of rows of another buffer with the same fields
+
+        Parameters
+        ----------
+        buffer : ColumnBuffer
+            Buffer whose rows are appended
+
+        starts, stops : numpy arrays of int
+            Index of the first row of each range, and index after its last row
+
+        remap : dict, optional
+            Dict matching fields holding codes to the array translating them, values being used as indices
+        """
+        n = None
+        for f, c in self._columns.items():
+            values = buffer._columns[f].view()
+            if len(starts) == 1:
+                values = values[starts[0]:stops[0]]
+            else:
+                values = np.concatenate([values[start:stop] for start, stop in zip(starts, stops)]) if len(starts) > 0 else values[:0]
+            if remap is not None and f in remap and len(values) > 0:
+                values = remap[f][values]
+            c.extend(values)
+            n = len(values)
+
+        if n is not None:
+            self._size += n
+
+    def get_ranges(self, field):
+        """Return the ranges of consecutive rows sharing the same value of a field
+
+        Rows of a game being pushed together, each range of gameId holds all the rows of one game.
+        The ranges are cached, and only computed for the rows appended since the last call.
+
+        Parameters
+        ----------
+        field : string
+            Name of the column
+
+        Returns
+        -------
+        values : numpy array
+            Value of each range
+
+        starts, stops : numpy arrays of int
+            Index of the first row of each range, and index after its last row
+        """
+        values = self._columns[field].view()
+
+        cached = self._ranges.get(field)
+        if cached is not None and cached[0] == self._size:
+            return cached[1:]
+
+        # The last range may continue in the rows appended since, so it is computed again
+        offset = 0
+        starts = np.empty(0, dtype=np.int64)
+        if cached is not None and cached[0] < self._size and len(cached[2]) > 0:
+            offset = cached[2][-1]
+            starts = cached[2][:-1]
+
+        tail = values[offset:]
+        if len(tail) > 0:
+            new_starts = offset + np.flatnonzero(np.concatenate([[True], tail[1:] != tail[:-1]]))
+            starts = np.concatenate([starts, new_starts])
+
+        stops = np.append(starts[1:], self._size) if len(starts) > 0 else starts
+        ranges = (values[starts], starts, stops)
+        self._ranges[field] = (self._size,) + ranges
+        return ranges
+
+    def get_kept_ranges(self, field, excluded):
+        """Return the ranges of rows whose value of a field is not excluded, consecutive ranges being joined
+
+        Parameters
+        ----------
+        field : string
+            Name of the column
+
+        excluded : array
+            Values whose rows are excluded
+
+        Returns
+        -------
+        starts, stops : numpy arrays of int
+            Index of the first row of each range, and index after its last row
+        """
+        values, starts, stops = self.get_ranges(field)
+        kept = ~np.isin(values, excluded)
+
+        # Runs of kept ranges become a single range
+        changes = np.diff(np.concatenate([[False], kept, [False]]).astype(np.int8))
+        first = np.flatnonzero(changes == 1)
+        last = np.flatnonzero(changes == -1) - 1
+        return starts[first], stops[last]
+
+    def get_column(self, field):
+        """Return the values of one column, without copying
+
+        Parameters
+        ----------
+        field : string
+            Name of the column
+
+        Returns
+        -------
+        values : numpy array
+            The values of the column
+        """
+        return self._columns[field].view()
+
+    def slice(self, start, stop=None):
+        """Return the rows from start to stop as a new buffer, without copying
+
+        Parameters
+        ----------
+        start : int
+            Index of the first row
+
+        stop : int, optional
+            Index after the last row, the end of the buffer if not given
+
+        Returns
+        -------
+        buffer : ColumnBuffer
+            Buffer sharing the values of this one
+        """
+        stop = self._size if stop is None else min(stop, self._size)
+        buffer = ColumnBuffer([])
+        for f, c in self._columns.items():
+            column = Column()
+            column._data = c.view()[start:stop]
+            column._size = len(column._data)
+            buffer._columns[f] = column
+        buffer._size = max(stop - start, 0)
+        return buffer
+
+    def filter(self, mask):
+        """Keep only the rows selected by the mask
+
+        Parameters
+        ----------
+        mask : numpy array of bool
+            Rows to keep
+        """
+        buffer = ColumnBuffer(self.get_fields())
+        buffer.extend_buffer(self, mask)
+        self._columns = buffer._columns
+        self._size = buffer._size
+        self._ranges = {}
+        self._generation += 1
+
+    def to_frame(self):
+        """Wrap the columns into a DataFrame, without copying
+
+        The columns are read-only views, so the DataFrame can be shared without the rows being modified.
+
+        Returns
+        -------
+        df : Pandas DataFrame
+            DataFrame with one column per field
+        """
+        return pd.DataFrame({f:read_only(c.view()) for f, c in self._columns.items()}, copy=False)
+
+    def save(self, directory):
+        """Write each column in a .npy file of the directory
+
+        Parameters
+        ----------
+        directory : string
+            Path of the directory, created if needed
+        """
+        os.makedirs(directory, exist_ok=True)
+        for f, c in self._columns.items():
+            c.save(os.path.join(directory, f + ".npy"))
+
+    @classmethod
+    def load(cls, directory, fields, mmap=True):
+        """Read a buffer written by save
+
+        Parameters
+        ----------
+        directory : string
+            Path of the directory
+
+        fields : list of strings
+            Name of the columns
+
+        mmap : boolean
+            Default at True, determine if the files are memory-mapped instead of read
+
+        Returns
+        -------
+        buffer : ColumnBuffer
+            The buffer read
+        """
+        buffer = cls([])
+        buffer._columns = {f:Column.load(os.path.join(directory, f + ".npy"), mmap) for f in fields}
+        buffer._size = len(next(iter(buffer._columns.values()))) if len(fields) > 0 else 0
+        return buffer
+
+
+class SpillStore:
+    """On-disk storage of buffers, by chunks
+
+    Once the buffers of a stats manager exceed the threshold, they are written as a new chunk and emptied.
+    Chunks always hold complete games.
+
+    Parameters
+    ----------
+    threshold : int
+        Size in bytes of the buffers above which they are written on disk
+
+    directory : string, optional
+        Directory where the chunks are written, a temporary directory removed with the store if not given.
+        Each store writes its chunks in its own subdirectory, so several stores can share the same directory.
+    """
+
+    def __init__(self, threshold, directory=None):
+        self._threshold = threshold
+        self._chunks = []
+        self._owned = directory is None
+        self._root = directory
+        # The directory of the store is only created once a chunk is written
+        self._directory = None
+
+    def __len__(self):
+        return len(self._chunks)
+
+    def _get_directory(self):
+        """Return the directory of the chunks of the store, created if needed"""
+        if self._directory is None:
+            if self._owned:
+                self._directory = tempfile.mkdtemp(prefix="solari-")
+                weakref.finalize(self, shutil.rmtree, self._directory, True)
+            else:
+                os.makedirs(self._root, exist_ok=True)
+                self._directory = tempfile.mkdtemp(prefix="store-", dir=self._root)
+        return self._directory
+
+    def remove(self):
+        """Remove the chunks from the disk, once their rows were merged elsewhere"""
+        if self._directory is not None:
+            shutil.rmtree(self._directory, True)
+        self._directory = None
+        self._chunks = []
+
+    def should_spill(self, buffers):
+        """Return if the buffers exceed the threshold
+
+        Parameters
+        ----------
+        buffers : dict
+            Dict matching a name to each ColumnBuffer
+
+        Returns
+        -------
+        spill : bool
+            True if the buffers should be written on disk
+        """
+        return sum([b.nbytes for b in buffers.values()]) >= self._threshold
+
+    def spill(self, buffers):
+        """Write the buffers as a new chunk, then empty them
+
+        Parameters
+        ----------
+        buffers : dict
+            Dict matching a name to each ColumnBuffer
+        """
+        path = os.path.join(self._get_directory(), "chunk_%05d" % len(self._chunks))
+        for name, b in buffers.items():
+            b.save(os.path.join(path, name))
+            b.clear()
+        self._chunks.append((path, {name:b.get_fields() for name, b in buffers.items()}))
+
+    def add_chunk(self, source, fields):
+        """Add a chunk written elsewhere, its files being linked into the directory of the store, or copied if they can't be
+
+        Parameters
+        ----------
+        source : string
+            Directory of the chunk, holding one directory per buffer
+
+        fields : dict
+            Dict matching a name to the fields of each buffer of the chunk
+        """
+        path = os.path.join(self._get_directory(), "chunk_%05d" % len(self._chunks))
+        for name in fields:
+            os.makedirs(os.path.join(path, name))
+            for f in os.listdir(os.path.join(source, name)):
+                try:
+                    os.link(os.path.join(source, name, f), os.path.join(path, name, f))
+                except OSError:
+                    shutil.copyfile(os.path.join(source, name, f), os.path.join(path, name, f))
+        self._chunks.append((path, fields))
+
+    def iter_chunks(self):
+        """Read the chunks one at a time
+
+        Yields
+        ------
+        buffers : dict
+            Dict matching a name to each memory-mapped ColumnBuffer of the chunk
+        """
+        for path, fields in self._chunks:
+            yield {name:ColumnBuffer.load(os.path.join(path, name), f) for name, f in fields.items()}
+
+    def __getstate__(self):
+        # A temporary directory is removed with its store, so its chunks are sent along
+        state = {"threshold":self._threshold, "owned":self._owned, "directory":self._root, "path":self._directory, "chunks":self._chunks}
+        if self._owned:
+            state["chunks"] = [
+                {name:{f:b.get_column(f) for f in b.get_fields()} for name, b in buffers.items()}
+                for buffers in self.iter_chunks()
+            ]
+        return state
+
+    def __setstate__(self, state):
+        if not state["owned"]:
+            self.__init__(state["threshold"], state["directory"])
+            # The chunks stay in the directory of the store they come from
+            self._directory = state["path"]
+            self._chunks = state["chunks"]
+            return
+
+        self.__init__(state["threshold"])
+        for chunk in state["chunks"]:
+            buffers = {}
+            for name, columns in chunk.items():
+                buffers[name] = ColumnBuffer(list(columns.keys()))
+                buffers[name].append_columns(columns)
+            self.spill(buffers)
@@ -1,5 +1,6 @@
 from .stats_types import ChampionStats, SpecialStats, DerivedStats, ChampionBanStats
 from .stats_managers import ChampionStatsManager, ChampionDuplicateStatsManager
+from .aggregations import Count, NUnique
 
 import pandas as pd
 from functools import lru_cache
@@ -18,6 +19,7 @@ class ChampionPickrate(ChampionStats):
     """
     
     name = "Pickrate"
+    incremental = True
     
     def __init__(self, by_league = False):
         self._by_league = by_league
@@ -39,23 +41,17 @@ class ChampionPickrate(ChampionStats):
     def get_id_fields_required(self):
         return ["summonerId"] if self._by_league else []
     
-    def get_stats(self, df):
-        groupby = list(self.get_keys())
+    def get_aggregations(self):
+        picks = Count(self.get_keys())
         
-        picks = (
-            df.groupby(groupby)
-                .count()
-                ["gameId"]
-        )
+        games = Count(("league",)) if self._by_league else NUnique()
         
-        opportunities = (
-            df.groupby(["league"])
-                .count()
-                ["gameId"]
-        ) / 10 if self._by_league else len(df["gameId"].unique())
-
+        return {"picks":picks, "games":games}
+    
+    def get_stats_from_partial(self, partial):
+        opportunities = partial["games"] / 10 if self._by_league else partial["games"]
         
-        return (picks/opportunities)
+        return (partial["picks"]/opportunities)
     
 class ChampionPickCount(ChampionStats):
     """Stats for number of picks per champion
@@ -68,6 +64,7 @@ class ChampionPickCount(ChampionStats):
         Default at False, determine if the stats groups by league.
     """
     name = "Pick Count"
+    incremental = True
     
     def __init__(self, by_league = False):
         self._by_league = by_league
@@ -89,15 +86,11 @@ class ChampionPickCount(ChampionStats):
     def get_id_fields_required(self):
         return ["summonerId"] if self._by_league else []
     
-    def get_stats(self, df):
-        groupby = list(self.get_keys())
-        picks = (
-            df.groupby(groupby)
-                .count()
-                ["gameId"]
-        )
-        
-        return picks
+    def get_aggregations(self):
+        return {"picks":Count(self.get_keys())}
+    
+    def get_stats_from_partial(self, partial):
+        return partial["picks"]
     
     
 class ChampionWinrate(ChampionStats):
@@ -111,6 +104,7 @@ class ChampionWinrate(ChampionStats):
         Default at False, determine if the stats groups by league.
     """
     name = "Winrate"
+    incremental = True
     
     def __init__(self, by_league = False):
         self._by_league = by_league
@@ -135,23 +129,15 @@ class ChampionWinrate(ChampionStats):
     def get_id_fields_required(self):
         return ["summonerId"] if self._by_league else []
     
-    def get_stats(self, df):
-        groupby = list(self.get_keys())
-        
-        picks = (
-            df.groupby(groupby)
-                .count()
-                ["gameId"]
-        )
+    def get_aggregations(self):
+        picks = Count(self.get_keys())
         
-        wins = (
-            df[df["win"]]
-                .groupby(groupby)
-                .count()
-                ["gameId"]
-        )
+        wins = Count(self.get_keys(), where=("win", True))
 
-        return (wins/picks).fillna(0)
+        return {"picks":picks, "wins":wins}
+    
+    def get_stats_from_partial(self, partial):
+        return (partial["wins"]/partial["picks"]).fillna(0)
     
     
     
@@ -170,6 +156,7 @@ class ChampionBanrate(ChampionStats, ChampionBanStats):
         Default at False, determine if the stats groups by league.
     """
     name = "Banrate"
+    incremental = True
     
     def __init__(self, team_wise = False, by_league = False):
         self._team_wise = team_wise
@@ -189,33 +176,18 @@ class ChampionBanrate(ChampionStats, ChampionBanStats):
             return ChampionDuplicateStatsManager
         return ChampionStatsManager
                 
-    def get_stats(self, dfs):
-        df = dfs[0]
-        df_bans = dfs[1]
-        
-        groupby = list(self.get_keys())
-        
-        game_number = (
-            df_bans.groupby(["league"])
-                .count()
-                ["gameId"]
-        ) / 10 if self._by_league else len(df_bans["gameId"].unique())
-        
-        # game_number = len(df["gameId"].unique())
+    def get_aggregations(self):
+        games = Count(("league",), bans=True) if self._by_league else NUnique(bans=True)
         
-        if not self._team_wise:
-            if self._by_league:
-                df_bans.drop_duplicates(subset=["gameId","championId","league"], inplace=True)
-            else:
-                df_bans.drop_duplicates(subset=["gameId","championId"], inplace=True)
+        # Unless team wise, a champion banned by both teams is counted once per game
+        bans = Count(self.get_keys(), bans=True) if self._team_wise else NUnique(self.get_keys(), bans=True)
         
-        bans = (
-            df_bans.groupby(groupby)
-                .count()
-                ["gameId"]
-        )
+        return {"bans":bans, "games":games}
+    
+    def get_stats_from_partial(self, partial):
+        game_number = partial["games"] / 10 if self._by_league else partial["games"]
         
-        return (bans/game_number)
+        return (partial["bans"]/game_number)
     
 class ChampionBanCount(ChampionStats, ChampionBanStats):
     """Stats for number of bans per champion
@@ -232,6 +204,7 @@ class ChampionBanCount(ChampionStats, ChampionBanStats):
         Default at False, determine if the stats groups by league.
     """
     name = "Ban Count"
+    incremental = True
     
     def __init__(self, team_wise = False, by_league = False):
         self._champion_bans = []
@@ -252,24 +225,14 @@ class ChampionBanCount(ChampionStats, ChampionBanStats):
             return ChampionDuplicateStatsManager
         return ChampionStatsManager
                 
-    def get_stats(self, dfs):
-        df, df_bans = dfs
-        
-        groupby = list(self.get_keys())
-        
-        if not self._team_wise:
-            if self._by_league:
-                df_bans.drop_duplicates(subset=["gameId","championId","league"], inplace=True)
-            else:
-                df_bans.drop_duplicates(subset=["gameId","championId"], inplace=True)
+    def get_aggregations(self):
+        # Unless team wise, a champion banned by both teams is counted once per game
+        bans = Count(self.get_keys(), bans=True) if self._team_wise else NUnique(self.get_keys(), bans=True)
         
-        bans = (
-            df_bans.groupby(groupby)
-                .count()
-                ["gameId"]
-        )
-        
-        return bans
+        return {"bans":bans}
+    
+    def get_stats_from_partial(self, partial):
+        return partial["bans"]
     
 class ChampionPresenceRate(ChampionStats, DerivedStats, ChampionBanStats):
     """Stats for presence per champion
@@ -282,6 +245,7 @@ class ChampionPresenceRate(ChampionStats, DerivedStats, ChampionBanStats):
         Default at False, determine if the stats groups by league.
     """
     name = "Presence"
+    incremental = True
     priority = 1
     
     def __init__(self, by_league = False):
@@ -310,25 +274,24 @@ class ChampionPresenceRate(ChampionStats, DerivedStats, ChampionBanStats):
     def get_stats_required(self):
         return [ChampionPickrate, ChampionBanrate]
     
-    def get_stats(self, dfs, stats):
-        df, df_bans = dfs
+    def get_aggregations(self):
+        # Same aggregations as the games of the pickrate and the banrate, computed only once
+        keys = ("league",) if self._by_league else ()
         
+        ban_games = NUnique(keys, bans=True)
+        
+        pick_games = NUnique(keys)
+        
+        return {"ban_games":ban_games, "pick_games":pick_games}
+    
+    def get_stats_from_partial(self, partial, stats):
         df_temp = pd.DataFrame()
         df_temp["pickrate"] = stats[ChampionPickrate.name]
         df_temp["banrate"] = stats[ChampionBanrate.name]
         
         df_temp = df_temp.fillna(0)
         
-        ban_games = (
-            df_bans.drop_duplicates(subset=["gameId","league"]).groupby(["league"])
-                .count()
-                ["gameId"]
-        ) / 10 if self._by_league else len(df_bans["gameId"].unique())
-        
-        pick_games = (
-            df.drop_duplicates(subset=["gameId","league"]).groupby(["league"])
-                .count()
-                ["gameId"]
-        ) / 10 if self._by_league else len(df["gameId"].unique())
+        ban_games = partial["ban_games"] / 10 if self._by_league else partial["ban_games"]
+        pick_games = partial["pick_games"] / 10 if self._by_league else partial["pick_games"]
         
         return (df_temp["pickrate"] +( df_temp["banrate"] * (ban_games / pick_games )))
\ No newline at end of file
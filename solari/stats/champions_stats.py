@@ -1,4 +1,4 @@
-from .stats_types import ChampionStats #, SpecialStats, DerivedStats
+from .stats_types import ChampionStats, team_total #, SpecialStats, DerivedStats
 from .stats_managers import ChampionStatsManager, ChampionDuplicateStatsManager
 
 class ChampionGeneric(ChampionStats):
@@ -18,6 +18,7 @@ class ChampionGeneric(ChampionStats):
     """
     
     name = "Generic"
+    incremental = True
     
     def __init__(self, field, name=None, by_league = False):
         if name is None:
@@ -49,9 +50,13 @@ class ChampionGeneric(ChampionStats):
     def get_id_fields_required(self):
         return ["summonerId"] if self._by_league else []
     
-    def get_stats(self, df):
+    def get_partial_stats(self, df):
         groupby = list(self.get_keys())
-        return df.groupby(groupby).mean()[self._field]
+        grouped = df.groupby(groupby, observed=True)[self._field]
+        return {"sum":grouped.sum(), "count":grouped.count()}
+    
+    def get_stats_from_partial(self, partial):
+        return partial["sum"] / partial["count"]
 
     
 class ChampionGenericPerMin(ChampionStats):
@@ -71,6 +76,7 @@ class ChampionGenericPerMin(ChampionStats):
     """
     
     name = "GenericPerMin"
+    incremental = True
     
     def __init__(self, field, name=None, by_league = False):
         if name is None:
@@ -102,10 +108,16 @@ class ChampionGenericPerMin(ChampionStats):
     def get_id_fields_required(self):
         return ["summonerId"] if self._by_league else []
     
-    def get_stats(self, df):
+    def get_derived_columns(self):
+        return {self._field + "PerMin":lambda df: df[self._field] * 60 / df["gameDuration"]}
+    
+    def get_partial_stats(self, df):
         groupby = list(self.get_keys())
-        df[self._field + "PerMin"] = df[self._field] * 60 / df["gameDuration"]
-        return df.groupby(groupby).mean()[self._field + "PerMin"]
+        grouped = df.groupby(groupby, observed=True)[self._field + "PerMin"]
+        return {"sum":grouped.sum(), "count":grouped.count()}
+    
+    def get_stats_from_partial(self, partial):
+        return partial["sum"] / partial["count"]
 
 class ChampionKDA(ChampionStats):
     """Stats for mean KDA per champion
@@ -119,6 +131,7 @@ class ChampionKDA(ChampionStats):
     """
     
     name = "KDA"
+    incremental = True
     
     def __init__(self, by_league = False):
         self._by_league = by_league
@@ -143,12 +156,17 @@ class ChampionKDA(ChampionStats):
     def get_id_fields_required(self):
         return ["summonerId"] if self._by_league else []
     
-    def get_stats(self, df):
+    def get_derived_columns(self):
+        return {"KDA":lambda df: (df["kills"] + df["assists"]) / (df["deaths"].replace(0,1))}
+    
+    def get_partial_stats(self, df):
         groupby = list(self.get_keys())
         
-        df["KDA"] = (df["kills"] + df["assists"]) / (df["deaths"].replace(0,1))
-        
-        return df.groupby(groupby).mean()["KDA"]
+        grouped = df.groupby(groupby, observed=True)["KDA"]
+        return {"sum":grouped.sum(), "count":grouped.count()}
+    
+    def get_stats_from_partial(self, partial):
+        return partial["sum"] / partial["count"]
 
     
 class ChampionKillParticipation(ChampionStats):
@@ -161,6 +179,7 @@ class ChampionKillParticipation(ChampionStats):
     """
     
     name = "KP"
+    incremental = True
     
     def __init__(self, by_league = False):
         self._by_league = by_league
@@ -185,12 +204,83 @@ class ChampionKillParticipation(ChampionStats):
     def get_id_fields_required(self):
         return ["summonerId"] if self._by_league else []
     
-    def get_stats(self, df):
+    def get_team_fields_required(self):
+        return ["kills"]
+    
+    def get_derived_columns(self):
+        return {"kp":lambda df: (df["kills"] + df["assists"]) / df[team_total("kills")]}
+    
+    def get_partial_stats(self, df):
         groupby = list(self.get_keys())
         
-        tk = df.drop_duplicates(subset=["gameId","championId","teamId"]).groupby(["gameId","teamId"]).sum()["kills"]
+        grouped = df.groupby(groupby, observed=True)["kp"]
+        return {"sum":grouped.sum(), "count":grouped.count()}
+    
+    def get_stats_from_partial(self, partial):
+        return partial["sum"] / partial["count"]
+
+
+class ChampionTeamShare(ChampionStats):
+    """Stats for the mean share of the team total of any single stats field under participants->stats, per champion
+    
+    For instance the damage share or the gold share.
+    
+    Parameters
+    ----------
+    field : string
+        The stats field that should be considered
         
-        df["kp"] = (df["kills"] + df["assists"]) / [tk.loc[(i["gameId"],i["teamId"])] for k,i in df.iterrows()]
+    name : string, optional
+        Rename the stats, default is the name of the field followed by "Share"
         
+    by_league : boolean
+        Default at False, determine if the stats groups by league.
+    
+    """
+    
+    name = "TeamShare"
+    incremental = True
+    
+    def __init__(self, field, name=None, by_league = False):
+        if name is None:
+            self.name = field + "Share"
+        else:
+            self.name = name
         
-        return df.groupby(groupby).mean()["kp"]
\ No newline at end of file
+        self._field = field
+        
+        self._by_league = by_league
+    
+    def get_keys(self):
+        return ("league","championId",) if self._by_league else ("championId",)
+    
+    def get_manager(self):
+        if self._by_league:
+            return ChampionDuplicateStatsManager
+        return ChampionStatsManager
+    
+    def get_game_fields_required(self):
+        return ["gameId"]
+    
+    def get_participant_fields_required(self):
+        return ["championId", "teamId"]
+    
+    def get_stats_fields_required(self):
+        return [self._field]
+    
+    def get_id_fields_required(self):
+        return ["summonerId"] if self._by_league else []
+    
+    def get_team_fields_required(self):
+        return [self._field]
+    
+    def get_derived_columns(self):
+        return {self._field + "Share":lambda df: df[self._field] / df[team_total(self._field)]}
+    
+    def get_partial_stats(self, df):
+        groupby = list(self.get_keys())
+        grouped = df.groupby(groupby, observed=True)[self._field + "Share"]
+        return {"sum":grouped.sum(), "count":grouped.count()}
+    
+    def get_stats_from_partial(self, partial):
+        return partial["sum"] / partial["count"]
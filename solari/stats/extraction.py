@@ -0,0 +1,257 @@
+import numpy as np
+from itertools import chain, repeat
+from operator import itemgetter
+from .buffers import as_array
+from .interner import INTERNED_FIELDS
+
+ITEM_FIELDS = ["item0","item1","item2","item3","item4","item5","item6"]
+
+_get_stats = itemgetter("stats")
+_get_participant_id = itemgetter("participantId")
+_get_player = itemgetter("player")
+_get_pick_turn = itemgetter("pickTurn")
+_get_game_id = itemgetter("gameId")
+
+class Extraction:
+    """Fields extracted from a batch of matches, shared by all the stats managers
+    
+    Columns are converted to arrays only once, on first access.
+    Identity fields are converted to codes if an Interner is given.
+    
+    Parameters
+    ----------
+    matches : list of dict
+        Raw data from Riot API match-v4 endpoint
+        
+    participants : dict
+        Dict matching each field to the list of its values, one per participant
+        
+    bans : dict
+        Dict matching each field to the list of its values, one per ban
+        
+    interner : Interner, optional
+        Dictionary encoding the identity fields
+    """
+    
+    def __init__(self, matches, participants, bans, interner=None):
+        self.matches = matches
+        self._participants = participants
+        self._bans = bans
+        self._interner = interner
+        self._arrays = {}
+        
+    def _as_array(self, field, values):
+        """Convert the values of one field to an array, encoding them if needed"""
+        if self._interner is not None and field in INTERNED_FIELDS:
+            return self._interner.encode(values)
+        return as_array(values)
+        
+    def get_participant_column(self, field):
+        """Return the values of one field, one per participant
+        
+        Parameters
+        ----------
+        field : string
+            Name of the field
+            
+        Returns
+        -------
+        values : numpy array
+            The values of the field
+        """
+        if ("participant", field) not in self._arrays:
+            self._arrays[("participant", field)] = self._as_array(field, self._participants[field])
+        return self._arrays[("participant", field)]
+    
+    def get_team_total(self, field):
+        """Return the total of one field over the team of each participant
+        
+        Requires the gameId and teamId fields.
+        
+        Parameters
+        ----------
+        field : string
+            Name of the field
+            
+        Returns
+        -------
+        values : numpy array
+            The total of the field for the team of each participant
+        """
+        if ("team", field) not in self._arrays:
+            if ("team", None) not in self._arrays:
+                # Index of the (gameId, teamId) of each participant
+                teams = np.stack([self.get_participant_column("gameId"), self.get_participant_column("teamId")], axis=1)
+                self._arrays[("team", None)] = np.unique(teams, axis=0, return_inverse=True)[1].reshape(-1)
+            inverse = self._arrays[("team", None)]
+            
+            values = self.get_participant_column(field)
+            totals = np.bincount(inverse, weights=values.astype(np.float64))
+            if values.dtype.kind in "iub":
+                totals = totals.astype(np.int64)
+            self._arrays[("team", field)] = totals[inverse]
+        return self._arrays[("team", field)]
+    
+    def get_participant_columns(self, fields):
+        """Return the values of the fields, one per participant
+        
+        Parameters
+        ----------
+        fields : list of strings
+            Name of the fields
+            
+        Returns
+        -------
+        columns : dict
+            Dict matching each field to its values
+        """
+        return {f:self.get_participant_column(f) for f in fields}
+    
+    def get_ban_columns(self, fields):
+        """Return the values of the fields, one per ban
+        
+        Parameters
+        ----------
+        fields : list of strings
+            Name of the fields
+            
+        Returns
+        -------
+        columns : dict
+            Dict matching each field to its values
+        """
+        for f in fields:
+            if ("ban", f) not in self._arrays:
+                self._arrays[("ban", f)] = self._as_array(f, self._bans[f])
+        return {f:self._arrays[("ban", f)] for f in fields}
+    
+    
+class FieldExtractor:
+    """Extraction planner walking each match once for several stats managers
+    
+    The fields required by all the managers are gathered, and extracted together in a single pass over the match data.
+    
+    Parameters
+    ----------
+    managers : list of StatsManager
+        Stats managers whose required fields are extracted
+        
+    interner : Interner, optional
+        Dictionary encoding the identity fields, kept as strings if not given
+    """
+    
+    def __init__(self, managers, interner=None):
+        self._interner = interner
+        
+        fields = {"game":set(), "participant":set(), "stats":set(), "id":set(), "ban":set()}
+        
+        for m in managers:
+            for level, f in m.get_fields_required().items():
+                fields[level].update(f)
+                
+        # Bans are linked to players through the participant identities
+        fields["id"].update([f for f in fields["ban"] if f in ["summonerId","accountId"]])
+        
+        self._game_fields = sorted(fields["game"])
+        self._participant_fields = sorted(fields["participant"])
+        self._stats_fields = sorted(fields["stats"])
+        self._id_fields = sorted(fields["id"])
+        self._ban_fields = sorted(fields["ban"])
+        
+        # Getters are built once, with the fields baked in
+        self._participant_getters = [(f, itemgetter(f)) for f in self._participant_fields]
+        self._stats_getters = [(f, itemgetter(f)) for f in self._stats_fields]
+        self._game_getters = [(f, itemgetter(f)) for f in self._game_fields]
+        self._id_getters = [(f, itemgetter(f)) for f in self._id_fields]
+        
+    def extract(self, matches):
+        """Extract the required fields from a batch of matches
+        
+        Parameters
+        ----------
+        matches : list of dict
+            Raw data from Riot API match-v4 endpoint
+            
+        Returns
+        -------
+        extraction : Extraction
+            The extracted fields
+        """
+        return Extraction(matches, *self._extract_fast(matches), self._interner)
+        
+    def _extract_fast(self, matches):
+        """Extract the required fields from a batch of matches, with the getters of the configuration
+        
+        All the participants of the batch are flattened into one list, then each field is extracted by mapping its getter over it.
+        
+        Parameters
+        ----------
+        matches : list of dict
+            Raw data from Riot API match-v4 endpoint
+            
+        Returns
+        -------
+        participants : dict
+            Dict matching each field to the list of its values, one per participant
+            
+        bans : dict
+            Dict matching each field to the list of its values, one per ban
+        """
+        participants = [p for match_data in matches for p in match_data["participants"]]
+        
+        columns = {f:list(map(g, participants)) for f, g in self._participant_getters}
+        
+        if len(self._stats_getters) > 0:
+            stats = list(map(_get_stats, participants))
+            columns.update({f:list(map(g, stats)) for f, g in self._stats_getters})
+            
+        ban_fields = self._ban_fields
+        bans = {f:[] for f in ban_fields}
+        
+        if len(self._game_getters) == 0 and len(self._id_getters) == 0 and len(ban_fields) == 0:
+            return columns, bans
+        
+        # Game level values are repeated for each participant
+        counts = [len(match_data["participants"]) for match_data in matches]
+        for f, g in self._game_getters:
+            columns[f] = list(chain.from_iterable(map(repeat, map(g, matches), counts)))
+        
+        match_bans = []
+        if len(ban_fields) > 0:
+            match_bans = [b for match_data in matches for t in match_data["teams"] for b in t["bans"]]
+            ban_counts = [sum([len(t["bans"]) for t in match_data["teams"]]) for match_data in matches]
+        
+        # Players are matched to participants, then to bans, by participantId
+        players = []
+        ban_players = []
+        if len(self._id_getters) > 0:
+            identities = [i for match_data in matches for i in match_data["participantIdentities"]]
+            ids = list(chain.from_iterable(map(range, repeat(1), [n + 1 for n in counts])))
+            
+            if list(map(_get_participant_id, participants)) == ids and list(map(_get_participant_id, identities)) == ids:
+                # Participants and identities are both ordered by participantId, as given by the API
+                players = list(map(_get_player, identities))
+                if len(match_bans) > 0:
+                    # The player of a ban is found from the position of the first participant of its match
+                    offsets = np.repeat(np.cumsum([0] + counts[:-1]), ban_counts)
+                    positions = offsets + np.array(list(map(_get_pick_turn, match_bans))) - 1
+                    ban_players = list(map(players.__getitem__, positions.tolist()))
+            else:
+                for match_data in matches:
+                    match_players = {i["participantId"]:i["player"] for i in match_data["participantIdentities"]}
+                    players += [match_players[p["participantId"]] for p in match_data["participants"]]
+                    if len(match_bans) > 0:
+                        ban_players += [match_players[b["pickTurn"]] for t in match_data["teams"] for b in t["bans"]]
+            
+            columns.update({f:list(map(g, players)) for f, g in self._id_getters})
+        
+        for f in ban_fields:
+            if f == "gameId":
+                bans[f] = np.repeat(list(map(_get_game_id, matches)), ban_counts).tolist()
+            elif f in self._id_fields:
+                bans[f] = list(map(itemgetter(f), ban_players))
+            else:
+                bans[f] = list(map(itemgetter(f), match_bans))
+            
+        return columns, bans
+
@@ -0,0 +1,83 @@
+import numpy as np
+
+# Identity fields stored as codes in the rows
+INTERNED_FIELDS = ["summonerId","accountId"]
+
+class Interner:
+    """Shared dictionary matching strings to int32 codes
+
+    Codes are given in order of first appearance, so they stay valid as new strings are added.
+    """
+
+    def __init__(self):
+        self._codes = {}
+        self._values = None
+
+    def __len__(self):
+        return len(self._codes)
+
+    def encode(self, values):
+        """Return the code of each value, adding the unknown ones to the dictionary
+
+        Parameters
+        ----------
+        values : list or array of strings
+            Values to encode
+
+        Returns
+        -------
+        codes : numpy array of int32
+            Code of each value
+        """
+        codes = self._codes
+        setdefault = codes.setdefault
+        return np.fromiter((setdefault(v, len(codes)) for v in values), dtype=np.int32, count=len(values))
+
+    def get_code(self, value):
+        """Return the code of a value, without adding it to the dictionary
+
+        Parameters
+        ----------
+        value : string
+            Value to look up
+
+        Returns
+        -------
+        code : int or None
+            Code of the value, None if unknown
+        """
+        return self._codes.get(value)
+
+    def decode(self, codes):
+        """Return the value of each code
+
+        Parameters
+        ----------
+        codes : array of int
+            Codes to decode
+
+        Returns
+        -------
+        values : numpy array of strings
+            Value of each code, as Python objects
+        """
+        return self.get_values()[np.asarray(codes, dtype=np.int64)]
+
+    def get_values(self):
+        """Return all the values of the dictionary, ordered by code
+
+        Returns
+        -------
+        values : numpy array of strings
+            The values, as Python objects
+        """
+        if self._values is None or len(self._values) != len(self._codes):
+            self._values = np.array(list(self._codes), dtype=object)
+        return self._values
+
+    def __getstate__(self):
+        return {"codes":self._codes}
+
+    def __setstate__(self, state):
+        self._codes = state["codes"]
+        self._values = None
@@ -53,22 +53,25 @@ class ItemPickrate(ItemStats):
     def get_id_fields_required(self):
         return ["summonerId"] if self._by_league else []
     
-    def get_stats(self, df):
+    def get_partial_stats(self, df):
         groupby = list(self.get_keys())
         
         picks = (
-            df.drop_duplicates(subset=["participantId","gameId","itemId"]).groupby(groupby)
+            df.drop_duplicates(subset=["participantId","gameId","itemId"]).groupby(groupby, observed=True)
                 .count()
                 ["gameId"]
         )
         
         opportunities = (
-            df.drop_duplicates(subset=["participantId","gameId"]).groupby(groupby[:-1])
+            df.drop_duplicates(subset=["participantId","gameId"]).groupby(groupby[:-1], observed=True)
                 .count()
                 ["gameId"]
         ) if self._by_league or self._by_champion else len(df["gameId"].unique()) * 10
         
-        return picks/opportunities
+        return {"picks":picks, "opportunities":opportunities}
+    
+    def get_stats_from_partial(self, partial):
+        return partial["picks"]/partial["opportunities"]
     
     
 class ItemWinrate(ItemStats):
@@ -123,21 +126,24 @@ class ItemWinrate(ItemStats):
     def get_id_fields_required(self):
         return ["summonerId"] if self._by_league else []
     
-    def get_stats(self, df):
+    def get_partial_stats(self, df):
         groupby = list(self.get_keys())
         
         picks = (
-            df.drop_duplicates(subset=["participantId","gameId","itemId"]).groupby(groupby)
+            df.drop_duplicates(subset=["participantId","gameId","itemId"]).groupby(groupby, observed=True)
                 .count()
                 ["gameId"]
         )
         
         wins = (
             df.drop_duplicates(subset=["participantId","gameId","itemId"]).query('win == True')
-                .groupby(groupby)
+                .groupby(groupby, observed=True)
                 .count()
                 ["gameId"]
         )
 
-        return (wins/picks).fillna(0)
+        return {"picks":picks, "wins":wins}
+    
+    def get_stats_from_partial(self, partial):
+        return (partial["wins"]/partial["picks"]).fillna(0)
     
\ No newline at end of file
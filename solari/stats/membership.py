@@ -0,0 +1,98 @@
+import numpy as np
+import pandas as pd
+
+class LeagueMembership:
+    """Index of the leagues present in each game
+
+    Each game holds a bitmask, one bit per league of its players, so rows can be selected by league without being duplicated.
+    Players without a league are not considered.
+
+    Parameters
+    ----------
+    game_ids : numpy array
+        The gameId of each participant
+
+    leagues : numpy array or Pandas Categorical
+        The league of each participant
+    """
+
+    def __init__(self, game_ids, leagues):
+        codes, self._leagues = pd.factorize(leagues, sort=True)
+        self._games, inverse = np.unique(game_ids, return_inverse=True)
+
+        words = max((len(self._leagues) + 63) // 64, 1)
+        self._masks = np.zeros((len(self._games), words), dtype=np.uint64)
+
+        ranked = codes >= 0
+        codes = codes[ranked].astype(np.int64)
+        np.bitwise_or.at(self._masks, (inverse[ranked], codes // 64), np.left_shift(np.uint64(1), (codes % 64).astype(np.uint64)))
+
+    def __len__(self):
+        return len(self._leagues)
+
+    def get_leagues(self):
+        """Return the leagues found in the games, ordered by code
+
+        Returns
+        -------
+        leagues : Pandas Index or Categorical
+            The distinct leagues
+        """
+        return self._leagues
+
+    def take(self, codes):
+        """Return the leagues matching codes, with the same type as the leagues given
+
+        Parameters
+        ----------
+        codes : numpy array of int
+            Codes of the leagues
+
+        Returns
+        -------
+        leagues : Pandas Index or Categorical
+            League of each code
+        """
+        return self._leagues.take(np.asarray(codes, dtype=np.int64))
+
+    def get_game_index(self, game_ids):
+        """Return the position of each game in the index, -1 for the unknown ones
+
+        Parameters
+        ----------
+        game_ids : numpy array
+            The gameId of each row
+
+        Returns
+        -------
+        index : numpy array of int
+            Position of the game of each row
+        """
+        if len(self._games) == 0:
+            return np.full(len(game_ids), -1, dtype=np.int64)
+
+        index = np.minimum(np.searchsorted(self._games, game_ids), len(self._games) - 1)
+        index[self._games[index] != game_ids] = -1
+        return index
+
+    def contains(self, game_index, code):
+        """Return which rows belong to a game where the league is present
+
+        Parameters
+        ----------
+        game_index : numpy array of int
+            Position of the game of each row, as given by get_game_index
+
+        code : int
+            Code of the league
+
+        Returns
+        -------
+        mask : numpy array of bool
+            True for the rows whose game has a player in the league
+        """
+        known = game_index >= 0
+        bits = self._masks[game_index[known], code // 64] >> np.uint64(code % 64)
+        mask = np.zeros(len(game_index), dtype=bool)
+        mask[known] = (bits & np.uint64(1)).astype(bool)
+        return mask
@@ -0,0 +1,135 @@
+import pandas as pd
+
+def add_partials(p1, p2):
+    """Combine the partial aggregates of two disjoint subsets of games
+    
+    Parameters
+    ----------
+    p1, p2 : dict of Pandas Series, numbers or dicts
+        Partial aggregates, possibly nested, p1 can be None
+        
+    Returns
+    -------
+    partial : dict of Pandas Series or numbers
+        Partial aggregates of both subsets
+    """
+    if p1 is None:
+        return p2
+    
+    return {k:_add(p1[k], p2[k]) for k in p1}
+
+def sum_partials(partials):
+    """Combine the partial aggregates of many disjoint subsets of games
+    
+    Partial aggregates are added by pairs, in a balanced tree, so each key is only combined a logarithmic number of times.
+    
+    Parameters
+    ----------
+    partials : list of dict
+        Partial aggregates of each subset, possibly None
+        
+    Returns
+    -------
+    partial : dict or None
+        Partial aggregates of all the subsets
+    """
+    partials = [p for p in partials if p is not None]
+    if len(partials) == 0:
+        return None
+    
+    while len(partials) > 1:
+        partials = [add_partials(partials[i], partials[i + 1]) if i + 1 < len(partials) else partials[i] for i in range(0, len(partials), 2)]
+    return partials[0]
+
+def _add(a, b):
+    if isinstance(a, dict):
+        return add_partials(a, b)
+    if isinstance(a, pd.Series):
+        if len(a) == 0:
+            return b
+        if len(b) == 0:
+            return a
+        # Concatenating then grouping keeps the integer dtypes, unlike aligning
+        return pd.concat([a, b]).groupby(level=list(range(a.index.nlevels)), observed=True).sum()
+    
+    return a + b
+
+def subtract_partials(p1, p2):
+    """Remove the partial aggregates of a subset of games from the ones of a larger set
+    
+    Keys whose counts fall to zero are dropped, as if the subset had never been added.
+    Floating sums are kept for the keys still counted, as rounding errors prevent them from falling exactly to zero.
+    
+    Parameters
+    ----------
+    p1 : dict of Pandas Series, numbers or dicts
+        Partial aggregates of the larger set
+        
+    p2 : dict of Pandas Series, numbers or dicts
+        Partial aggregates of the subset
+        
+    Returns
+    -------
+    partial : dict of Pandas Series, numbers or dicts
+        Partial aggregates of the remaining games
+    """
+    partial = {k:_subtract(p1[k], p2[k]) for k in p1}
+    
+    counts = [v for v in partial.values() if isinstance(v, pd.Series) and v.dtype.kind in "iu"]
+    for k, v in partial.items():
+        if isinstance(v, pd.Series) and v.dtype.kind == "f":
+            counted = [c.index for c in counts if c.index.names == v.index.names]
+            if len(counted) > 0:
+                partial[k] = v[v.index.isin(counted[0].append(counted[1:]))]
+            else:
+                partial[k] = v[v != 0]
+    
+    return partial
+
+def _subtract(a, b):
+    if isinstance(a, dict):
+        return subtract_partials(a, b)
+    if isinstance(a, pd.Series):
+        if len(b) == 0:
+            return a
+        # Aligning would turn categorical levels into objects, which can't be concatenated with categorical ones
+        result = pd.concat([a, -b]).groupby(level=list(range(a.index.nlevels)), observed=True).sum().astype(a.dtype)
+        if result.dtype.kind in "iu":
+            result = result[result != 0]
+        return result
+    
+    return a - b
+
+def remap_partials(partial, remap):
+    """Translate the codes found in the index of partial aggregates
+    
+    Parameters
+    ----------
+    partial : dict of Pandas Series, numbers or dicts
+        Partial aggregates, possibly nested
+        
+    remap : dict
+        Dict matching index levels holding codes to the array translating them
+        
+    Returns
+    -------
+    partial : dict of Pandas Series, numbers or dicts
+        Partial aggregates indexed by the translated codes
+    """
+    return {k:_remap(v, remap) for k, v in partial.items()}
+
+def _remap(a, remap):
+    if isinstance(a, dict):
+        return remap_partials(a, remap)
+    if not isinstance(a, pd.Series):
+        return a
+    
+    a = a.copy()
+    for level, name in enumerate(a.index.names):
+        if name not in remap:
+            continue
+        if isinstance(a.index, pd.MultiIndex):
+            a.index = a.index.set_levels(remap[name][a.index.levels[level]], level=level, verify_integrity=False)
+        else:
+            a.index = pd.Index(remap[name][a.index.values], name=name)
+    return a
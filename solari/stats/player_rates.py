@@ -1,5 +1,6 @@
 from .stats_types import PlayerStats #, SpecialStats, DerivedStats
 from .stats_managers import ChampionStatsManager
+from .aggregations import Count
 
 class PlayerPickrate(PlayerStats):
     """Stats for champion pickrate per player
@@ -43,22 +44,15 @@ class PlayerPickrate(PlayerStats):
     def get_id_fields_required(self):
         return ["accountId"] if self._by_accountId else ["summonerId"]
     
-    def get_stats(self, df):
-        groupby = list(self.get_keys())
+    def get_aggregations(self):
+        picks = Count(self.get_keys())
         
-        picks = (
-            df.groupby(groupby)
-                .count()
-                ["gameId"]
-        )
+        opportunities = Count(self.get_keys()[:-1])
         
-        opportunities = (
-            df.groupby(groupby[:-1])
-                .count()
-                ["gameId"]
-        )
-        
-        return picks/opportunities
+        return {"picks":picks, "opportunities":opportunities}
+    
+    def get_stats_from_partial(self, partial):
+        return partial["picks"]/partial["opportunities"]
 
 class PlayerPickCount(PlayerStats):
     """Stats for champion picks number per player
@@ -102,16 +96,11 @@ class PlayerPickCount(PlayerStats):
     def get_id_fields_required(self):
         return ["accountId"] if self._by_accountId else ["summonerId"]
     
-    def get_stats(self, df):
-        groupby = list(self.get_keys())
-        
-        picks = (
-            df.groupby(groupby)
-                .count()
-                ["gameId"]
-        )
-        
-        return picks
+    def get_aggregations(self):
+        return {"picks":Count(self.get_keys())}
+    
+    def get_stats_from_partial(self, partial):
+        return partial["picks"]
 
 class PlayerWinrate(PlayerStats):
     """Stats for winrate per player
@@ -164,22 +153,15 @@ class PlayerWinrate(PlayerStats):
     def get_id_fields_required(self):
         return ["accountId"] if self._by_accountId else ["summonerId"]
     
-    def get_stats(self, df):
-        groupby = list(self.get_keys())
-        
-        picks = (
-            df.groupby(groupby)
-                .count()
-                ["gameId"]
-        )
+    def get_aggregations(self):
+        picks = Count(self.get_keys())
         
-        wins = (
-            df[df["win"] == True].groupby(groupby)
-                .count()
-                ["gameId"]
-        )
+        wins = Count(self.get_keys(), where=("win", True))
 
-        return (wins/picks).fillna(0)
+        return {"picks":picks, "wins":wins}
+    
+    def get_stats_from_partial(self, partial):
+        return (partial["wins"]/partial["picks"]).fillna(0)
 
 
 class PlayerWins(PlayerStats):
@@ -232,16 +214,11 @@ class PlayerWins(PlayerStats):
     def get_id_fields_required(self):
         return ["accountId"] if self._by_accountId else ["summonerId"]
     
-    def get_stats(self, df):
-        groupby = list(self.get_keys())
-        
-        wins = (
-            df[df["win"] == True].groupby(groupby)
-                .count()
-                ["gameId"]
-        )
-        
-        return wins
+    def get_aggregations(self):
+        return {"wins":Count(self.get_keys(), where=("win", True))}
+    
+    def get_stats_from_partial(self, partial):
+        return partial["wins"]
 
 class PlayerLosses(PlayerStats):
     """Stats for players number of losses
@@ -293,13 +270,8 @@ class PlayerLosses(PlayerStats):
     def get_id_fields_required(self):
         return ["accountId"] if self._by_accountId else ["summonerId"]
     
-    def get_stats(self, df):
-        groupby = list(self.get_keys())
-        
-        losses = (
-            df[df["win"] == False].groupby(groupby)
-                .count()
-                ["gameId"]
-        )
-        
-        return losses
\ No newline at end of file
+    def get_aggregations(self):
+        return {"losses":Count(self.get_keys(), where=("win", False))}
+    
+    def get_stats_from_partial(self, partial):
+        return partial["losses"]
\ No newline at end of file
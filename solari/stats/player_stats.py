@@ -1,4 +1,4 @@
-from .stats_types import PlayerStats #, SpecialStats, DerivedStats
+from .stats_types import PlayerStats, team_total #, SpecialStats, DerivedStats
 from .stats_managers import ChampionStatsManager
     
 class PlayerGeneric(PlayerStats):
@@ -21,6 +21,7 @@ class PlayerGeneric(PlayerStats):
     """
     
     name = "Generic"
+    incremental = True
     
     def __init__(self, field, name=None, by_accountId=False, by_champion = False):
         if name is None:
@@ -60,9 +61,13 @@ class PlayerGeneric(PlayerStats):
     def get_id_fields_required(self):
         return ["accountId"] if self._by_accountId else ["summonerId"]
     
-    def get_stats(self, df):
+    def get_partial_stats(self, df):
         groupby = list(self.get_keys())
-        return df.groupby(groupby).mean()[self._field]
+        grouped = df.groupby(groupby)[self._field]
+        return {"sum":grouped.sum(), "count":grouped.count()}
+    
+    def get_stats_from_partial(self, partial):
+        return partial["sum"] / partial["count"]
 
     
 class PlayerGenericPerMin(PlayerStats):
@@ -85,6 +90,7 @@ class PlayerGenericPerMin(PlayerStats):
     """
     
     name = "GenericPerMin"
+    incremental = True
     
     def __init__(self, field, name=None, by_accountId=False, by_champion = False):
         if name is None:
@@ -124,10 +130,16 @@ class PlayerGenericPerMin(PlayerStats):
     def get_id_fields_required(self):
         return ["accountId"] if self._by_accountId else ["summonerId"]
     
-    def get_stats(self, df):
+    def get_derived_columns(self):
+        return {self._field + "PerMin":lambda df: df[self._field] * 60 / df["gameDuration"]}
+    
+    def get_partial_stats(self, df):
         groupby = list(self.get_keys())
-        df[self._field + "PerMin"] = df[self._field] * 60 / df["gameDuration"]
-        return df.groupby(groupby).mean()[self._field + "PerMin"]
+        grouped = df.groupby(groupby)[self._field + "PerMin"]
+        return {"sum":grouped.sum(), "count":grouped.count()}
+    
+    def get_stats_from_partial(self, partial):
+        return partial["sum"] / partial["count"]
     
 
 class PlayerKDA(PlayerStats):
@@ -147,6 +159,7 @@ class PlayerKDA(PlayerStats):
     """
     
     name = "KDA"
+    incremental = True
     
     def __init__(self, by_accountId=False, by_champion=False):
         self._by_accountId = by_accountId
@@ -182,12 +195,17 @@ class PlayerKDA(PlayerStats):
     def get_id_fields_required(self):
         return ["accountId"] if self._by_accountId else ["summonerId"]
     
-    def get_stats(self, df):
+    def get_derived_columns(self):
+        return {"KDA":lambda df: (df["kills"] + df["assists"]) / (df["deaths"].replace(0,1))}
+    
+    def get_partial_stats(self, df):
         groupby = list(self.get_keys())
         
-        df["KDA"] = (df["kills"] + df["assists"]) / (df["deaths"].replace(0,1))
-        
-        return df.groupby(groupby).mean()["KDA"]
+        grouped = df.groupby(groupby)["KDA"]
+        return {"sum":grouped.sum(), "count":grouped.count()}
+    
+    def get_stats_from_partial(self, partial):
+        return partial["sum"] / partial["count"]
     
     
 class PlayerKillParticipation(PlayerStats):
@@ -205,6 +223,7 @@ class PlayerKillParticipation(PlayerStats):
     """
     
     name = "KP"
+    incremental = True
     
     def __init__(self, by_accountId=False, by_champion=False):
         self._by_accountId = by_accountId
@@ -237,11 +256,93 @@ class PlayerKillParticipation(PlayerStats):
     def get_id_fields_required(self):
         return ["accountId"] if self._by_accountId else ["summonerId"]
     
-    def get_stats(self, df):
+    def get_team_fields_required(self):
+        return ["kills"]
+    
+    def get_derived_columns(self):
+        return {"kp":lambda df: (df["kills"] + df["assists"]) / df[team_total("kills")]}
+    
+    def get_partial_stats(self, df):
         groupby = list(self.get_keys())
         
-        kp = df.groupby(["gameId","teamId"]).sum()["kills"]
+        grouped = df.groupby(groupby)["kp"]
+        return {"sum":grouped.sum(), "count":grouped.count()}
+    
+    def get_stats_from_partial(self, partial):
+        return partial["sum"] / partial["count"]
+
+
+class PlayerTeamShare(PlayerStats):
+    """Stats for the mean share of the team total of any single stats field under participants->stats, per player
+    
+    For instance the damage share or the gold share. Allow for share by champion
+    
+    Parameters
+    ----------
+    field : string
+        The stats field that should be considered
+        
+    name : string, optional
+        Rename the stats, default is the name of the field followed by "Share"
         
-        df["kp"] = (df["kills"] + df["assists"]) / [kp.loc[(i["gameId"],i["teamId"])] for k,i in df.iterrows()]
+    by_accountId : boolean
+        Default at False, determine if the key should be accountId instead of summonerId
         
-        return df.groupby(groupby).mean()["kp"]
\ No newline at end of file
+    by_champion : boolean
+        Default at False, determine if the stats is made by champion
+    """
+    
+    name = "TeamShare"
+    incremental = True
+    
+    def __init__(self, field, name=None, by_accountId=False, by_champion=False):
+        if name is None:
+            self.name = field + "Share"
+        else:
+            self.name = name
+        
+        self._field = field
+        
+        self._by_accountId = by_accountId
+        self._by_champion = by_champion
+    
+    def get_keys(self):
+        
+        if self._by_accountId:
+            key = ("accountId",)
+        else:
+            key = ("summonerId",)
+            
+        if self._by_champion:
+            key += ("championId",)
+            
+        return key
+    
+    def get_manager(self):
+        return ChampionStatsManager
+    
+    def get_game_fields_required(self):
+        return ["gameId"]
+    
+    def get_participant_fields_required(self):
+        return ["championId", "teamId"]
+    
+    def get_stats_fields_required(self):
+        return [self._field]
+    
+    def get_id_fields_required(self):
+        return ["accountId"] if self._by_accountId else ["summonerId"]
+    
+    def get_team_fields_required(self):
+        return [self._field]
+    
+    def get_derived_columns(self):
+        return {self._field + "Share":lambda df: df[self._field] / df[team_total(self._field)]}
+    
+    def get_partial_stats(self, df):
+        groupby = list(self.get_keys())
+        grouped = df.groupby(groupby)[self._field + "Share"]
+        return {"sum":grouped.sum(), "count":grouped.count()}
+    
+    def get_stats_from_partial(self, partial):
+        return partial["sum"] / partial["count"]
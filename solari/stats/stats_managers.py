@@ -1,10 +1,25 @@
+import numpy as np
 import pandas as pd
-from functools import lru_cache
-from .stats_types import SpecialStats, DerivedStats, ChampionBanStats
-from ..exceptions import MissingRequiredStats
+from concurrent.futures import ThreadPoolExecutor
+from .buffers import ColumnBuffer, SpillStore, read_only
+from .extraction import FieldExtractor, ITEM_FIELDS
+from .interner import INTERNED_FIELDS
+from .membership import LeagueMembership
+from .partials import add_partials, subtract_partials, remap_partials, sum_partials
+from .stats_types import SpecialStats, DerivedStats, ChampionBanStats, team_total, add_derived_columns
+from ..exceptions import MissingRequiredStats, RedundantAggregatedGames
 
-class StatsManager: # pragma: no cover
+# Number of rows held before they are folded into the aggregates, when rows are not kept
+FOLD_ROWS = 100000
+
+class StatsManager:
     """Abstract class defining the basis of Stats Managers
+    
+    Rows are held in ColumnBuffers. Once spilling is enabled, the buffers are written on disk by chunks when they exceed the threshold,
+    and the stats are computed chunk by chunk by combining partial aggregates.
+    
+    If all the stats are incremental and don't depend on ranks, the rows can also be released once folded into the aggregates,
+    so the memory only depends on the number of keys.
         
     Parameters
     ----------
@@ -15,9 +30,85 @@ class StatsManager: # pragma: no cover
         Manager for players rank
     """
     
-    def __init__(self, stats, rank_manager):
+    def __init__(self, stats, rank_manager): # pragma: no cover
         pass
     
+    def _init_state(self, stats, rank_manager):
+        """Gather the fields required by the stats, and create the buffers and the state shared by all managers
+        
+        Parameters
+        ----------
+        stats : list of Stats
+            List of all instantiated Stats to be computed
+            
+        rank_manager : RankManager
+            Manager for players rank
+            
+        Raises
+        ------
+        MissingRequiredStats
+            If a required stats from Derived Stats are missing
+        """
+        self._rank_manager = rank_manager
+        
+        game_fields = []
+        participant_fields = []
+        stats_fields = []
+        id_fields = []
+        team_fields = []
+        
+        for s in stats:
+            game_fields += s.get_game_fields_required()
+            participant_fields += s.get_participant_fields_required()
+            stats_fields += s.get_stats_fields_required()
+            id_fields += s.get_id_fields_required()
+            team_fields += s.get_team_fields_required()
+            
+        # Team totals are computed from the participants of each team
+        if len(team_fields) > 0:
+            game_fields += ["gameId"]
+            participant_fields += ["teamId"]
+            stats_fields += team_fields
+            
+        self._game_fields = list(set(game_fields))
+        self._participant_fields = list(set(participant_fields))
+        self._stats_fields = list(set(stats_fields))
+        self._id_fields = list(set(id_fields))
+        self._team_fields = list(set(team_fields))
+        
+        self._create_buffers()
+        self._spill = None
+        
+        # Partial aggregates of the incremental stats, over the rows already folded
+        self._running_partials = None
+        self._folded_rows = {}
+        self._folded_version = None
+        self._keep_rows = True
+        self._rows_released = False
+        
+        # Incremented each time rows are added, to invalidate the cached stats
+        self._version = 0
+        self._cached_stats = None
+        
+        self._time_field = None
+        self._window_cutoff = None
+        
+        self._stats = [s for s in stats if not issubclass(s.__class__, SpecialStats) and not issubclass(s.__class__, DerivedStats)]
+        self._derived_stats = sorted([s for s in stats if not issubclass(s.__class__, SpecialStats) and issubclass(s.__class__, DerivedStats)], key=lambda s: s.priority)
+        self._special_stats = [s for s in stats if issubclass(s.__class__, SpecialStats)]
+        
+        self._ban_stats = any([issubclass(s.__class__, ChampionBanStats) for s in stats])
+        
+        for s in self._special_stats:
+            s.set_rank_manager(self._rank_manager)
+        
+        # Listing all required stats for derived stats
+        derived_required = list(set([i for j in self._derived_stats for i in j.get_stats_required()]))
+        if not all([any([isinstance(s, d) for s in stats]) for d in derived_required]):
+            raise MissingRequiredStats
+        
+        self._extractor = FieldExtractor([self], self._rank_manager.get_interner())
+    
     def push_game(self, match_data):
         """Process the match_data according to the needs of the Stats
         
@@ -26,18 +117,227 @@ class StatsManager: # pragma: no cover
         match_data : dict
             Raw data from Riot API match-v4 endpoint
 
+        """
+        self.push_games([match_data])
+    
+    def push_games(self, matches):
+        """Process a batch of match_data according to the needs of the Stats
+        
+        Parameters
+        ----------
+        matches : list of dict
+            Raw data from Riot API match-v4 endpoint
+
+        """
+        self.push_extracted(self._extractor.extract(matches))
+    
+    def push_extracted(self, extraction): # pragma: no cover
+        """Process the fields extracted from a batch of match_data
+        
+        Parameters
+        ----------
+        extraction : Extraction
+            Fields extracted from the match data, including at least the ones required by this manager
+
         """
         pass
     
+    def enable_spill(self, threshold, directory=None):
+        """Write the rows on disk by chunks once they exceed the threshold
+        
+        Parameters
+        ----------
+        threshold : int
+            Size in bytes of the rows held in memory above which they are written on disk
+            
+        directory : string, optional
+            Directory where the chunks are written, a temporary directory if not given
+        """
+        self._spill = SpillStore(threshold, directory)
+        self._spill_if_needed()
+        
+    def set_window(self, time_field):
+        """Store the time of each row, so rows can be evicted once out of a time window
+        
+        Must be called before any game is pushed.
+        
+        Parameters
+        ----------
+        time_field : string
+            Game level field holding the time of the game
+        """
+        if time_field not in self._game_fields:
+            self._game_fields.append(time_field)
+            self._create_buffers()
+            self._extractor = FieldExtractor([self], self._rank_manager.get_interner())
+        
+        self._time_field = time_field
+        
+    def evict(self, cutoff, force=False):
+        """Remove the games older than the cutoff, from the rows and the running aggregates
+        
+        Removing rows requires copying the remaining ones, so unless forced,
+        games are only evicted once they represent a significant part of the rows.
+        
+        Parameters
+        ----------
+        cutoff : number
+            Games whose time is strictly lower are removed
+            
+        force : bool
+            Default at False, if True all the games older than the cutoff are removed now
+        """
+        self._window_cutoff = cutoff
+        
+        buffers = self._get_buffers()
+        main = next(iter(buffers.values()))
+        expired = main.get_column(self._time_field) < cutoff
+        n = np.count_nonzero(expired)
+        
+        if n == 0 or (not force and n * 8 < len(main)):
+            return
+        
+        game_ids = np.unique(main.get_column("gameId")[expired])
+        masks = {name:np.isin(b.get_column("gameId"), game_ids) for name, b in buffers.items()}
+        
+        # The aggregates of the evicted rows already folded are subtracted
+        if self._running_partials is not None:
+            version = self._rank_manager.get_version() if self._depends_on_ranks() else None
+            if version != self._folded_version:
+                self._running_partials = None
+            else:
+                evicted = {}
+                for name, b in buffers.items():
+                    evicted[name] = ColumnBuffer(b.get_fields())
+                    evicted[name].extend_buffer(b.slice(0, self._folded_rows[name]), masks[name][:self._folded_rows[name]])
+                if any([len(b) > 0 for b in evicted.values()]):
+                    partial = self._get_partial_stats(self._get_frames(evicted), self._get_incremental_stats())
+                    self._running_partials = subtract_partials(self._running_partials, partial)
+        
+        for name, b in buffers.items():
+            if name in self._folded_rows:
+                self._folded_rows[name] -= np.count_nonzero(masks[name][:self._folded_rows[name]])
+            b.filter(~masks[name])
+        
+        self._version += 1
+        
+    def set_keep_rows(self, keep_rows):
+        """Determine if the rows are kept once folded into the aggregates
+        
+        Rows are always kept if some stats are not incremental or depend on ranks.
+        Without the rows, games redundant with another instance can't be removed when merging it.
+        
+        Parameters
+        ----------
+        keep_rows : bool
+            False to release the rows once folded
+        """
+        self._keep_rows = keep_rows
+        self._release_rows_if_needed()
+    
+    def get_fields_required(self):
+        """Return the fields to extract from the match data
+        
+        Returns
+        -------
+        fields : dict
+            Dict matching each level ("game", "participant", "stats", "id", "ban") to the list of required fields
+        """
+        return {
+            "game":self._game_fields,
+            "participant":self._participant_fields,
+            "stats":self._stats_fields,
+            "id":self._id_fields,
+            "ban":self._champion_bans.get_fields() if self._ban_stats else []
+        }
+    
     def get_stats(self):
         """Return the computed stats
+        
+        The stats are cached, and only computed again once rows are added or ranks change.
             
         Returns
         -------
         stats : Pandas DataFrame
             Value of the computed stats grouped by the key
         """
-        pass
+        if self._window_cutoff is not None:
+            self.evict(self._window_cutoff, force=True)
+        
+        version = self._get_version()
+        if self._cached_stats is None or self._cached_stats[0] != version:
+            self._cached_stats = (version, self._get_stats())
+        
+        return self._cached_stats[1].copy()
+    
+    def _get_version(self):
+        """Return the version of the inputs of the stats
+        
+        Returns
+        -------
+        version : tuple
+            Version of the rows, and of the ranks if the stats depend on them
+        """
+        if self._depends_on_ranks() or len(self._special_stats) > 0:
+            return (self._version, self._rank_manager.get_version())
+        return (self._version, None)
+    
+    def get_partials(self):
+        """Return the partial aggregates of the stats over all the rows
+        
+        Partial aggregates of managers holding disjoint sets of games can be added, then given to get_stats_from_partials.
+        
+        Returns
+        -------
+        partials : dict or None
+            Dict matching the name of each stats to its partial aggregates, None if a stats can't be computed by parts
+        """
+        if self._window_cutoff is not None:
+            self.evict(self._window_cutoff, force=True)
+        
+        incremental = self._get_incremental_stats()
+        others = [s for s in self._stats + self._derived_stats if not s.incremental]
+        
+        partials = {}
+        if len(incremental) > 0:
+            partials.update(self._fold_pending(incremental))
+            self._release_rows_if_needed()
+        
+        if len(others) > 0:
+            scanned = None
+            for buffers in self._iter_buffers():
+                partial = self._get_partial_stats(self._get_frames(buffers), others)
+                if partial is None:
+                    return None
+                scanned = add_partials(scanned, partial)
+            partials.update(scanned)
+        
+        return partials
+    
+    def get_stats_from_partials(self, partials):
+        """Compute the stats from partial aggregates combined over all the games
+        
+        Parameters
+        ----------
+        partials : dict
+            Dict matching the name of each stats to its partial aggregates
+            
+        Returns
+        -------
+        stats : Pandas DataFrame
+            Value of the computed stats grouped by the key
+        """
+        return self._get_stats_from_partials(partials)
+    
+    def _get_stats(self):
+        """Compute the stats"""
+        partials = self.get_partials()
+        
+        if partials is None:
+            # Some stats can't be computed by parts, all the rows are loaded at once
+            return self._compute_stats(self._get_frames(self._concat_buffers()))
+        
+        return self._get_stats_from_partials(partials)
     
     def merge(self, sm2, redundant_games=[]):
         """Merge the data from the given StatsManager instance
@@ -52,8 +352,406 @@ class StatsManager: # pragma: no cover
             The list of redundant games between the two instances that should be omitted
             
         """
+        self.merge_all([sm2], [redundant_games], [self._rank_manager.get_remap(sm2._rank_manager)])
+        
+    def merge_all(self, managers, redundant_games, remaps, workers=None):
+        """Merge the data from many StatsManager instances at once
+        
+        The current instance becomes the merge results.
+        Unless rows are written on disk, each column is reallocated only once, to the size of all the rows.
+        
+        Parameters
+        ----------
+        managers : list of StatsManager
+            Other StatsManager instances to merge with
+            
+        redundant_games : list of arrays of gameId
+            For each instance, the games already in this instance or a previous one, that should be omitted
+            
+        remaps : list of dict or None
+            For each instance, the translation of its identity codes into the ones of this instance, as given by RankManager.get_remap
+            
+        workers : int, optional
+            Number of threads computing the aggregates of the instances, when only the aggregates are merged
+        """
+        for sm2, redundant in zip(managers, redundant_games):
+            self._check_merge(sm2, redundant)
+        
+        self._version += 1
+        
+        if self._can_release_rows():
+            # The rows are not needed, only the aggregates of the other instances are added
+            def get_partials(i):
+                partials2 = managers[i]._get_merge_partials(redundant_games[i])
+                return partials2 if remaps[i] is None else remap_partials(partials2, remaps[i])
+            
+            if workers is None or workers <= 1:
+                partials = [get_partials(i) for i in range(len(managers))]
+            else:
+                with ThreadPoolExecutor(max_workers=workers) as executor:
+                    partials = list(executor.map(get_partials, range(len(managers))))
+            
+            self._running_partials = sum_partials([self._fold_pending(self._get_incremental_stats())] + partials)
+            self._rows_released = True
+            return
+        
+        pieces = []
+        for sm2, redundant, remap in zip(managers, redundant_games, remaps):
+            if sm2._rows_released:
+                # Only the aggregates of the folded rows are left, they are added to the ones of this instance
+                partials = self._fold_pending(self._get_incremental_stats())
+                partials2 = sm2._running_partials if remap is None else remap_partials(sm2._running_partials, remap)
+                self._running_partials = add_partials(partials, partials2)
+                self._rows_released = True
+                
+                pieces.append(({name:b.slice(sm2._folded_rows.get(name, 0)) for name, b in sm2._get_buffers().items()}, redundant, remap))
+            else:
+                pieces += [(b2, redundant, remap) for b2 in sm2._iter_buffers()]
+        
+        buffers = self._get_buffers()
+        
+        if self._spill is not None:
+            # Rows are added chunk by chunk, so they are written on disk as they come
+            for b2, redundant, remap in pieces:
+                self._extend_buffers(buffers, b2, redundant, remap)
+                self._on_rows_added()
+            return
+        
+        # Rows of each game being consecutive, the redundant ones are dropped by range
+        ranges = [
+            {name:b2[name].get_kept_ranges("gameId", redundant) if len(redundant) > 0 else None for name in buffers}
+            for b2, redundant, remap in pieces
+        ]
+        for name, b in buffers.items():
+            b.reserve(len(b) + sum([len(b2[name]) if r[name] is None else int(np.sum(r[name][1] - r[name][0])) for (b2, _, _), r in zip(pieces, ranges)]))
+        
+        for (b2, redundant, remap), r in zip(pieces, ranges):
+            for name, b in buffers.items():
+                if r[name] is None:
+                    b.extend_buffer(b2[name], remap=remap)
+                else:
+                    b.extend_ranges(b2[name], *r[name], remap)
+        
+        self._on_rows_added()
+        
+    def _extend_buffers(self, buffers, buffers2, redundant_games, remap):
+        """Append the rows of the buffers of another instance, omitting the redundant games
+        
+        Parameters
+        ----------
+        buffers : dict
+            Dict matching a name to each ColumnBuffer of this instance
+            
+        buffers2 : dict
+            Dict matching a name to each ColumnBuffer of the other instance
+            
+        redundant_games: list of gameId
+            The list of redundant games that should be omitted
+            
+        remap : dict or None
+            Translation of the identity codes of the other instance
+        """
+        for name, b in buffers.items():
+            if len(redundant_games) == 0:
+                b.extend_buffer(buffers2[name], remap=remap)
+            else:
+                # Rows of each game being consecutive, the redundant ones are dropped by range
+                b.extend_ranges(buffers2[name], *buffers2[name].get_kept_ranges("gameId", redundant_games), remap)
+            
+    def _get_merge_partials(self, redundant_games):
+        """Return the partial aggregates of the incremental stats over the games not redundant
+        
+        Only the rows of the redundant games are read, to subtract their aggregates.
+        
+        Parameters
+        ----------
+        redundant_games: list of gameId
+            The list of redundant games that should be omitted
+            
+        Returns
+        -------
+        partials : dict
+            Dict matching the name of each stats to its partial aggregates
+        """
+        stats = self._get_incremental_stats()
+        partials = self._fold_pending(stats)
+        
+        if len(redundant_games) > 0:
+            for buffers in self._iter_buffers():
+                redundant = {}
+                for name, b in buffers.items():
+                    redundant[name] = ColumnBuffer(b.get_fields())
+                    redundant[name].extend_buffer(b, np.isin(b.get_column("gameId"), redundant_games))
+                if any([len(b) > 0 for b in redundant.values()]):
+                    partials = subtract_partials(partials, self._get_partial_stats(self._get_frames(redundant), stats))
+        
+        return partials
+    
+    def _check_merge(self, sm2, redundant_games):
+        """Check the given StatsManager instance can be merged
+        
+        Parameters
+        ----------
+        sm2 : StatsManager
+            Another StatsManager instance to merge with
+        redundant_games: list of gameId
+            The list of redundant games between the two instances that should be omitted
+            
+        Raises
+        ------
+        RedundantAggregatedGames
+            If there are redundant games while the other instance only kept aggregates
+        """
+        if sm2._rows_released and len(redundant_games) > 0:
+            raise RedundantAggregatedGames()
+    
+    def _get_buffers(self): # pragma: no cover
+        """Return the buffers holding the rows in memory
+        
+        Returns
+        -------
+        buffers : dict
+            Dict matching a name to each ColumnBuffer
+        """
+        pass
+    
+    def _get_frames(self, buffers): # pragma: no cover
+        """Return the DataFrames given to the stats, built from the buffers
+        
+        Parameters
+        ----------
+        buffers : dict
+            Dict matching a name to each ColumnBuffer
+            
+        Returns
+        -------
+        frames : tuple
+            The DataFrame of the rows, and the DataFrame of the bans or None
+        """
         pass
     
+    def _get_stats_input(self, s, frames):
+        """Return the DataFrames a stats is computed from"""
+        return frames if issubclass(s.__class__, ChampionBanStats) else frames[0]
+    
+    def _compute_stats(self, frames):
+        """Compute the stats from all the rows at once
+        
+        Parameters
+        ----------
+        frames : tuple
+            The DataFrame of the rows, and the DataFrame of the bans or None
+            
+        Returns
+        -------
+        stats : Pandas DataFrame
+            Value of the computed stats grouped by the key
+        """
+        frames = add_derived_columns(frames, self._stats + self._derived_stats)
+        
+        stats = {s.name:s.get_stats(self._get_stats_input(s, frames)) for s in self._stats}
+        
+        stats.update({s.name:s.get_stats() for s in self._special_stats})
+        
+        for s in self._derived_stats:
+            stats.update({s.name:s.get_stats(self._get_stats_input(s, frames), stats)})
+        
+        return self._decode_index(pd.DataFrame(stats).fillna(0, downcast="infer"))
+    
+    def _get_partial_stats(self, frames, stats):
+        """Compute the partial aggregates of each stats for a subset of the games
+        
+        Parameters
+        ----------
+        frames : tuple
+            The DataFrame of the rows, and the DataFrame of the bans or None
+            
+        stats : list of Stats
+            Stats whose partial aggregates are computed
+            
+        Returns
+        -------
+        partials : dict or None
+            Dict matching the name of each stats to its partial aggregates, None if a stats can't be computed by parts
+        """
+        frames = add_derived_columns(frames, stats)
+        
+        partials = {}
+        # Aggregations declared by the stats, each computed only once
+        aggregates = {}
+        for s in stats:
+            aggregations = s.get_aggregations()
+            if aggregations is not None:
+                for a in aggregations.values():
+                    if a not in aggregates:
+                        aggregates[a] = a.compute(frames)
+                partial = {k:aggregates[a] for k, a in aggregations.items()}
+            else:
+                partial = s.get_partial_stats(self._get_stats_input(s, frames))
+            if partial is None:
+                return None
+            partials[s.name] = partial
+        return partials
+    
+    def _get_stats_from_partials(self, partials):
+        """Compute the stats from the partial aggregates combined over all the games
+        
+        Parameters
+        ----------
+        partials : dict
+            Dict matching the name of each stats to its partial aggregates
+            
+        Returns
+        -------
+        stats : Pandas DataFrame
+            Value of the computed stats grouped by the key
+        """
+        stats = {s.name:s.get_stats_from_partial(partials[s.name]) for s in self._stats}
+        
+        stats.update({s.name:s.get_stats() for s in self._special_stats})
+        
+        for s in self._derived_stats:
+            stats.update({s.name:s.get_stats_from_partial(partials[s.name], stats)})
+        
+        return self._decode_index(pd.DataFrame(stats).fillna(0, downcast="infer"))
+    
+    def _decode_index(self, stats):
+        """Replace the identity codes of the index by the original strings
+        
+        Parameters
+        ----------
+        stats : Pandas DataFrame
+            Computed stats, indexed by the key
+            
+        Returns
+        -------
+        stats : Pandas DataFrame
+            The same stats, indexed by the decoded key and sorted
+        """
+        names = [n for n in stats.index.names if n in INTERNED_FIELDS]
+        if len(names) == 0:
+            return stats
+        
+        interner = self._rank_manager.get_interner()
+        if isinstance(stats.index, pd.MultiIndex):
+            for n in names:
+                level = stats.index.names.index(n)
+                stats.index = stats.index.set_levels(interner.decode(stats.index.levels[level]), level=level)
+        else:
+            stats.index = pd.Index(interner.decode(stats.index), name=stats.index.name)
+        return stats.sort_index()
+    
+    def _iter_buffers(self):
+        """Iterate over the chunks written on disk, then over the rows held in memory
+        
+        Yields
+        ------
+        buffers : dict
+            Dict matching a name to each ColumnBuffer
+        """
+        if self._spill is not None:
+            yield from self._spill.iter_chunks()
+        
+        buffers = self._get_buffers()
+        if self._spill is None or len(self._spill) == 0 or any([len(b) > 0 for b in buffers.values()]):
+            yield buffers
+    
+    def _concat_buffers(self):
+        """Gather the chunks written on disk and the rows held in memory in new buffers
+        
+        Returns
+        -------
+        buffers : dict
+            Dict matching a name to each ColumnBuffer
+        """
+        buffers = {name:ColumnBuffer(b.get_fields()) for name, b in self._get_buffers().items()}
+        for buffers2 in self._iter_buffers():
+            for name, b in buffers.items():
+                b.extend_buffer(buffers2[name])
+        return buffers
+    
+    def _get_incremental_stats(self):
+        """Return the stats whose partial aggregates are kept running"""
+        return [s for s in self._stats + self._derived_stats if s.incremental]
+    
+    def _depends_on_ranks(self):
+        """Return if the stats are grouped by league, so their aggregates change with the ranks"""
+        return any(["league" in s.get_keys() for s in self._stats + self._derived_stats])
+    
+    def _on_rows_added(self):
+        """Fold, release or spill the rows held in memory if needed"""
+        self._version += 1
+        
+        buffers = self._get_buffers()
+        pending = max([len(b) - self._folded_rows.get(name, 0) for name, b in buffers.items()])
+        
+        if not self._keep_rows and pending >= FOLD_ROWS:
+            self._release_rows_if_needed()
+        
+        self._spill_if_needed()
+    
+    def _can_release_rows(self):
+        """Return if the stats can be computed from the running aggregates alone, without the rows"""
+        return not (self._keep_rows or self._time_field is not None or self._depends_on_ranks() or any([not s.incremental for s in self._stats + self._derived_stats]))
+    
+    def _release_rows_if_needed(self):
+        """Fold the rows into the aggregates then release them, if they don't need to be kept"""
+        if not self._can_release_rows():
+            return
+        
+        if all([len(b) == 0 for b in self._get_buffers().values()]):
+            return
+        
+        self._fold_pending(self._get_incremental_stats())
+        for b in self._get_buffers().values():
+            b.clear()
+        self._folded_rows = {name:0 for name in self._folded_rows}
+        self._rows_released = True
+    
+    def _fold_pending(self, stats):
+        """Add the rows pushed since the last call to the running partial aggregates of the incremental stats
+        
+        When the ranks changed, the leagues of the rows may have changed too, so all the rows are folded again.
+        
+        Parameters
+        ----------
+        stats : list of Stats
+            Incremental stats
+            
+        Returns
+        -------
+        partials : dict
+            Dict matching the name of each stats to its partial aggregates over all the rows
+        """
+        buffers = self._get_buffers()
+        version = self._rank_manager.get_version() if self._depends_on_ranks() else None
+        
+        if self._running_partials is None or version != self._folded_version:
+            self._running_partials = None
+            for buffers2 in self._iter_buffers():
+                self._running_partials = add_partials(self._running_partials, self._get_partial_stats(self._get_frames(buffers2), stats))
+        else:
+            pending = {name:b.slice(self._folded_rows[name]) for name, b in buffers.items()}
+            if any([len(b) > 0 for b in pending.values()]):
+                self._running_partials = add_partials(self._running_partials, self._get_partial_stats(self._get_frames(pending), stats))
+        
+        self._folded_rows = {name:len(b) for name, b in buffers.items()}
+        self._folded_version = version
+        
+        return self._running_partials
+    
+    def _spill_if_needed(self):
+        """Write the rows held in memory on disk if they exceed the threshold"""
+        buffers = self._get_buffers()
+        if self._spill is not None and any([len(b) > 0 for b in buffers.values()]) and self._spill.should_spill(buffers):
+            # Rows are folded before leaving the memory, so the running aggregates stay valid
+            incremental = self._get_incremental_stats()
+            if len(incremental) > 0:
+                self._fold_pending(incremental)
+            
+            self._spill.spill(buffers)
+            self._folded_rows = {name:0 for name in buffers}
+    
     def _same_configuration(self, sm2):
         """Compare to another StatsManager instance to return if they have the same configuration
         
@@ -72,6 +770,33 @@ class StatsManager: # pragma: no cover
             set([type(s) for s in self._stats]) == set([type(s) for s in sm2._stats]) and \
             set([type(s) for s in self._derived_stats]) == set([type(s) for s in sm2._derived_stats]) and \
             set([type(s) for s in self._special_stats]) == set([type(s) for s in sm2._special_stats])
+    
+    def _get_row_fields(self):
+        """Return the fields stored for each participant row
+        
+        Returns
+        -------
+        fields : list of strings
+            List of fields
+        """
+        return self._participant_fields + self._stats_fields + self._game_fields + self._id_fields + [team_total(f) for f in self._team_fields]
+    
+    def _get_row_columns(self, extraction):
+        """Return the values of the fields stored for each participant row
+        
+        Parameters
+        ----------
+        extraction : Extraction
+            Fields extracted from the match data
+            
+        Returns
+        -------
+        columns : dict
+            Dict matching each field to its values, one per participant
+        """
+        columns = extraction.get_participant_columns(self._participant_fields + self._stats_fields + self._game_fields + self._id_fields)
+        columns.update({team_total(f):extraction.get_team_total(f) for f in self._team_fields})
+        return columns
         
     
 class ChampionStatsManager(StatsManager):
@@ -94,100 +819,41 @@ class ChampionStatsManager(StatsManager):
     """
     
     def __init__(self, stats, rank_manager):
-        self._stats_participants = []
-        self._champion_bans = []
+        self._init_state(stats, rank_manager)
         
-        self._rank_manager = rank_manager
+    def push_extracted(self, extraction):
         
-        game_fields = []
-        participant_fields = []
-        stats_fields = []
-        id_fields = []
+        for match_data in extraction.matches:
+            for s in self._special_stats:
+                s.push_game(match_data)
         
-        for s in stats:
-            game_fields += s.get_game_fields_required()
-            participant_fields += s.get_participant_fields_required()
-            stats_fields += s.get_stats_fields_required()
-            id_fields += s.get_id_fields_required()
+        self._stats_participants.append_columns(self._get_row_columns(extraction))
             
-        self._game_fields = list(set(game_fields))
-        self._participant_fields = list(set(participant_fields))
-        self._stats_fields = list(set(stats_fields))
-        self._id_fields = list(set(id_fields))
-        
-        self._stats = [s for s in stats if not issubclass(s.__class__, SpecialStats) and not issubclass(s.__class__, DerivedStats)]
-        self._derived_stats = sorted([s for s in stats if not issubclass(s.__class__, SpecialStats) and issubclass(s.__class__, DerivedStats)], key=lambda s: s.priority)
-        self._special_stats = [s for s in stats if issubclass(s.__class__, SpecialStats)]
-        
-        self._ban_stats = any([issubclass(s.__class__, ChampionBanStats) for s in stats])
-        
-        for s in self._special_stats:
-            s.set_rank_manager(self._rank_manager)
-        
-        # Listing all required stats for derived stats
-        derived_required = list(set([i for j in self._derived_stats for i in j.get_stats_required()]))
-        if not all([any([isinstance(s, d) for s in stats]) for d in derived_required]):
-            raise MissingRequiredStats
-        
-    def push_game(self, match_data):
-        
-        for s in self._special_stats:
-            s.push_game(match_data)
+        if self._ban_stats:
+            self._champion_bans.append_columns(extraction.get_ban_columns(self._champion_bans.get_fields()))
         
+        self._on_rows_added()
         
-        if len(self._id_fields) > 0:
-            ids = {}
-            for p in match_data["participantIdentities"]:
-                ids[p["participantId"]] = {}
-                for i in self._id_fields:
-                    ids[p["participantId"]][i] = p["player"][i]
+    def _create_buffers(self):
+        self._stats_participants = ColumnBuffer(self._get_row_fields())
+        self._champion_bans = ColumnBuffer(["gameId","championId"])
         
-        for p in match_data["participants"]:
-            row = {f:p[f] for f in self._participant_fields}
-            row.update({f:p["stats"][f] for f in self._stats_fields})
-            row.update({f:match_data[f] for f in self._game_fields})
-            if len(self._id_fields) > 0:
-                row.update({f:ids[p["participantId"]][f] for f in self._id_fields})
-            
-            self._stats_participants.append(row)
-            
-        if self._ban_stats:
-            for t in match_data["teams"]:
-                for b in t["bans"]:
-                    self._champion_bans.append({"gameId":match_data["gameId"], "championId":b["championId"]})
+    def _get_buffers(self):
+        return {"participants":self._stats_participants, "bans":self._champion_bans}
         
-    def get_stats(self):
-        df = pd.DataFrame(self._stats_participants)
+    def _get_frames(self, buffers):
+        df = buffers["participants"].to_frame()
         
         if "summonerId" in df.columns.values:
-            df["league"] = df["summonerId"].map(lambda x: self._rank_manager.get_rank(x))
+            df["league"] = self._rank_manager.get_ranks(df["summonerId"].values)
             
-        
+        df_bans = None
         if self._ban_stats:
-            df_bans = pd.DataFrame(self._champion_bans)
+            df_bans = buffers["bans"].to_frame()
             if "summonerId" in df_bans.columns.values:
-                df_bans["league"] = df_bans["summonerId"].map(lambda x: self._rank_manager.get_rank(x))
-        
-        stats = {s.name:s.get_stats(df if not issubclass(s.__class__, ChampionBanStats) else (df,df_bans)) for s in self._stats}
-        
-        stats.update({s.name:s.get_stats() for s in self._special_stats})
-        
-        for s in self._derived_stats:
-            stats.update({s.name:s.get_stats(df if not issubclass(s.__class__, ChampionBanStats) else (df,df_bans), stats)})
+                df_bans["league"] = self._rank_manager.get_ranks(df_bans["summonerId"].values)
         
-        return pd.DataFrame(stats).fillna(0, downcast="infer")
-    
-    
-    def merge(self, sm2, redundant_games=[]):
-        if redundant_games == []:
-            self._stats_participants += sm2._stats_participants
-            self._champion_bans += sm2._champion_bans
-        else:
-            df = pd.DataFrame(sm2._stats_participants)
-            self._stats_participants += df[~df["gameId"].isin(redundant_games)].to_dict("records")
-            if len(sm2._champion_bans) > 0:
-                df = pd.DataFrame(sm2._champion_bans)
-                self._champion_bans += df[~df["gameId"].isin(redundant_games)].to_dict("records")
+        return df, df_bans
     
 class ChampionDuplicateStatsManager(StatsManager):
     """Manager for Stats at Champion level, duplicated by league
@@ -209,121 +875,116 @@ class ChampionDuplicateStatsManager(StatsManager):
     """
     
     def __init__(self, stats, rank_manager):
-        self._stats_participants = []
-        self._champion_bans = []
+        self._init_state(stats, rank_manager)
         
-        self._rank_manager = rank_manager
+    def push_extracted(self, extraction):
         
-        game_fields = []
-        participant_fields = []
-        stats_fields = []
-        id_fields = []
+        for match_data in extraction.matches:
+            for s in self._special_stats:
+                s.push_game(match_data)
         
-        for s in stats:
-            game_fields += s.get_game_fields_required()
-            participant_fields += s.get_participant_fields_required()
-            stats_fields += s.get_stats_fields_required()
-            id_fields += s.get_id_fields_required()
+        self._stats_participants.append_columns(self._get_row_columns(extraction))
             
-        self._game_fields = list(set(game_fields))
-        self._participant_fields = list(set(participant_fields))
-        self._stats_fields = list(set(stats_fields))
-        self._id_fields = list(set(id_fields))
-        
-        self._stats = [s for s in stats if not issubclass(s.__class__, SpecialStats) and not issubclass(s.__class__, DerivedStats)]
-        self._derived_stats = sorted([s for s in stats if not issubclass(s.__class__, SpecialStats) and issubclass(s.__class__, DerivedStats)], key=lambda s: s.priority)
-        self._special_stats = [s for s in stats if issubclass(s.__class__, SpecialStats)]
+        if self._ban_stats:
+            self._champion_bans.append_columns(extraction.get_ban_columns(self._champion_bans.get_fields()))
         
-        for s in self._special_stats:
-            s.set_rank_manager(self._rank_manager)
+        self._on_rows_added()
         
-        self._ban_stats = any([issubclass(s.__class__, ChampionBanStats) for s in stats])
+    def _create_buffers(self):
+        self._stats_participants = ColumnBuffer(self._get_row_fields())
+        self._champion_bans = ColumnBuffer(["gameId","championId","summonerId"])
         
-        # Listing all required stats for derived stats
-        derived_required = list(set([i for j in self._derived_stats for i in j.get_stats_required()]))
-        if not all([any([isinstance(s, d) for s in stats]) for d in derived_required]):
-            raise MissingRequiredStats
-            
-            
-    def push_game(self, match_data):
+    def _get_buffers(self):
+        return {"participants":self._stats_participants, "bans":self._champion_bans}
         
-        for s in self._special_stats:
-            s.push_game(match_data)
+    def _get_frames(self, buffers):
+        # Rows are not duplicated by league, they are selected through the leagues present in their game
+        participants = buffers["participants"]
+        membership = LeagueMembership(
+            participants.get_column("gameId"),
+            self._rank_manager.get_ranks(participants.get_column("summonerId"))
+        )
         
+        return participants, buffers["bans"] if self._ban_stats else None, membership
         
-        if len(self._id_fields) > 0:
-            ids = {}
-            for p in match_data["participantIdentities"]:
-                ids[p["participantId"]] = {}
-                for i in self._id_fields:
-                    ids[p["participantId"]][i] = p["player"][i]
+    def _get_league_frame(self, buffer, membership, code):
+        """Return the rows of the games where a league is present, with this league
         
-        for p in match_data["participants"]:
-            row = {f:p[f] for f in self._participant_fields}
-            row.update({f:p["stats"][f] for f in self._stats_fields})
-            row.update({f:match_data[f] for f in self._game_fields})
-            if len(self._id_fields) > 0:
-                row.update({f:ids[p["participantId"]][f] for f in self._id_fields})
+        Parameters
+        ----------
+        buffer : ColumnBuffer
+            Buffer holding the rows
             
-            self._stats_participants.append(row)
+        membership : LeagueMembership
+            Index of the leagues present in each game
             
-        if self._ban_stats:
-            for t in match_data["teams"]:
-                for b in t["bans"]:
-                    self._champion_bans.append({"gameId":match_data["gameId"], "championId":b["championId"], "summonerId": ids[b["pickTurn"]]["summonerId"]})
-        
-    def get_stats(self):
-        df = pd.DataFrame(self._stats_participants)
-        
-        df["league"] = df["summonerId"].map(lambda x: self._rank_manager.get_rank(x))
-            
-        # Creating the list of different leagues present in each game
-        league_per_gameId = df.groupby(["gameId"])["league"].unique()
-        @lru_cache(maxsize=1)
-        def get_league_per_gameId(gameId):
-            return league_per_gameId.loc[gameId]
-        
-        # One entry for each different league in the game
-        entries = []
-        for i, row in df.iterrows():
-            for lbg in get_league_per_gameId(row["gameId"]):
-                row["league"] = lbg
-                entries.append(row.to_dict())
-                
-        # Dataframe with the duplicates
-        df_entries = pd.DataFrame(entries)
-        
-        
-        if self._ban_stats:
-            df_bans = pd.DataFrame(self._champion_bans)
-            df_bans["league"] = df_bans["summonerId"].map(lambda x: self._rank_manager.get_rank(x))
-                
-            entries = []
-            for i, row in df_bans.iterrows():
-                for lbg in get_league_per_gameId(row["gameId"]):
-                    row["league"] = lbg
-                    entries.append(row.to_dict())
-            df_bans_entries = pd.DataFrame(entries)
-        
-        stats = {s.name:s.get_stats(df_entries if not issubclass(s.__class__, ChampionBanStats) else (df_entries,df_bans_entries)) for s in self._stats}
+        code : int
+            Code of the league
+            
+        Returns
+        -------
+        df : Pandas DataFrame
+            The selected rows, with the league column
+        """
+        mask = membership.contains(membership.get_game_index(buffer.get_column("gameId")), code)
         
-        stats.update({s.name:s.get_stats() for s in self._special_stats})
+        columns = {f:read_only(buffer.get_column(f)[mask]) for f in buffer.get_fields()}
+        columns["league"] = membership.take(np.full(mask.sum(), code))
+        return pd.DataFrame(columns, copy=False)
+    
+    def _get_duplicated_frame(self, buffer, membership):
+        """Return the rows duplicated for each league present in their game
         
-        for s in self._derived_stats:
-            stats.update({s.name:s.get_stats(df_entries if not issubclass(s.__class__, ChampionBanStats) else (df_entries,df_bans_entries), stats)})
+        Parameters
+        ----------
+        buffer : ColumnBuffer
+            Buffer holding the rows
+            
+        membership : LeagueMembership
+            Index of the leagues present in each game
+            
+        Returns
+        -------
+        df : Pandas DataFrame
+            One row per row of the buffer and per league of its game
+        """
+        game_index = membership.get_game_index(buffer.get_column("gameId"))
+        masks = np.stack([membership.contains(game_index, c) for c in range(len(membership))], axis=1) if len(membership) > 0 else np.zeros((len(game_index), 0), dtype=bool)
+        rows, codes = np.nonzero(masks)
         
-        return pd.DataFrame(stats).fillna(0, downcast="infer")
+        columns = {f:read_only(buffer.get_column(f)[rows]) for f in buffer.get_fields()}
+        columns["league"] = membership.take(codes)
+        return pd.DataFrame(columns, copy=False)
     
-    def merge(self, sm2, redundant_games=[]):
-        if redundant_games == []:
-            self._stats_participants += sm2._stats_participants
-            self._champion_bans += sm2._champion_bans
-        else:
-            df = pd.DataFrame(sm2._stats_participants)
-            self._stats_participants += df[~df["gameId"].isin(redundant_games)].to_dict("records")
-            if len(sm2._champion_bans) > 0:
-                df = pd.DataFrame(sm2._champion_bans)
-                self._champion_bans += df[~df["gameId"].isin(redundant_games)].to_dict("records")
+    def _get_partial_stats(self, frames, stats):
+        participants, bans, membership = frames
+        
+        if len(membership) == 0:
+            # No player has a league, the stats are computed over no row
+            return super()._get_partial_stats((
+                self._get_duplicated_frame(participants, membership),
+                self._get_duplicated_frame(bans, membership) if bans is not None else None
+            ), stats)
+        
+        # Each league is computed apart, keys of different leagues being disjoint
+        partials = None
+        for code in range(len(membership)):
+            partial = super()._get_partial_stats((
+                self._get_league_frame(participants, membership, code),
+                self._get_league_frame(bans, membership, code) if bans is not None else None
+            ), stats)
+            if partial is None:
+                return None
+            partials = add_partials(partials, partial)
+        return partials
+    
+    def _compute_stats(self, frames):
+        # Stats which can't be computed by parts need all the duplicated rows at once
+        participants, bans, membership = frames
+        return super()._compute_stats((
+            self._get_duplicated_frame(participants, membership),
+            self._get_duplicated_frame(bans, membership) if bans is not None else None
+        ))
         
         
 class ItemStatsManager(StatsManager):
@@ -346,79 +1007,45 @@ class ItemStatsManager(StatsManager):
     """
     
     def __init__(self, stats, rank_manager):
-        self._stats_items = []
+        self._init_state(stats, rank_manager)
         
-        self._rank_manager = rank_manager
+    def get_fields_required(self):
+        return {
+            "game":self._game_fields,
+            "participant":self._participant_fields,
+            "stats":self._stats_fields + ITEM_FIELDS,
+            "id":self._id_fields,
+            "ban":[]
+        }
         
-        game_fields = []
-        participant_fields = []
-        stats_fields = []
-        id_fields = []
         
-        for s in stats:
-            game_fields += s.get_game_fields_required()
-            participant_fields += s.get_participant_fields_required()
-            stats_fields += s.get_stats_fields_required()
-            id_fields += s.get_id_fields_required()
-            
-        self._game_fields = list(set(game_fields))
-        self._participant_fields = list(set(participant_fields))
-        self._stats_fields = list(set(stats_fields))
-        self._id_fields = list(set(id_fields))
+    def push_extracted(self, extraction):
         
-        self._stats = [s for s in stats if not issubclass(s.__class__, SpecialStats) and not issubclass(s.__class__, DerivedStats)]
-        self._derived_stats = sorted([s for s in stats if not issubclass(s.__class__, SpecialStats) and issubclass(s.__class__, DerivedStats)], key=lambda s: s.priority)
-        self._special_stats = [s for s in stats if issubclass(s.__class__, SpecialStats)]
+        for match_data in extraction.matches:
+            for s in self._special_stats:
+                s.push_game(match_data)
         
-        # Listing all required stats for derived stats
-        derived_required = list(set([i for j in self._derived_stats for i in j.get_stats_required()]))
-        if not all([any([isinstance(s, d) for s in stats]) for d in derived_required]):
-            raise MissingRequiredStats
+        # One row per item slot filled, repeating the participant values
+        items = np.stack([extraction.get_participant_column(i) for i in ITEM_FIELDS], axis=1)
+        rows, slots = np.nonzero(items > 0)
         
+        columns = {f:v[rows] for f, v in self._get_row_columns(extraction).items()}
+        columns["itemId"] = items[rows, slots]
         
-    def push_game(self, match_data):
-        
-        for s in self._special_stats:
-            s.push_game(match_data)
-        
-        
-        if len(self._id_fields) > 0:
-            ids = {}
-            for p in match_data["participantIdentities"]:
-                ids[p["participantId"]] = {}
-                for i in self._id_fields:
-                    ids[p["participantId"]][i] = p["player"][i]
-        
-        for p in match_data["participants"]:
-            for i in ["item0","item1","item2","item3","item4","item5","item6"]:
-                if (item:= p["stats"][i]) > 0:
-                    row = {f:p[f] for f in self._participant_fields}
-                    row.update({f:p["stats"][f] for f in self._stats_fields})
-                    row.update({f:match_data[f] for f in self._game_fields})
-                    if len(self._id_fields) > 0:
-                        row.update({f:ids[p["participantId"]][f] for f in self._id_fields})
-                    row["itemId"] = item
-
-                    self._stats_items.append(row)
+        self._stats_items.append_columns(columns)
         
-    def get_stats(self):
-        df = pd.DataFrame(self._stats_items)
+        self._on_rows_added()
         
-        if "summonerId" in df.columns.values:
-            df["league"] = df["summonerId"].map(lambda x: self._rank_manager.get_rank(x))
+    def _create_buffers(self):
+        self._stats_items = ColumnBuffer(self._get_row_fields() + ["itemId"])
         
-        stats = {s.name:s.get_stats(df) for s in self._stats}
+    def _get_buffers(self):
+        return {"items":self._stats_items}
         
-        stats.update({s.name:s.get_stats() for s in self._special_stats})
+    def _get_frames(self, buffers):
+        df = buffers["items"].to_frame()
         
-        for s in self._derived_stats:
-            stats.update({s.name:s.get_stats(df, stats)})
+        if "summonerId" in df.columns.values:
+            df["league"] = self._rank_manager.get_ranks(df["summonerId"].values)
         
-        return pd.DataFrame(stats).fillna(0, downcast="infer")
-    
-    def merge(self, sm2, redundant_games=[]):
-        if redundant_games == []:
-            self._stats_items += sm2._stats_items
-        else:
-            df = pd.DataFrame(sm2._stats_items)
-            self._stats_items += df[~df["gameId"].isin(redundant_games)].to_dict("records")
\ No newline at end of file
+        return df, None
@@ -1,8 +1,69 @@
+import numpy as np
+import pandas as pd
+from .buffers import read_only
+
+def team_total(field):
+    """Return the name of the column holding the total of a field over the team of each participant
+    
+    Parameters
+    ----------
+    field : string
+        Stats field
+        
+    Returns
+    -------
+    column : string
+        Name of the column
+    """
+    return "team_" + field
+
+def add_derived_columns(frames, stats):
+    """Return the frames with the columns derived by the stats, leaving the given frames untouched
+    
+    The new DataFrame of the rows shares the columns of the given one, and each derived column is computed once.
+    
+    Parameters
+    ----------
+    frames : Pandas DataFrame or tuple of Pandas DataFrames (df, df_bans)
+        Rows the stats are computed from
+        
+    stats : list of Stats
+        Stats whose derived columns are added
+        
+    Returns
+    -------
+    frames : Pandas DataFrame or tuple of Pandas DataFrames (df, df_bans)
+        The same frames, the DataFrame of the rows holding the derived columns
+    """
+    df = frames[0] if isinstance(frames, tuple) else frames
+    
+    derived = {}
+    for s in stats:
+        for name, column in s.get_derived_columns().items():
+            if name not in derived and name not in df:
+                derived[name] = read_only(np.asarray(column(df)))
+    
+    if len(derived) == 0:
+        return frames
+    
+    columns = {c:df[c].values for c in df.columns}
+    columns.update(derived)
+    df = pd.DataFrame(columns, index=df.index, copy=False)
+    
+    return (df,) + tuple(frames[1:]) if isinstance(frames, tuple) else df
+
 class Stats:# pragma: no cover
     """Abstract class defining the basis of all Stats
     
+    Stats whose partial aggregates are cheap to keep can set incremental to True.
+    Their manager then keeps the aggregates running, and only processes the rows pushed since the last call to get_stats.
+    
+    The DataFrames given to the stats are shared and read-only, they must not be modified.
+    Columns computed from the fields are declared by get_derived_columns instead.
     """
     
+    incremental = False
+    
     def get_keys(self):
         """Return the keys of the Stats
             
@@ -63,6 +124,31 @@ class Stats:# pragma: no cover
         """
         return []
     
+    def get_team_fields_required(self):
+        """Return the stats fields whose total over the team of each participant is required
+        
+        The totals are computed at ingestion, and available in the column given by team_total(field).
+            
+        Returns
+        -------
+        team_fields_required : list of strings
+            List of fields
+        """
+        return []
+    
+    def get_derived_columns(self):
+        """Return the columns computed from the fields of the rows
+        
+        The columns are added by the manager to a new DataFrame before the stats are computed,
+        the ones with the same name being computed only once.
+            
+        Returns
+        -------
+        derived_columns : dict
+            Dict matching the name of each column to a function computing it from the DataFrame of the rows
+        """
+        return {}
+    
     def get_stats(self, df):
         """Return the computed stats
         
@@ -71,6 +157,55 @@ class Stats:# pragma: no cover
         df : Pandas DataFrame
             DataFrame containing all fields required to compute the stats
             
+        Returns
+        -------
+        stats : Pandas Series
+            Value oif the computed stats grouped by the key
+        """
+        return self.get_stats_from_partial(self.get_partial_stats(add_derived_columns(df, [self])))
+    
+    def get_aggregations(self):
+        """Return the aggregations the partial aggregates are made of, if they can be declared
+        
+        Aggregations are shared by all the stats of a manager, and only computed once.
+            
+        Returns
+        -------
+        aggregations : dict of Aggregation, or None
+            Dict matching each partial aggregate to its aggregation, None if the stats computes them itself
+        """
+        return None
+    
+    def get_partial_stats(self, df):
+        """Return the partial aggregates needed to compute the stats
+        
+        The DataFrame may only contain a subset of the games, each game being complete.
+        Partial aggregates of disjoint subsets of games are combined by adding them.
+        By default, the aggregations declared are computed.
+        
+        Parameters
+        ----------
+        df : Pandas DataFrame
+            DataFrame containing all fields required to compute the stats
+            
+        Returns
+        -------
+        partial : dict of Pandas Series or numbers, or None
+            Partial aggregates, None if the stats can't be computed by parts
+        """
+        aggregations = self.get_aggregations()
+        if aggregations is None:
+            return None
+        return {k:a.compute(df) for k, a in aggregations.items()}
+    
+    def get_stats_from_partial(self, partial):
+        """Return the computed stats from the combined partial aggregates
+        
+        Parameters
+        ----------
+        partial : dict of Pandas Series or numbers
+            Partial aggregates combined over all the games
+            
         Returns
         -------
         stats : Pandas Series
@@ -105,7 +240,7 @@ class ChampionBanStats(Stats):# pragma: no cover
         stats : Pandas Series
             Value oif the computed stats grouped by the key
         """
-        pass
+        return self.get_stats_from_partial(self.get_partial_stats(add_derived_columns(dfs, [self])))
 
 class ItemStats(Stats):# pragma: no cover
     """Abstract class defining a Stats for Items
@@ -148,6 +283,9 @@ class DerivedStats(Stats):# pragma: no cover
     order = 0
     
     def get_stats(self, df, stats):
+        return self.get_stats_from_partial(self.get_partial_stats(add_derived_columns(df, [self])), stats)
+    
+    def get_stats_from_partial(self, partial, stats):
         pass
     
     def get_stats_required(self):
@@ -0,0 +1,136 @@
+import bz2
+import gzip
+import io
+import json
+import lzma
+import re
+
+# Partial literal or number a decoding error can stop on when the match is cut at the end of the buffer
+_PARTIAL_TOKEN = re.compile(r"[\w.+-]*")
+
+# Magic numbers of the supported compression formats
+_GZIP_MAGIC = b"\x1f\x8b"
+_BZ2_MAGIC = b"BZh"
+_XZ_MAGIC = b"\xfd7zXZ\x00"
+_ZSTD_MAGIC = b"\x28\xb5\x2f\xfd"
+
+def open_match_stream(fileobj):
+    """Wrap a binary stream so it is decompressed on the fly if needed
+
+    The compression is detected from the first bytes of the stream. Supported formats are gzip, bz2 and xz, and zstd if the zstandard package is installed.
+
+    Parameters
+    ----------
+    fileobj : file object
+        Binary stream, compressed or not
+
+    Raises
+    ------
+    ImportError
+        If the stream is compressed with zstd and the zstandard package is not installed
+
+    Returns
+    -------
+    stream : file object
+        Binary stream of the decompressed data
+    """
+    if not hasattr(fileobj, "peek"):
+        fileobj = io.BufferedReader(fileobj)
+
+    magic = fileobj.peek(6)[:6]
+
+    if magic.startswith(_GZIP_MAGIC):
+        return gzip.GzipFile(fileobj=fileobj)
+    if magic.startswith(_BZ2_MAGIC):
+        return bz2.BZ2File(fileobj)
+    if magic.startswith(_XZ_MAGIC):
+        return lzma.LZMAFile(fileobj)
+    if magic.startswith(_ZSTD_MAGIC):
+        try:
+            import zstandard
+        except ImportError:
+            raise ImportError("Reading zstd compressed matches requires the zstandard package.")
+        return zstandard.ZstdDecompressor().stream_reader(fileobj)
+
+    return fileobj
+
+def _is_truncated(err, buffer):
+    """Return if a decoding error comes from the end of the buffer rather than invalid data"""
+    # Strings can't contain line breaks, so an unterminated one runs to the end of the buffer
+    if err.msg.startswith("Unterminated string"):
+        return True
+    return _PARTIAL_TOKEN.fullmatch(buffer, err.pos) is not None
+
+def iter_matches(fileobj, chunk_size=1 << 20):
+    """Decode matches one at a time from a stream
+
+    The stream can either contain a JSON array of matches, or one match per line (NDJSON).
+    Only one chunk of the stream is held in memory, on top of the match being decoded.
+
+    Parameters
+    ----------
+    fileobj : file object
+        Text or binary stream, binary streams can be compressed
+
+    chunk_size : int
+        Number of characters read from the stream at once
+
+    Raises
+    ------
+    ValueError
+        If the stream is not a JSON array or a sequence of JSON objects
+
+    Yields
+    ------
+    match_data : dict
+        Raw data from Riot API match-v4 endpoint
+    """
+    if not isinstance(fileobj, io.TextIOBase):
+        fileobj = io.TextIOWrapper(open_match_stream(fileobj), encoding="utf-8")
+
+    decoder = json.JSONDecoder()
+    buffer = ""
+    pos = 0
+    eof = False
+    in_array = None
+
+    while True:
+        # Skip whitespaces and separators between matches
+        while pos < len(buffer) and (buffer[pos].isspace() or (in_array and buffer[pos] == ",")):
+            pos += 1
+
+        if pos == len(buffer):
+            if eof:
+                if in_array:
+                    raise ValueError("Unterminated JSON array of matches.")
+                return
+            buffer = fileobj.read(chunk_size)
+            pos = 0
+            eof = len(buffer) == 0
+            continue
+
+        if in_array is None:
+            in_array = buffer[pos] == "["
+            if in_array:
+                pos += 1
+            continue
+
+        if in_array and buffer[pos] == "]":
+            return
+
+        try:
+            match_data, pos = decoder.raw_decode(buffer, pos)
+        except json.JSONDecodeError as err:
+            # Only a match cut at the end of the buffer needs the next chunk, any other error is invalid data
+            if eof or not _is_truncated(err, buffer):
+                raise ValueError("Truncated or invalid match data.")
+            chunk = fileobj.read(chunk_size)
+            eof = len(chunk) == 0
+            buffer = buffer[pos:] + chunk
+            pos = 0
+            continue
+
+        if not isinstance(match_data, dict):
+            raise ValueError("Match data must be JSON objects.")
+
+        yield match_data
@@ -1,6 +1,11 @@
 import pytest
 import json
 import os
+import pandas as pd
+from solari.stats import ChampionKDA, ChampionKillParticipation, ChampionGeneric, ChampionGenericPerMin, ChampionTeamShare
+from solari.stats import ChampionPickrate, ChampionWinrate, ChampionPickCount, ChampionBanrate, ChampionPresenceRate, ChampionBanCount
+from solari.stats import ItemPickrate, ItemWinrate
+from solari.stats import PlayerKDA, PlayerPickrate, PlayerWinrate, PlayerWins
 
 
 @pytest.fixture
@@ -26,4 +31,32 @@ def league():
 def leagues():
     with open(os.path.join(os.path.dirname(__file__), "data", "leagues.json"), "r") as f:
         leagues = json.load(f)
-    return leagues
\ No newline at end of file
+    return leagues
+
+
+@pytest.fixture
+def get_stats():
+    def get_stats(*classes, by_league=False):
+        # New instances of stats, as each Leona instance needs its own
+        if len(classes) > 0:
+            return [c(by_league=by_league) for c in classes]
+        
+        # By default, stats covering every stats manager
+        return [
+            ChampionPickrate(), ChampionWinrate(), ChampionPickCount(), ChampionBanrate(), ChampionBanCount(), ChampionPresenceRate(),
+            ChampionKDA(), ChampionKillParticipation(), ChampionGeneric("goldEarned"), ChampionGenericPerMin("goldEarned"),
+            ChampionTeamShare("totalDamageDealtToChampions"),
+            ChampionPickrate(by_league=True), ChampionWinrate(by_league=True),
+            ItemPickrate(), ItemWinrate(),
+            PlayerKDA(), PlayerPickrate(), PlayerWinrate(), PlayerWins()
+        ]
+    return get_stats
+
+@pytest.fixture
+def assert_same_stats():
+    def assert_same_stats(s1, s2):
+        # Compare two dicts of key:DataFrame
+        assert s1.keys() == s2.keys()
+        for k in s1:
+            pd.testing.assert_frame_equal(s1[k], s2[k])
+    return assert_same_stats
@@ -0,0 +1,41 @@
+import pandas as pd
+from solari import Leona
+from solari.stats import ChampionPickrate, ChampionPickCount, ChampionWinrate, ChampionBanrate, ChampionPresenceRate
+from solari.stats.aggregations import Aggregation, Count, NUnique, Sum
+
+def test_aggregation_equality():
+    assert Count(("championId",)) == Count(("championId",))
+    assert Count(("championId",)) != Count(("championId",), bans=True)
+    assert Count(("championId",)) != NUnique(("championId",))
+    assert len(set([NUnique(), NUnique(), Sum(field="kills")])) == 2
+    
+def test_aggregation_compute():
+    df = pd.DataFrame({"gameId":[1, 1, 2], "championId":[10, 10, 11], "win":[True, False, True]})
+    
+    assert NUnique().compute(df) == 2
+    assert Count(("championId",)).compute(df).to_dict() == {10:2, 11:1}
+    assert NUnique(("championId",)).compute(df).to_dict() == {10:1, 11:1}
+    assert Count(("championId",), where=("win", True)).compute(df).to_dict() == {10:1, 11:1}
+    assert Sum(("championId",), field="gameId").compute(df).to_dict() == {10:2, 11:2}
+    
+def test_shared_aggregations(match_set_2, monkeypatch):
+    l = Leona([
+        ChampionPickrate(),
+        ChampionPickCount(),
+        ChampionWinrate(),
+        ChampionBanrate(),
+        ChampionPresenceRate()
+    ])
+    l.push_matches(match_set_2)
+    
+    computed = []
+    compute = Aggregation.compute
+    def count_compute(self, frames):
+        computed.append(self)
+        return compute(self, frames)
+    monkeypatch.setattr(Aggregation, "compute", count_compute)
+    
+    l.get_stats()
+    
+    # Picks and the number of games are shared, each aggregation is computed once
+    assert len(computed) == len(set(computed)) == 5
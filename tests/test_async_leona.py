@@ -0,0 +1,108 @@
+import asyncio
+import pytest
+import pandas as pd
+from solari import Leona
+from solari.async_leona import AsyncLeona
+from solari.stats import ChampionPickrate, ChampionWinrate
+
+async def generate(matches):
+    for m in matches:
+        await asyncio.sleep(0)
+        yield m
+
+def test_async_push_matches(match_set_2):
+    l = Leona([
+        ChampionPickrate(),
+        ChampionWinrate()
+    ])
+    l.push_matches(match_set_2)
+    
+    async def run():
+        al = AsyncLeona([
+            ChampionPickrate(),
+            ChampionWinrate()
+        ], batch_size=3, queue_size=1)
+        
+        await al.push_matches(generate(match_set_2))
+        stats = await al.get_stats()
+        al.close()
+        return al, stats
+    
+    al, stats = asyncio.run(run())
+    
+    assert al.leona.get_match_count() == 20
+    assert stats.equals(l.get_stats())
+    
+def test_async_push_match_and_league(match_set_2, leagues):
+    async def run():
+        al = AsyncLeona([
+            ChampionPickrate(by_league=True)
+        ])
+        
+        for m in match_set_2:
+            await al.push_match(m)
+        for i in leagues:
+            await al.push_league(i)
+            
+        stats = await al.get_stats()
+        al.close()
+        return stats
+    
+    stats = asyncio.run(run())
+    
+    # Samira got picked 5 times out of 20 games
+    assert stats["Pickrate"].loc[("MASTER",777)] == 5/20
+    
+def test_async_push_matches_error(match_set_2):
+    async def failing(matches):
+        for m in matches:
+            yield m
+        raise ValueError("fetch failed")
+        
+    async def run():
+        al = AsyncLeona([
+            ChampionPickrate()
+        ], batch_size=3, queue_size=1)
+        
+        try:
+            await al.push_matches(failing(match_set_2))
+        finally:
+            al.close()
+        
+    # Errors of the iterator are raised once the matches read are pushed
+    with pytest.raises(ValueError):
+        asyncio.run(run())
+    
+def test_async_push_matches_push_error(match_set_2):
+    async def run():
+        al = AsyncLeona([
+            ChampionPickrate()
+        ], batch_size=2, queue_size=1)
+        
+        try:
+            await al.push_matches(generate([{"gameId":1}] + match_set_2))
+        finally:
+            al.close()
+        
+    # Errors while pushing stop the reading of the iterator
+    with pytest.raises(KeyError):
+        asyncio.run(run())
+    
+def test_async_options(match_set_2, tmp_path):
+    l = Leona([ChampionPickrate()], partition_by=("queueId",))
+    l.push_matches(match_set_2)
+    
+    async def run():
+        al = AsyncLeona([ChampionPickrate()], batch_size=3, spill_threshold=1, spill_directory=str(tmp_path), partition_by=("queueId",))
+        
+        await al.push_matches(generate(match_set_2))
+        stats = await al.get_stats()
+        al.close()
+        return al, stats
+    
+    al, stats = asyncio.run(run())
+    
+    # The options are given to the underlying Leona instance
+    assert sorted(al.leona.get_partitions()) == sorted(l.get_partitions())
+    assert all([len(m._spill) > 0 for p in al.leona._partitions.values() for m in p._stats_manager.values()])
+    pd.testing.assert_frame_equal(stats, l.get_stats())
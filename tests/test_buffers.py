@@ -0,0 +1,128 @@
+import numpy as np
+from solari import Leona
+from solari.stats import ChampionPickrate
+from solari.stats.buffers import Column, ColumnBuffer, SpillStore
+
+def test_column_extend():
+    c = Column(capacity=2)
+    
+    c.extend([1,2])
+    c.extend([3,4,5])
+    
+    # The column grows past its initial capacity
+    assert list(c.view()) == [1,2,3,4,5]
+    assert c.view().dtype == np.int64
+    
+def test_column_promotion():
+    c = Column()
+    
+    c.extend([1,2])
+    c.extend([0.5])
+    
+    # Integers are promoted to floats when needed
+    assert c.view().dtype == np.float64
+    assert list(c.view()) == [1,2,0.5]
+    
+def test_column_strings():
+    c = Column()
+    
+    c.extend(["a","bc"])
+    
+    # Strings are stored as Python objects
+    assert c.view().dtype == object
+    
+def test_column_buffer_to_frame():
+    b = ColumnBuffer(["gameId","championId"])
+    
+    b.append_columns({"gameId":[1,1], "championId":[10,20]})
+    
+    df = b.to_frame()
+    
+    # The DataFrame wraps the columns without copying
+    assert len(b) == 2
+    assert np.shares_memory(df["championId"].values, b.get_column("championId"))
+    
+def test_column_buffer_extend_buffer():
+    b = ColumnBuffer(["gameId","championId"])
+    b2 = ColumnBuffer(["gameId","championId"])
+    
+    b.append_columns({"gameId":[1,1], "championId":[10,20]})
+    b2.append_columns({"gameId":[1,2], "championId":[10,30]})
+    
+    b.extend_buffer(b2, b2.get_column("gameId") != 1)
+    
+    assert list(b.get_column("championId")) == [10,20,30]
+    
+def test_column_buffer_ranges():
+    b = ColumnBuffer(["gameId","championId"])
+    b.append_columns({"gameId":[1,1,2,3,3], "championId":[10,20,30,40,50]})
+    
+    values, starts, stops = b.get_ranges("gameId")
+    assert list(values) == [1,2,3]
+    assert list(starts) == [0,2,3]
+    assert list(stops) == [2,3,5]
+    
+    # Ranges are extended with the rows appended
+    b.append_columns({"gameId":[3,4], "championId":[60,70]})
+    values, starts, stops = b.get_ranges("gameId")
+    assert list(values) == [1,2,3,4]
+    assert list(stops) == [2,3,6,7]
+    
+def test_column_buffer_extend_ranges():
+    b = ColumnBuffer(["gameId","championId"])
+    b2 = ColumnBuffer(["gameId","championId"])
+    b2.append_columns({"gameId":[1,1,2,3,3,4], "championId":[10,20,30,40,50,60]})
+    
+    starts, stops = b2.get_kept_ranges("gameId", [2])
+    assert list(starts) == [0,3]
+    assert list(stops) == [2,6]
+    
+    b.extend_ranges(b2, starts, stops)
+    assert list(b.get_column("championId")) == [10,20,40,50,60]
+    
+    b.extend_ranges(b2, *b2.get_kept_ranges("gameId", [1,2,3,4]))
+    assert len(b) == 5
+    
+def test_champion_manager_columns(match_set_1):
+    l = Leona([
+        ChampionPickrate()
+    ])
+    
+    l.push_matches(match_set_1)
+    
+    buffer = l._stats_manager[("championId",)]._stats_participants
+    
+    # Fields are stored in typed columns
+    assert buffer.get_column("championId").dtype == np.int64
+    assert len(buffer.get_column("gameId")) == 30
+    
+def test_column_buffer_save_load(tmp_path):
+    b = ColumnBuffer(["gameId","summonerId"])
+    b.append_columns({"gameId":[1,2], "summonerId":["a","bc"]})
+    
+    b.save(str(tmp_path))
+    b2 = ColumnBuffer.load(str(tmp_path), ["gameId","summonerId"])
+    
+    # Numbers are memory-mapped, strings are read back as objects
+    assert len(b2) == 2
+    assert isinstance(b2.get_column("gameId"), np.memmap)
+    assert list(b2.get_column("summonerId")) == ["a","bc"]
+    assert b2.get_column("summonerId").dtype == object
+    
+def test_spill_store():
+    store = SpillStore(16)
+    b = ColumnBuffer(["gameId"])
+    
+    b.append_columns({"gameId":[1]})
+    assert not store.should_spill({"b":b})
+    
+    b.append_columns({"gameId":[2]})
+    assert store.should_spill({"b":b})
+    
+    store.spill({"b":b})
+    
+    # The buffer is emptied once written on disk
+    assert len(b) == 0
+    assert len(store) == 1
+    assert [list(c["b"].get_column("gameId")) for c in store.iter_chunks()] == [[1,2]]
+
@@ -1,5 +1,5 @@
 from solari import Leona
-from solari.stats import ChampionKDA, ChampionKillParticipation, ChampionGeneric, ChampionGenericPerMin
+from solari.stats import ChampionKDA, ChampionKillParticipation, ChampionGeneric, ChampionGenericPerMin, ChampionTeamShare
 
 
 def test_champion_kda(match_set_1):
@@ -96,4 +96,36 @@ def test_champion_generic_permin_gold_with_rename(match_set_1):
         11401 * 60 / 991 + 
         16146 * 60 / 1647 + 
         12102 * 60 / 1153
-    ) / 3
\ No newline at end of file
+    ) / 3
+    
+def test_champion_team_share_damage(match_set_1):
+    l = Leona([
+        ChampionTeamShare("totalDamageDealtToChampions")
+    ])
+    
+    for m in match_set_1:
+        l.push_match(m)
+        
+    stats = l.get_stats()
+    
+    shares = []
+    for m in match_set_1:
+        for p in m["participants"]:
+            if p["championId"] == 142:
+                total = sum([t["stats"]["totalDamageDealtToChampions"] for t in m["participants"] if t["teamId"] == p["teamId"]])
+                shares.append(p["stats"]["totalDamageDealtToChampions"] / total)
+    
+    assert abs(stats["totalDamageDealtToChampionsShare"].loc[142] - sum(shares) / len(shares)) < 1e-12
+    
+def test_champion_team_share_with_rename(match_set_1):
+    l = Leona([
+        ChampionTeamShare("goldEarned", "Gold Share")
+    ])
+    
+    for m in match_set_1:
+        l.push_match(m)
+        
+    stats = l.get_stats()
+    
+    assert "Gold Share" in stats
+    assert ((stats["Gold Share"] > 0) & (stats["Gold Share"] < 1)).all()
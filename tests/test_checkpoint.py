@@ -0,0 +1,115 @@
+import json
+import os
+import pytest
+from solari import Leona, CheckpointedIngestion
+from solari.exceptions import MismatchingLeona
+from solari.stats import ChampionPickrate
+
+def crash_after(matches, n):
+    for i, m in enumerate(matches):
+        if i == n:
+            raise RuntimeError("Crash")
+        yield m
+
+def test_checkpoint(match_set_2, tmp_path, get_stats, assert_same_stats):
+    l = Leona(get_stats())
+    l.push_matches(match_set_2)
+
+    ingestion = CheckpointedIngestion(str(tmp_path), get_stats(), checkpoint_matches=4, batch_size=2)
+    ingestion.push_matches(match_set_2)
+
+    assert_same_stats(l.get_stats(), ingestion.leona.get_stats())
+    assert ingestion.get_offset("matches") == {"matches":20, "gameId":match_set_2[-1]["gameId"], "done":True}
+
+    # Restarting after the end doesn't push anything again
+    ingestion = CheckpointedIngestion(str(tmp_path), get_stats())
+    ingestion.push_matches(match_set_2)
+
+    assert ingestion.leona.get_duplicate_count() == 0
+    assert_same_stats(l.get_stats(), ingestion.leona.get_stats())
+
+def test_resume(match_set_2, tmp_path, get_stats, assert_same_stats):
+    l = Leona(get_stats())
+    l.push_matches(match_set_2)
+
+    ingestion = CheckpointedIngestion(str(tmp_path), get_stats(), checkpoint_matches=4, batch_size=2)
+    with pytest.raises(RuntimeError):
+        ingestion.push_matches(crash_after(match_set_2, 13))
+
+    # Only the matches of the last checkpoint are restored
+    ingestion = CheckpointedIngestion(str(tmp_path), get_stats(), checkpoint_matches=4, batch_size=2)
+    assert ingestion.get_offset("matches")["matches"] == 12
+    assert ingestion.leona.get_match_count() == 12
+
+    ingestion.push_matches(match_set_2)
+
+    assert ingestion.leona.get_duplicate_count() == 0
+    assert_same_stats(l.get_stats(), ingestion.leona.get_stats())
+
+def test_resume_other_source(match_set_2, tmp_path, get_stats):
+    ingestion = CheckpointedIngestion(str(tmp_path), get_stats(), checkpoint_matches=4, batch_size=2)
+    with pytest.raises(RuntimeError):
+        ingestion.push_matches(crash_after(match_set_2, 13))
+
+    # The matches given on resume aren't the ones consumed before the checkpoint
+    ingestion = CheckpointedIngestion(str(tmp_path), get_stats(), checkpoint_matches=4, batch_size=2)
+    with pytest.raises(ValueError):
+        ingestion.push_matches(match_set_2[1:])
+    with pytest.raises(ValueError):
+        ingestion.push_matches(match_set_2[:8])
+
+    assert ingestion.leona.get_match_count() == 12
+
+def test_resume_files(match_set_2, tmp_path, get_stats, assert_same_stats):
+    l = Leona(get_stats())
+    l.push_matches(match_set_2)
+
+    paths = []
+    for i in range(2):
+        paths.append(str(tmp_path / ("matches_%d.ndjson" % i)))
+        with open(paths[-1], "w") as f:
+            for m in match_set_2[i * 10:(i + 1) * 10]:
+                f.write(json.dumps(m) + "\n")
+
+    ingestion = CheckpointedIngestion(str(tmp_path / "checkpoint"), get_stats(), checkpoint_matches=3, batch_size=3)
+    ingestion.push_match_file(paths[0])
+    with pytest.raises(RuntimeError):
+        with open(paths[1], "rb") as f:
+            ingestion.push_matches(crash_after([json.loads(line) for line in f], 5), os.path.abspath(paths[1]))
+
+    ingestion = CheckpointedIngestion(str(tmp_path / "checkpoint"), get_stats(), checkpoint_matches=3, batch_size=3)
+    assert ingestion.get_offset(os.path.abspath(paths[0]))["done"]
+    assert ingestion.get_offset(os.path.abspath(paths[1])) == {"matches":3, "gameId":match_set_2[12]["gameId"], "done":False}
+
+    ingestion.push_match_files(paths)
+
+    assert ingestion.leona.get_duplicate_count() == 0
+    assert_same_stats(l.get_stats(), ingestion.leona.get_stats())
+
+def test_incremental_checkpoint(match_set_2, tmp_path, get_stats, assert_same_stats):
+    ingestion = CheckpointedIngestion(str(tmp_path), get_stats(), checkpoint_matches=None)
+    ingestion.push_matches(match_set_2[:10], "first")
+
+    segments = set([f for f in os.listdir(str(tmp_path)) if f.startswith("segment_")])
+
+    # Without new rows, the segments are kept as they are
+    ingestion.checkpoint()
+    assert set([f for f in os.listdir(str(tmp_path)) if f.startswith("segment_")]) == segments
+
+    # New rows are written as new segments, replacing the previous ones not larger, so there are 10, 8 then 2 games in the segments
+    for i in range(10, 20):
+        ingestion.push_matches(match_set_2[i:i + 1], str(i))
+    files = set([f for f in os.listdir(str(tmp_path)) if f.startswith("segment_")])
+    assert len(files) <= 3 * len(segments)
+
+    ingestion = CheckpointedIngestion(str(tmp_path), get_stats())
+    l = Leona(get_stats())
+    l.push_matches(match_set_2)
+    assert_same_stats(l.get_stats(), ingestion.leona.get_stats())
+
+def test_checkpoint_mismatching(match_set_1, tmp_path, get_stats):
+    ingestion = CheckpointedIngestion(str(tmp_path), get_stats())
+    ingestion.push_matches(match_set_1)
+
+    with pytest.raises(MismatchingLeona):
+        CheckpointedIngestion(str(tmp_path), [ChampionPickrate()])
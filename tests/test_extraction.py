@@ -0,0 +1,146 @@
+from solari import Leona
+import pandas as pd
+from solari.stats import ChampionPickrate, ChampionBanrate, ChampionKDA, ChampionKillParticipation, ItemWinrate, PlayerWinrate
+from solari.stats.extraction import FieldExtractor
+
+def extract_generic(extractor, matches):
+    """Extract the required fields from a batch of matches, field by field for each match
+    
+    Reference the extraction of the configuration getters is checked against.
+    
+    Parameters
+    ----------
+    extractor : FieldExtractor
+        Extractor giving the fields of the configuration
+        
+    matches : list of dict
+        Raw data from Riot API match-v4 endpoint
+        
+    Returns
+    -------
+    participants : dict
+        Dict matching each field to the list of its values, one per participant
+        
+    bans : dict
+        Dict matching each field to the list of its values, one per ban
+    """
+    participant_fields = extractor._participant_fields
+    stats_fields = extractor._stats_fields
+    game_fields = extractor._game_fields
+    id_fields = extractor._id_fields
+    ban_fields = extractor._ban_fields
+    
+    participants = {f:[] for f in participant_fields + stats_fields + game_fields + id_fields}
+    bans = {f:[] for f in ban_fields}
+    
+    for match_data in matches:
+        match_participants = match_data["participants"]
+        
+        players = {}
+        if len(id_fields) > 0:
+            players = {p["participantId"]:p["player"] for p in match_data["participantIdentities"]}
+        
+        for f in participant_fields:
+            participants[f].extend([p[f] for p in match_participants])
+        for f in stats_fields:
+            participants[f].extend([p["stats"][f] for p in match_participants])
+        for f in game_fields:
+            participants[f].extend([match_data[f]] * len(match_participants))
+        for f in id_fields:
+            participants[f].extend([players[p["participantId"]][f] for p in match_participants])
+        
+        if len(ban_fields) > 0:
+            match_bans = [b for t in match_data["teams"] for b in t["bans"]]
+            for f in ban_fields:
+                if f == "gameId":
+                    bans[f].extend([match_data["gameId"]] * len(match_bans))
+                elif f in id_fields:
+                    bans[f].extend([players[b["pickTurn"]][f] for b in match_bans])
+                else:
+                    bans[f].extend([b[f] for b in match_bans])
+    
+    return participants, bans
+
+
+def test_extractor_fields_union():
+    l = Leona([
+        ChampionPickrate(),
+        ChampionKDA(),
+        ChampionBanrate(by_league=True),
+        ItemWinrate()
+    ])
+    
+    extractor = FieldExtractor(list(l._stats_manager.values()))
+    
+    # Fields of all managers are extracted at once
+    assert extractor._stats_fields == sorted(["kills","deaths","assists","win"] + ["item" + str(i) for i in range(7)])
+    assert extractor._ban_fields == ["championId","gameId","summonerId"]
+    assert extractor._id_fields == ["summonerId"]
+    
+def test_extractor_columns(match_set_1):
+    l = Leona([
+        ChampionBanrate(by_league=True)
+    ])
+    
+    extraction = FieldExtractor(list(l._stats_manager.values())).extract(match_set_1)
+    
+    # One value per participant and per ban
+    assert len(extraction.get_participant_column("gameId")) == 30
+    assert len(extraction.get_ban_columns(["gameId"])["gameId"]) == sum([len(t["bans"]) for m in match_set_1 for t in m["teams"]])
+    
+def test_extraction_team_total(match_set_2):
+    l = Leona([
+        ChampionKillParticipation()
+    ])
+    
+    extraction = FieldExtractor(list(l._stats_manager.values())).extract(match_set_2)
+    
+    df = pd.DataFrame(extraction.get_participant_columns(["gameId","teamId","kills"]))
+    
+    # Same totals as a groupby over the teams
+    assert (extraction.get_team_total("kills") == df.groupby(["gameId","teamId"])["kills"].transform("sum").values).all()
+    
+def test_shared_extraction_same_stats(match_set_2, leagues):
+    stats = [
+        ChampionPickrate(),
+        ChampionKDA(),
+        ChampionBanrate(by_league=True),
+        ItemWinrate(),
+        PlayerWinrate()
+    ]
+    
+    l = Leona(stats)
+    l.push_matches(match_set_2)
+    for i in leagues:
+        l.push_league(i)
+    
+    # Each stats computed alone gives the same results as computed together
+    for s in stats:
+        l2 = Leona([s])
+        l2.push_matches(match_set_2)
+        for i in leagues:
+            l2.push_league(i)
+        
+        assert l.get_stats(s.get_keys())[s.name].equals(l2.get_stats()[s.name])
+    
+def test_extractor_fast_same_as_generic(match_set_2):
+    l = Leona([
+        ChampionKDA(),
+        ChampionBanrate(by_league=True),
+        ItemWinrate(),
+        PlayerWinrate(by_accountId=True)
+    ])
+    
+    # The getters based extraction gives the same columns as the generic one
+    assert l._extractor._extract_fast(match_set_2) == extract_generic(l._extractor, match_set_2)
+    
+def test_extractor_fast_unordered_identities(match_set_2):
+    l = Leona([
+        ChampionBanrate(by_league=True),
+        PlayerWinrate(by_accountId=True)
+    ])
+    
+    # Players are still matched by participantId when the identities aren't ordered
+    for m in match_set_2[::2]:
+        m["participantIdentities"] = m["participantIdentities"][::-1]
+    assert l._extractor._extract_fast(match_set_2) == extract_generic(l._extractor, match_set_2)
@@ -0,0 +1,53 @@
+import pytest
+import pandas as pd
+from solari import Leona
+from solari.stats import ChampionKDA
+from solari.stats import PlayerKDA
+from solari.stats.stats_types import add_derived_columns
+
+def test_frames_read_only(match_set_1, get_stats):
+    l = Leona(get_stats())
+    l.push_matches(match_set_1)
+    
+    manager = l._stats_manager[("championId",)]
+    df, df_bans = manager._get_frames(manager._get_buffers())
+    
+    with pytest.raises(ValueError):
+        df.loc[0, "kills"] = 0
+    
+def test_frames_not_modified(match_set_1, get_stats):
+    l = Leona(get_stats())
+    l.push_matches(match_set_1)
+    
+    manager = l._stats_manager[("championId",)]
+    frames = manager._get_frames(manager._get_buffers())
+    columns = list(frames[0].columns)
+    bans = frames[1].copy()
+    
+    manager._get_partial_stats(frames, manager._stats)
+    
+    # Derived columns are added to a new DataFrame, and bans are not deduplicated in place
+    assert list(frames[0].columns) == columns
+    pd.testing.assert_frame_equal(frames[1], bans)
+    
+def test_stats_order_independent(match_set_2, get_stats):
+    l = Leona(get_stats())
+    l2 = Leona(get_stats()[::-1])
+    l.push_matches(match_set_2)
+    l2.push_matches(match_set_2)
+    
+    s1 = l.get_stats()
+    s2 = l2.get_stats()
+    for k in s1:
+        pd.testing.assert_frame_equal(s1[k], s2[k][s1[k].columns])
+    
+def test_add_derived_columns():
+    df = pd.DataFrame({"kills":[1, 2], "deaths":[0, 2], "assists":[3, 4]})
+    
+    df2 = add_derived_columns(df, [ChampionKDA(), PlayerKDA()])
+    
+    assert list(df.columns) == ["kills","deaths","assists"]
+    assert list(df2["KDA"]) == [4.0, 3.0]
+    
+    # Columns already there are not computed again
+    assert add_derived_columns(df2, [ChampionKDA()]) is df2
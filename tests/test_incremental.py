@@ -0,0 +1,166 @@
+import pytest
+import pandas as pd
+from solari import Leona
+from solari.exceptions import RedundantAggregatedGames
+from solari.stats import stats_managers
+from solari.stats import ChampionPickrate, ChampionWinrate, ChampionPickCount, ChampionBanrate, ChampionPresenceRate, ChampionBanCount
+from solari.stats import ChampionKDA, ChampionGeneric, ChampionGenericPerMin, PlayerKDA, PlayerGeneric, PlayerGenericPerMin
+
+COUNT_STATS = [ChampionPickrate, ChampionWinrate, ChampionPickCount, ChampionBanrate, ChampionBanCount, ChampionPresenceRate]
+
+def test_incremental_get_stats(match_set_2, get_stats):
+    l = Leona(get_stats(*COUNT_STATS))
+    l2 = Leona(get_stats(*COUNT_STATS))
+    
+    l.push_matches(match_set_2)
+    
+    # Stats are requested while matches keep being pushed
+    for m in match_set_2:
+        l2.push_match(m)
+        l2.get_stats()
+    
+    m = l2._stats_manager[("championId",)]
+    assert m._folded_rows["participants"] == len(m._stats_participants)
+    
+    pd.testing.assert_frame_equal(l.get_stats(), l2.get_stats())
+    
+def test_incremental_rank_change(match_set_2, leagues, get_stats):
+    l = Leona(get_stats(*COUNT_STATS, by_league=True))
+    l2 = Leona(get_stats(*COUNT_STATS, by_league=True))
+    
+    l.push_matches(match_set_2)
+    for i in leagues:
+        l.push_league(i)
+    
+    l2.push_matches(match_set_2[:10])
+    l2.get_stats()
+    
+    # Leagues are known after the first rows were folded
+    for i in leagues:
+        l2.push_league(i)
+    l2.push_matches(match_set_2[10:])
+    
+    pd.testing.assert_frame_equal(l.get_stats(), l2.get_stats())
+    
+def test_incremental_mixed(match_set_2, get_stats):
+    l = Leona(get_stats(*COUNT_STATS) + [ChampionKDA()])
+    l2 = Leona(get_stats(*COUNT_STATS) + [ChampionKDA()])
+    
+    l.push_matches(match_set_2)
+    
+    l2.push_matches(match_set_2[:10])
+    l2.get_stats()
+    l2.push_matches(match_set_2[10:])
+    
+    pd.testing.assert_frame_equal(l.get_stats(), l2.get_stats())
+    
+def test_incremental_merge_spill(match_set_2, get_stats):
+    l = Leona(get_stats(*COUNT_STATS))
+    l2 = Leona(get_stats(*COUNT_STATS), spill_threshold=1)
+    l3 = Leona(get_stats(*COUNT_STATS))
+    
+    l.push_matches(match_set_2)
+    
+    l2.push_matches(match_set_2[:12], batch_size=4)
+    l2.get_stats()
+    l3.push_matches(match_set_2[8:])
+    l2.merge(l3)
+    
+    pd.testing.assert_frame_equal(l.get_stats(), l2.get_stats())
+    
+def get_mean_stats():
+    return [
+        ChampionGeneric("goldEarned"), ChampionGenericPerMin("goldEarned"), ChampionKDA(),
+        PlayerGeneric("goldEarned"), PlayerGenericPerMin("goldEarned"), PlayerKDA()
+    ]
+    
+def test_release_rows(match_set_2, monkeypatch):
+    monkeypatch.setattr(stats_managers, "FOLD_ROWS", 50)
+    
+    l = Leona(get_mean_stats())
+    l2 = Leona(get_mean_stats(), keep_rows=False)
+    
+    l.push_matches(match_set_2)
+    l2.push_matches(match_set_2, batch_size=3)
+    
+    # Rows are folded and released as they are pushed
+    assert all([len(m._stats_participants) < 50 for m in l2._stats_manager.values()])
+    
+    stats = l.get_stats()
+    stats2 = l2.get_stats()
+    for k in stats:
+        pd.testing.assert_frame_equal(stats[k], stats2[k])
+    
+    assert all([len(m._stats_participants) == 0 for m in l2._stats_manager.values()])
+    
+def test_release_rows_merge(match_set_2):
+    l = Leona(get_mean_stats())
+    l2 = Leona(get_mean_stats(), keep_rows=False)
+    l3 = Leona(get_mean_stats(), keep_rows=False)
+    
+    l.push_matches(match_set_2)
+    l2.push_matches(match_set_2[:10])
+    l3.push_matches(match_set_2[10:])
+    l2.get_stats()
+    l3.get_stats()
+    
+    # Aggregates are added, with the players codes of l3 translated
+    l2.merge(l3)
+    
+    stats = l.get_stats()
+    stats2 = l2.get_stats()
+    for k in stats:
+        pd.testing.assert_frame_equal(stats[k], stats2[k])
+    
+def test_release_rows_merge_redundant(match_set_2):
+    l = Leona(get_mean_stats())
+    l2 = Leona(get_mean_stats(), keep_rows=False)
+    
+    l.push_matches(match_set_2[:12])
+    l2.push_matches(match_set_2[8:])
+    l2.get_stats()
+    
+    with pytest.raises(RedundantAggregatedGames):
+        l.merge(l2)
+    
+    # The games of the instance keeping its rows can still be removed
+    l2.merge(l)
+    assert l2.get_duplicate_count() == 4
+    
+def test_merge_aggregates(match_set_2, get_stats):
+    l = Leona(get_mean_stats() + get_stats(*COUNT_STATS))
+    l2 = Leona(get_mean_stats() + get_stats(*COUNT_STATS), keep_rows=False)
+    l3 = Leona(get_mean_stats() + get_stats(*COUNT_STATS))
+    
+    l.push_matches(match_set_2)
+    l2.push_matches(match_set_2[:10])
+    l3.push_matches(match_set_2[10:])
+    
+    rows = {k:len(m._stats_participants) for k, m in l2._stats_manager.items()}
+    l2.merge(l3)
+    
+    # Only the aggregates of l3 are added, not its rows
+    assert {k:len(m._stats_participants) for k, m in l2._stats_manager.items()} == rows
+    
+    stats = l.get_stats()
+    stats2 = l2.get_stats()
+    for k in stats:
+        pd.testing.assert_frame_equal(stats[k], stats2[k])
+    
+def test_merge_aggregates_redundant(match_set_2, get_stats):
+    l = Leona(get_mean_stats() + get_stats(*COUNT_STATS))
+    l2 = Leona(get_mean_stats() + get_stats(*COUNT_STATS), keep_rows=False)
+    l3 = Leona(get_mean_stats() + get_stats(*COUNT_STATS))
+    
+    l.push_matches(match_set_2)
+    l2.push_matches(match_set_2[:12])
+    l3.push_matches(match_set_2[8:])
+    
+    # The aggregates of the redundant games are computed from the rows of l3, and removed
+    l2.merge(l3)
+    assert l2.get_duplicate_count() == 4
+    
+    stats = l.get_stats()
+    stats2 = l2.get_stats()
+    for k in stats:
+        pd.testing.assert_frame_equal(stats[k], stats2[k])
@@ -0,0 +1,56 @@
+import numpy as np
+from solari import Leona
+from solari.stats import PlayerPickCount
+from solari.stats.interner import Interner
+
+def test_interner_encode():
+    interner = Interner()
+    
+    codes = interner.encode(["a","b","a"])
+    
+    # Codes are given in order of first appearance
+    assert codes.dtype == np.int32
+    assert list(codes) == [0,1,0]
+    assert list(interner.encode(["c","b"])) == [2,1]
+    assert len(interner) == 3
+    
+def test_interner_decode():
+    interner = Interner()
+    
+    codes = interner.encode(["a","b","c"])
+    
+    assert list(interner.decode(codes[::-1])) == ["c","b","a"]
+    
+def test_rows_store_codes(match_set_1):
+    l = Leona([
+        PlayerPickCount()
+    ])
+    
+    l.push_matches(match_set_1)
+    
+    m = l._stats_manager[("summonerId","championId")]
+    assert m._stats_participants.get_column("summonerId").dtype == np.int32
+    
+    # The strings are only restored in the index of the results
+    summoner_id = match_set_1[0]["participantIdentities"][0]["player"]["summonerId"]
+    assert summoner_id in l.get_stats().index.get_level_values("summonerId")
+    
+def test_merge_remap_codes(match_set_1):
+    l = Leona([
+        PlayerPickCount()
+    ])
+    l2 = Leona([
+        PlayerPickCount()
+    ])
+    l3 = Leona([
+        PlayerPickCount()
+    ])
+    
+    l.push_matches(match_set_1)
+    l2.push_matches(match_set_1[2:])
+    l3.push_matches(match_set_1[:2])
+    
+    # Both instances gave the same codes to different players
+    l2.merge(l3)
+    
+    assert l.get_stats().equals(l2.get_stats())
@@ -1,5 +1,7 @@
+import pandas as pd
+import solari.solari
 from solari import Leona
-from solari.stats import ChampionPickrate, ChampionWinrate, ItemPickrate
+from solari.stats import ChampionPickrate, ChampionWinrate, ChampionBanrate, ItemPickrate
 from solari.exceptions import NoMatchPushed
 
 def test_leona_no_of_stats_managers():
@@ -48,6 +50,10 @@ def test_leona_push_match(match_set_1):
     for m in match_set_1:
         l.push_match(m)
         
+    # Matches pushed one by one are processed once the state is read
+    assert len(l._stats_manager[("championId",)]._stats_participants) == 0
+    assert l.get_match_count() == 3
+    
     # Pushing 3 matches results in 30 rows for champions stats
     assert len(l._stats_manager[("championId",)]._stats_participants) == 30
     
@@ -107,3 +113,80 @@ def test_leona_no_match_exception():
         l.get_stats()
     except NoMatchPushed:
         assert True
+    
+    
+def test_leona_push_matches(match_set_2, leagues):
+    l = Leona([
+        ChampionPickrate(),
+        ChampionWinrate(),
+        ChampionBanrate(by_league=True),
+        ItemPickrate()
+    ])
+    l2 = Leona([
+        ChampionPickrate(),
+        ChampionWinrate(),
+        ChampionBanrate(by_league=True),
+        ItemPickrate()
+    ])
+    
+    for m in match_set_2:
+        l.push_match(m)
+    
+    # Batches don't have to be aligned with the number of matches
+    l2.push_matches((m for m in match_set_2), batch_size=3)
+    
+    for i in leagues:
+        l.push_league(i)
+        l2.push_league(i)
+    
+    assert l2.get_match_count() == len(match_set_2)
+    for k in l.get_keys():
+        assert l.get_stats(k).equals(l2.get_stats(k))
+    
+    
+def test_leona_push_duplicate_match(match_set_1):
+    l = Leona([
+        ChampionPickrate()
+    ])
+    
+    for m in match_set_1 + match_set_1[:2]:
+        l.push_match(m)
+    
+    # Duplicate matches are not stored twice
+    assert l.get_match_count() == 3
+    assert l.get_duplicate_count() == 2
+    assert len(l._stats_manager[("championId",)]._stats_participants) == 30
+    
+    
+def test_leona_push_matches_duplicates(match_set_1):
+    l = Leona([
+        ChampionPickrate()
+    ])
+    
+    l.push_matches(match_set_1[:2])
+    # Duplicates both from previous batches and inside the batch
+    l.push_matches(match_set_1 + match_set_1)
+    
+    assert l.get_match_count() == 3
+    assert l.get_duplicate_count() == 5
+    assert len(l._stats_manager[("championId",)]._stats_participants) == 30
+    
+def test_leona_push_match_pending(match_set_2, monkeypatch):
+    monkeypatch.setattr(solari.solari, "PENDING_MATCHES", 4)
+    l = Leona([ChampionPickrate(), ChampionWinrate()])
+    l2 = Leona([ChampionPickrate(), ChampionWinrate()])
+    
+    for m in match_set_2[:6]:
+        l.push_match(m)
+    
+    # Matches are processed once enough of them are held
+    assert len(l._pending_matches) == 2
+    assert len(l._stats_manager[("championId",)]._stats_participants) == 40
+    
+    # Held matches are processed before the next ones, duplicates included
+    l.push_matches(match_set_2[4:])
+    l.push_match(match_set_2[0])
+    l2.push_matches(match_set_2)
+    
+    assert l.get_duplicate_count() == 3
+    pd.testing.assert_frame_equal(l.get_stats(), l2.get_stats())
@@ -0,0 +1,47 @@
+import numpy as np
+import pandas as pd
+from solari import Leona
+from solari.stats import ChampionPickrate, ChampionBanrate, ChampionPresenceRate, ChampionKDA
+from solari.stats.membership import LeagueMembership
+from solari.stats.stats_managers import ChampionDuplicateStatsManager
+
+def test_membership():
+    membership = LeagueMembership(
+        np.array([1, 1, 1, 2, 2, 3]),
+        np.array(["GOLD", "SILVER", "GOLD", "GOLD", None, None], dtype=object)
+    )
+    
+    assert list(membership.get_leagues()) == ["GOLD", "SILVER"]
+    
+    game_index = membership.get_game_index(np.array([1, 2, 3, 4]))
+    assert game_index[3] == -1
+    
+    assert list(membership.contains(game_index, 0)) == [True, True, False, False]
+    assert list(membership.contains(game_index, 1)) == [True, False, False, False]
+    assert list(sum([membership.contains(game_index, c) for c in range(len(membership))])) == [2, 1, 0, 0]
+    
+def test_membership_many_leagues():
+    leagues = np.array(["L%03d" % i for i in range(100)], dtype=object)
+    membership = LeagueMembership(np.repeat([1, 2], 50), leagues)
+    
+    game_index = membership.get_game_index(np.array([1, 2]))
+    assert list(membership.contains(game_index, 70)) == [False, True]
+    assert list(sum([membership.contains(game_index, c) for c in range(len(membership))])) == [50, 50]
+    
+def test_no_duplicated_frame(match_set_2, leagues, monkeypatch):
+    stats = [ChampionPickrate(by_league=True), ChampionBanrate(by_league=True), ChampionPresenceRate(by_league=True), ChampionKDA(by_league=True)]
+    
+    l = Leona(stats)
+    l.push_matches(match_set_2)
+    for i in leagues:
+        l.push_league(i)
+    
+    manager = l._stats_manager[("league","championId")]
+    expected = manager._compute_stats(manager._get_frames(manager._get_buffers()))
+    
+    # Stats computed by parts never build the duplicated rows
+    def fail(*args):
+        raise AssertionError
+    monkeypatch.setattr(ChampionDuplicateStatsManager, "_get_duplicated_frame", fail)
+    
+    pd.testing.assert_frame_equal(l.get_stats(), expected)
@@ -1,4 +1,6 @@
+import pytest
 from solari import Leona
+from solari.exceptions import MismatchingLeona
 from solari.stats import ChampionKDA, ChampionKillParticipation, ChampionGeneric, ChampionGenericPerMin
 from solari.stats import ChampionPickrate, ChampionWinrate, ChampionPickCount, ChampionBanrate, ChampionPresenceRate, ChampionBanCount
 from solari.stats import ItemPickrate, ItemWinrate
@@ -114,5 +116,96 @@ def test_merge_redundant_games(match_set_2,leagues):
         l2.push_league(i)
         
     l2.merge(l3)
+    
+    # The 5 matches in both instances are counted as duplicates
+    assert l2.get_duplicate_count() == 5
     assert stats[("itemId",)].equals(l2.get_stats()[("itemId",)])
-    assert stats[("league","championId")].equals(l2.get_stats()[("league","championId")])
\ No newline at end of file
+    assert stats[("league","championId")].equals(l2.get_stats()[("league","championId")])
+
+def test_merge_all(match_set_2, leagues):
+    l = Leona([
+        ChampionPickrate(by_league=True),
+        ChampionWinrate(by_league=True),
+        ChampionBanrate(by_league=True),
+        ItemPickrate()
+    ])
+    
+    for m in match_set_2:
+        l.push_match(m)
+    for i in leagues:
+        l.push_league(i)
+        
+    stats = l.get_stats()
+    
+    shards = [Leona([
+        ChampionPickrate(by_league=True),
+        ChampionWinrate(by_league=True),
+        ChampionBanrate(by_league=True),
+        ItemPickrate()
+    ]) for _ in range(4)]
+    
+    for i, s in enumerate(shards):
+        for m in match_set_2[i * 5:i * 5 + 8]:
+            s.push_match(m)
+    for i in leagues:
+        shards[0].push_league(i)
+        
+    shards[0].merge_all(shards[1:], workers=2)
+    
+    # Each shard holds 3 games of the next one
+    assert shards[0].get_duplicate_count() == 9
+    assert stats[("itemId",)].equals(shards[0].get_stats()[("itemId",)])
+    assert stats[("league","championId")].equals(shards[0].get_stats()[("league","championId")])
+    
+def test_merge_all_aggregates(match_set_2):
+    l = Leona([
+        ChampionPickrate(),
+        ChampionWinrate(),
+        ChampionKDA()
+    ])
+    
+    for m in match_set_2:
+        l.push_match(m)
+        
+    stats = l.get_stats()
+    
+    shards = [Leona([
+        ChampionPickrate(),
+        ChampionWinrate(),
+        ChampionKDA()
+    ], keep_rows=(i > 0)) for i in range(4)]
+    
+    for i, s in enumerate(shards):
+        for m in match_set_2[i * 5:(i + 1) * 5]:
+            s.push_match(m)
+    shards[0].get_stats()
+        
+    shards[0].merge_all(shards[1:], workers=3)
+    
+    merged = shards[0].get_stats()
+    assert (stats.index == merged.index).all()
+    assert ((stats - merged).abs() < 1e-12).all().all()
+    
+def test_merge_all_mismatching(match_set_2):
+    l = Leona([
+        ChampionPickrate()
+    ])
+    l2 = Leona([
+        ChampionPickrate()
+    ])
+    l3 = Leona([
+        ChampionWinrate()
+    ])
+    
+    for m in match_set_2[:10]:
+        l.push_match(m)
+    for m in match_set_2[10:]:
+        l2.push_match(m)
+        
+    stats = l.get_stats()
+    
+    with pytest.raises(MismatchingLeona):
+        l.merge_all([l2, l3])
+        
+    # Nothing is merged when any of the instances doesn't match
+    assert stats.equals(l.get_stats())
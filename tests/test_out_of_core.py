@@ -0,0 +1,80 @@
+import os
+import pickle
+from solari import Leona
+from solari.stats import ChampionKDA
+from solari.stats import ChampionPickrate, ChampionWinrate, ChampionBanrate, ChampionPresenceRate
+from solari.stats import ItemPickrate
+
+LEAGUE_STATS = [ChampionPickrate, ChampionWinrate, ChampionBanrate, ChampionPresenceRate, ChampionKDA, ItemPickrate]
+
+def test_spill(match_set_1, get_stats, assert_same_stats):
+    l = Leona(get_stats())
+    l2 = Leona(get_stats(), spill_threshold=1)
+
+    l.push_matches(match_set_1)
+    l2.push_matches(match_set_1, batch_size=1)
+
+    assert all([len(m._spill) > 1 for m in l2._stats_manager.values()])
+
+    assert_same_stats(l.get_stats(), l2.get_stats())
+
+def test_spill_by_league(match_set_2, leagues, get_stats, assert_same_stats):
+    l = Leona(get_stats(*LEAGUE_STATS, by_league=True))
+    l2 = Leona(get_stats(*LEAGUE_STATS, by_league=True), spill_threshold=1)
+
+    l.push_matches(match_set_2)
+    l2.push_matches(match_set_2, batch_size=3)
+    for i in leagues:
+        l.push_league(i)
+        l2.push_league(i)
+
+    assert all([len(m._spill) > 1 for m in l2._stats_manager.values()])
+
+    assert_same_stats(l.get_stats(), l2.get_stats())
+
+def test_spill_directory(match_set_1, tmp_path, get_stats, assert_same_stats):
+    l = Leona(get_stats())
+    l2 = Leona(get_stats(), spill_threshold=1, spill_directory=str(tmp_path))
+
+    l.push_matches(match_set_1)
+    l2.push_matches(match_set_1, batch_size=1)
+
+    assert len(os.listdir(tmp_path)) == len(l2.get_keys())
+
+    assert_same_stats(l.get_stats(), l2.get_stats())
+
+def test_spill_shared_directory(match_set_1, tmp_path, get_stats, assert_same_stats):
+    l = Leona(get_stats())
+    l2 = Leona(get_stats(), spill_threshold=1, spill_directory=str(tmp_path))
+    l3 = Leona(get_stats(), spill_threshold=1, spill_directory=str(tmp_path))
+
+    l.push_matches(match_set_1)
+    l2.push_matches(match_set_1[:2], batch_size=1)
+    l3.push_matches(match_set_1[1:], batch_size=1)
+
+    # Both instances spill in the same directories, each store in its own subdirectory
+    l2.merge(l3)
+
+    assert_same_stats(l.get_stats(), l2.get_stats())
+
+def test_spill_merge(match_set_1, get_stats, assert_same_stats):
+    l = Leona(get_stats())
+    l2 = Leona(get_stats(), spill_threshold=1)
+    l3 = Leona(get_stats(), spill_threshold=1)
+
+    l.push_matches(match_set_1)
+    l2.push_matches(match_set_1[:2], batch_size=1)
+    l3.push_matches(match_set_1[1:], batch_size=1)
+
+    l2.merge(l3)
+
+    assert_same_stats(l.get_stats(), l2.get_stats())
+
+def test_spill_pickle(match_set_1, get_stats, assert_same_stats):
+    l = Leona(get_stats())
+    l2 = Leona(get_stats(), spill_threshold=1)
+
+    l.push_matches(match_set_1)
+    l2.push_matches(match_set_1, batch_size=1)
+
+    assert_same_stats(l.get_stats(), pickle.loads(pickle.dumps(l2)).get_stats())
@@ -0,0 +1,76 @@
+import multiprocessing
+import os
+import pandas as pd
+import pytest
+from solari import Leona
+from solari.stats import ChampionPickrate, ChampionWinrate, ChampionBanrate, ChampionKDA, ItemPickrate
+
+def test_push_matches_workers(match_set_2, leagues):
+    stats = [
+        ChampionPickrate(),
+        ChampionWinrate(),
+        ChampionKDA(),
+        ChampionBanrate(by_league=True),
+        ItemPickrate()
+    ]
+    l = Leona(stats)
+    l.push_matches(match_set_2)
+    
+    l2 = Leona(stats)
+    l2.push_matches(match_set_2 + match_set_2[:5], batch_size=3, workers=2)
+    
+    for i in leagues:
+        l.push_league(i)
+        l2.push_league(i)
+    
+    assert l2.get_match_count() == 20
+    assert l2.get_duplicate_count() == 5
+    for k in l.get_keys():
+        pd.testing.assert_frame_equal(l.get_stats(k).sort_index(), l2.get_stats(k).sort_index())
+        
+def test_push_matches_workers_error(match_set_1):
+    l = Leona([
+        ChampionPickrate()
+    ])
+    
+    # The exception raised in a worker is raised again
+    with pytest.raises(KeyError):
+        l.push_matches([{"gameId":1}], workers=2)
+
+def test_push_matches_workers_killed(match_set_2, monkeypatch):
+    if multiprocessing.get_start_method() != "fork":
+        pytest.skip("The workers only inherit the patched method when forked")
+    
+    # A worker killed while pushing doesn't leave the caller waiting for it
+    monkeypatch.setattr(Leona, "_push_batch", lambda self, batch: os._exit(1))
+    l = Leona([
+        ChampionPickrate()
+    ])
+    
+    with pytest.raises(RuntimeError):
+        l.push_matches(match_set_2, batch_size=1, workers=2)
+    assert multiprocessing.active_children() == []
+        
+def test_push_matches_workers_spill(match_set_2, tmp_path):
+    stats = [
+        ChampionPickrate(),
+        ChampionWinrate(),
+        ItemPickrate()
+    ]
+    l = Leona(stats)
+    l.push_matches(match_set_2)
+    
+    l2 = Leona(stats, spill_threshold=1, spill_directory=str(tmp_path))
+    assert l2._get_worker_options()["spill_threshold"] == 1
+    l2.push_matches(match_set_2, batch_size=3, workers=2)
+    
+    # The chunks of the workers are merged one at a time, and spilled again
+    assert all([len(m._spill) > 1 for m in l2._stats_manager.values()])
+    
+    # Only the chunks of the instance are left on disk, the ones of the workers being removed after the merge
+    for k, m in l2._stats_manager.items():
+        stores = os.listdir(os.path.join(str(tmp_path), "_".join(k)))
+        assert len(stores) == 1
+        assert len(os.listdir(os.path.join(str(tmp_path), "_".join(k), stores[0]))) == len(m._spill)
+    for k in l.get_keys():
+        pd.testing.assert_frame_equal(l.get_stats(k).sort_index(), l2.get_stats(k).sort_index())
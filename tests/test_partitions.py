@@ -0,0 +1,86 @@
+import pytest
+import pandas as pd
+from solari import Leona
+from solari.exceptions import NoMatchPushed
+from solari.stats import ChampionPickrate
+
+def test_partition_stats(match_set_2, leagues, get_stats, assert_same_stats):
+    l = Leona(get_stats(), partition_by=("gameVersion","queueId"))
+    l2 = Leona(get_stats())
+    
+    l.push_matches(match_set_2)
+    l2.push_matches([m for m in match_set_2 if m["queueId"] == 420])
+    for i in leagues:
+        l.push_league(i)
+        l2.push_league(i)
+    
+    assert sorted(l.get_partitions()) == [("11.1.352.5559",420), ("11.1.352.5559",440), ("11.1.352.5559",450)]
+    assert l.get_match_count() == 20
+    
+    assert_same_stats(l.get_stats(partition=("11.1.352.5559",420)), l2.get_stats())
+    assert_same_stats(l.get_partition_stats(workers=2)[("11.1.352.5559",420)], l2.get_stats())
+    
+    with pytest.raises(NoMatchPushed):
+        l.get_stats(partition=("11.1.352.5559",400))
+    
+def test_partition_rollup(match_set_2, leagues, get_stats, assert_same_stats):
+    l = Leona(get_stats(), partition_by=("queueId",))
+    l2 = Leona(get_stats())
+    
+    l.push_matches(match_set_2)
+    l2.push_matches(match_set_2)
+    for i in leagues:
+        l.push_league(i)
+        l2.push_league(i)
+    
+    # The stats over all the partitions are the ones of a single instance
+    assert_same_stats(l.get_stats(), l2.get_stats())
+    assert_same_stats(l.get_stats(workers=2), l2.get_stats())
+    pd.testing.assert_frame_equal(l.get_stats(("championId",), partition=420), l.get_stats(partition=(420,))[("championId",)])
+    
+def test_partition_merge(match_set_2, get_stats, assert_same_stats):
+    l = Leona(get_stats(), partition_by=("queueId",))
+    l2 = Leona(get_stats(), partition_by=("queueId",))
+    l3 = Leona(get_stats())
+    
+    l.push_matches(match_set_2[:12])
+    l2.push_matches(match_set_2[8:])
+    l3.push_matches(match_set_2)
+    
+    l.merge(l2)
+    
+    assert l.get_match_count() == 20
+    assert l.get_duplicate_count() == 4
+    assert_same_stats(l.get_stats(), l3.get_stats())
+    
+def test_partition_not_partitioned(match_set_2):
+    l = Leona([ChampionPickrate()])
+    l.push_matches(match_set_2)
+    
+    with pytest.raises(ValueError):
+        l.get_stats(partition=(420,))
+    
+def test_partition_workers(match_set_2, get_stats, assert_same_stats):
+    l = Leona(get_stats(), partition_by=("queueId",))
+    l2 = Leona(get_stats(), partition_by=("queueId",))
+    
+    l.push_matches(match_set_2)
+    l2.push_matches(match_set_2, batch_size=5, workers=2)
+    
+    assert sorted(l2.get_partitions()) == sorted(l.get_partitions())
+    assert_same_stats(l.get_stats(), l2.get_stats())
+    
+def test_partition_managers_created_once(match_set_2, tmp_path, get_stats, monkeypatch):
+    calls = []
+    create_managers = Leona._create_managers
+    def count_calls(self, *args):
+        calls.append(self)
+        create_managers(self, *args)
+    monkeypatch.setattr(Leona, "_create_managers", count_calls)
+    
+    l = Leona(get_stats(), partition_by=("queueId",), spill_threshold=1 << 30, spill_directory=str(tmp_path))
+    l.push_matches(match_set_2)
+    
+    # The managers of each partition are created once, with the options of the partition
+    assert len(calls) == 1 + len(l.get_partitions())
+    assert all([m._spill is not None for p in l._partitions.values() for m in p._stats_manager.values()])
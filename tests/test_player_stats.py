@@ -1,5 +1,5 @@
 from solari import Leona
-from solari.stats import PlayerKDA, PlayerKillParticipation, PlayerGeneric, PlayerGenericPerMin
+from solari.stats import PlayerKDA, PlayerKillParticipation, PlayerGeneric, PlayerGenericPerMin, PlayerTeamShare
 
 
 def test_player_kda(match_set_2):
@@ -247,4 +247,24 @@ def test_player_generic_perMin_rename(match_set_2):
     stats = l.get_stats()
     assert stats["GoldPerMinute"].loc["CBPXs9Y9aqWlx60eg5XuDfCaX2Frfqz2rBHBPC9kGSN3QtA"] == (
         (14925 * 60 /2163) + (4780 * 60 /912) + (7789 * 60 /1706)
-    ) / 3
\ No newline at end of file
+    ) / 3
+    
+def test_player_team_share_by_champion(match_set_2):
+    l = Leona([
+        PlayerTeamShare("goldEarned", by_champion=True)
+    ])
+    
+    for m in match_set_2:
+        l.push_match(m)
+        
+    stats = l.get_stats()
+    
+    shares = {}
+    for m in match_set_2:
+        ids = {i["participantId"]:i["player"]["summonerId"] for i in m["participantIdentities"]}
+        for p in m["participants"]:
+            total = sum([t["stats"]["goldEarned"] for t in m["participants"] if t["teamId"] == p["teamId"]])
+            shares.setdefault((ids[p["participantId"]], p["championId"]), []).append(p["stats"]["goldEarned"] / total)
+    
+    for k, v in list(shares.items())[:20]:
+        assert abs(stats["goldEarnedShare"].loc[k] - sum(v) / len(v)) < 1e-12
@@ -1,3 +1,5 @@
+import numpy as np
+import pandas as pd
 from solari import Leona
 from solari.solari import RankManager
 
@@ -27,4 +29,53 @@ def test_set_players_rank():
     
     rm.set_players_rank({"player":"rank"})
     
-    assert rm.get_rank("player") == "rank"
\ No newline at end of file
+    assert rm.get_rank("player") == "rank"
+    
+def test_get_ranks():
+    rm = RankManager()
+    
+    rm.set_rank("player","rank")
+    codes = rm.get_interner().encode(["player_2","player"])
+    
+    assert list(rm.get_ranks(codes)) == ["UNRANKED","rank"]
+    
+    # Ranks set afterward are taken into account
+    rm.set_rank("player_2","rank_2")
+    assert list(rm.get_ranks(codes)) == ["rank_2","rank"]
+    
+def test_get_rank_codes():
+    rm = RankManager()
+    
+    rm.set_rank("player","GOLD")
+    rm.set_rank("player_2","rank")
+    codes = rm.get_interner().encode(["player","player_2","player_3"])
+    
+    rank_codes = rm.get_rank_codes(codes)
+    assert rank_codes.dtype == np.int8
+    
+    # Known tiers are ordered, other ranks come after them
+    tiers = rm.get_tiers()
+    assert tiers.index("IRON") < tiers.index("GOLD") < tiers.index("CHALLENGER") < tiers.index("rank")
+    assert [tiers[c] for c in rank_codes] == ["GOLD","rank","UNRANKED"]
+    
+def test_get_ranks_categorical():
+    rm = RankManager()
+    
+    rm.set_rank("player","DIAMOND")
+    codes = rm.get_interner().encode(["player","player_2"])
+    
+    ranks = rm.get_ranks(codes)
+    assert isinstance(ranks, pd.Categorical)
+    assert ranks.ordered
+    assert list(ranks > "GOLD") == [True, False]
+    
+def test_set_rank_updates_cached_code():
+    rm = RankManager()
+    
+    codes = rm.get_interner().encode(["player","player_2"])
+    rm.get_rank_codes(codes)
+    
+    # Only the code of the player is changed, the cache is kept
+    rm.set_rank("player","SILVER")
+    assert rm._ranks is not None
+    assert list(rm.get_ranks(codes)) == ["SILVER","UNRANKED"]
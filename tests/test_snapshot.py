@@ -0,0 +1,133 @@
+import json
+import os
+import numpy as np
+import pandas as pd
+import pytest
+from solari import Leona
+from solari.exceptions import UnsupportedSnapshot
+from solari.stats import ChampionKDA
+from solari.stats import ChampionPickrate, ChampionWinrate
+
+def test_save_load(match_set_2, leagues, tmp_path, get_stats, assert_same_stats):
+    l = Leona(get_stats())
+    l.push_matches(match_set_2)
+    for i in leagues:
+        l.push_league(i)
+
+    l.save(str(tmp_path / "snapshot"))
+    l2 = Leona.load(str(tmp_path / "snapshot"))
+
+    assert l2.get_match_count() == l.get_match_count()
+    assert_same_stats(l.get_stats(), l2.get_stats())
+
+    # Rows are memory-mapped
+    buffer = l2._stats_manager[("championId",)]._stats_participants
+    assert isinstance(buffer.get_column("championId").base, np.memmap)
+
+    # The interner is still shared by the ranks and the extraction
+    assert l2._extractor._interner is l2._rank_manager.get_interner()
+
+def test_load_push(match_set_2, tmp_path, get_stats, assert_same_stats):
+    l = Leona(get_stats())
+    l.push_matches(match_set_2)
+
+    l2 = Leona(get_stats())
+    l2.push_matches(match_set_2[:12])
+    l2.save(str(tmp_path / "snapshot"))
+
+    l2 = Leona.load(str(tmp_path / "snapshot"))
+    l2.push_matches(match_set_2[8:])
+
+    # The pushed games are restored along with the rows
+    assert l2.get_duplicate_count() == 4
+    assert_same_stats(l.get_stats(), l2.get_stats())
+
+    # Saving over the snapshot the rows are read from
+    l2.save(str(tmp_path / "snapshot"))
+    assert_same_stats(l.get_stats(), l2.get_stats())
+    assert_same_stats(l.get_stats(), Leona.load(str(tmp_path / "snapshot")).get_stats())
+
+def test_load_merge(match_set_2, tmp_path, get_stats, assert_same_stats):
+    l = Leona(get_stats())
+    l.push_matches(match_set_2)
+
+    for i in range(2):
+        shard = Leona(get_stats())
+        shard.push_matches(match_set_2[i * 10:(i + 1) * 10])
+        shard.save(str(tmp_path / ("shard_%d" % i)))
+
+    shards = [Leona.load(str(tmp_path / ("shard_%d" % i))) for i in range(2)]
+    shards[0].merge_all(shards[1:])
+
+    assert_same_stats(l.get_stats(), shards[0].get_stats())
+
+def test_save_load_spill(match_set_1, tmp_path, get_stats, assert_same_stats):
+    l = Leona(get_stats())
+    l2 = Leona(get_stats(), spill_threshold=1)
+
+    l.push_matches(match_set_1)
+    l2.push_matches(match_set_1, batch_size=1)
+    l2.save(str(tmp_path / "snapshot"))
+    l2 = Leona.load(str(tmp_path / "snapshot"))
+
+    assert all([len(m._spill) > 1 for m in l2._stats_manager.values()])
+    assert_same_stats(l.get_stats(), l2.get_stats())
+
+def test_load_merge_spill(match_set_2, tmp_path, get_stats, assert_same_stats):
+    l = Leona(get_stats())
+    l.push_matches(match_set_2)
+
+    for i in range(2):
+        shard = Leona(get_stats(), spill_threshold=1, spill_directory=str(tmp_path / "spill"))
+        shard.push_matches(match_set_2[i * 10:(i + 1) * 10], batch_size=3)
+        shard.save(str(tmp_path / ("shard_%d" % i)))
+
+    # Both snapshots are loaded with the same spill directory, without their chunks overwriting each other
+    shards = [Leona.load(str(tmp_path / ("shard_%d" % i))) for i in range(2)]
+    game_ids = [set(np.concatenate([b["participants"].get_column("gameId") for b in s._stats_manager[("championId",)]._iter_buffers()])) for s in shards]
+    assert game_ids[0] == set([m["gameId"] for m in match_set_2[:10]])
+    assert game_ids[1] == set([m["gameId"] for m in match_set_2[10:]])
+
+    shards[0].merge_all(shards[1:])
+
+    assert_same_stats(l.get_stats(), shards[0].get_stats())
+
+def test_save_load_aggregates(match_set_2, tmp_path, get_stats):
+    stats = [ChampionPickrate(), ChampionWinrate(), ChampionKDA()]
+    l = Leona(stats)
+    l2 = Leona(stats, keep_rows=False)
+
+    l.push_matches(match_set_2)
+    l2.push_matches(match_set_2)
+    l2.get_stats()
+    l2.save(str(tmp_path / "snapshot"))
+    l2 = Leona.load(str(tmp_path / "snapshot"))
+
+    assert l2._stats_manager[("championId",)]._rows_released
+    pd.testing.assert_frame_equal(l.get_stats(), l2.get_stats())
+
+def test_save_load_partitions(match_set_2, tmp_path, get_stats, assert_same_stats):
+    l = Leona(get_stats(), partition_by=("queueId",))
+    l.push_matches(match_set_2)
+    l.save(str(tmp_path / "snapshot"))
+    l2 = Leona.load(str(tmp_path / "snapshot"), mmap=False)
+
+    assert l2.get_partitions() == l.get_partitions()
+    assert_same_stats(l.get_stats(), l2.get_stats())
+
+    # Partitions still share the rank manager
+    assert all([p._rank_manager is l2._rank_manager for p in l2._partitions.values()])
+
+def test_load_unsupported(match_set_1, tmp_path, get_stats):
+    with pytest.raises(UnsupportedSnapshot):
+        Leona.load(str(tmp_path / "missing"))
+
+    l = Leona(get_stats())
+    l.push_matches(match_set_1)
+    l.save(str(tmp_path / "snapshot"))
+
+    with open(os.path.join(str(tmp_path / "snapshot"), "manifest.json"), "w") as f:
+        json.dump({"format":"solari", "version":0}, f)
+
+    with pytest.raises(UnsupportedSnapshot):
+        Leona.load(str(tmp_path / "snapshot"))
@@ -0,0 +1,78 @@
+from solari import Leona
+from solari.stats import ChampionPickrate, ChampionWinrate
+
+def count_computations(l):
+    counts = {k:0 for k in l.get_keys()}
+    for k, m in l._stats_manager.items():
+        def get_stats(m=m, k=k, compute=m._get_stats):
+            counts[k] += 1
+            return compute()
+        m._get_stats = get_stats
+    return counts
+
+def test_cache_hit(match_set_2):
+    l = Leona([
+        ChampionPickrate(),
+        ChampionWinrate()
+    ])
+    l.push_matches(match_set_2)
+    counts = count_computations(l)
+    
+    stats = l.get_stats()
+    stats2 = l.get_stats()
+    
+    assert counts[("championId",)] == 1
+    assert stats.equals(stats2)
+    
+    # Readers get their own copy
+    stats2["Pickrate"] = 0
+    assert l.get_stats().equals(stats)
+    
+def test_cache_push_match(match_set_2):
+    l = Leona([
+        ChampionPickrate()
+    ])
+    l.push_matches(match_set_2[:10])
+    counts = count_computations(l)
+    
+    stats = l.get_stats()
+    l.push_matches(match_set_2[10:])
+    
+    assert not stats.equals(l.get_stats())
+    assert counts[("championId",)] == 2
+    
+def test_cache_ranks(match_set_2, leagues):
+    l = Leona([
+        ChampionPickrate(),
+        ChampionPickrate(by_league=True)
+    ])
+    l.push_matches(match_set_2)
+    counts = count_computations(l)
+    
+    l.get_stats()
+    for i in leagues:
+        l.push_league(i)
+    l.get_stats()
+    l.set_players_rank({})
+    l.get_stats()
+    
+    # Only the stats by league depend on the ranks
+    assert counts[("championId",)] == 1
+    assert counts[("league","championId")] == 3
+    
+def test_cache_merge(match_set_2):
+    l = Leona([
+        ChampionPickrate()
+    ])
+    l2 = Leona([
+        ChampionPickrate()
+    ])
+    l.push_matches(match_set_2[:10])
+    l2.push_matches(match_set_2[10:])
+    counts = count_computations(l)
+    
+    l.get_stats()
+    l.merge(l2)
+    l.get_stats()
+    
+    assert counts[("championId",)] == 2
@@ -0,0 +1,119 @@
+import bz2
+import gzip
+import io
+import json
+import os
+import sys
+import pytest
+from solari import Leona
+from solari.stats import ChampionPickrate, ChampionWinrate
+from solari.streams import iter_matches
+
+MATCH_SET_1 = os.path.join(os.path.dirname(__file__), "data", "match_set_1.json")
+
+def test_iter_matches_json_array(match_set_1):
+    with open(MATCH_SET_1, "rb") as f:
+        # A small chunk size forces matches to be split between chunks
+        matches = list(iter_matches(f, chunk_size=100))
+    
+    assert [m["gameId"] for m in matches] == [m["gameId"] for m in match_set_1]
+    
+def test_iter_matches_ndjson(match_set_1):
+    stream = io.StringIO("\n".join([json.dumps(m) for m in match_set_1]) + "\n")
+    
+    matches = list(iter_matches(stream, chunk_size=1000))
+    
+    assert matches == match_set_1
+    
+def test_iter_matches_gzip(match_set_1):
+    data = gzip.compress("\n".join([json.dumps(m) for m in match_set_1]).encode("utf-8"))
+    
+    matches = list(iter_matches(io.BytesIO(data)))
+    
+    assert matches == match_set_1
+    
+def test_iter_matches_bz2_array(match_set_1):
+    data = bz2.compress(json.dumps(match_set_1).encode("utf-8"))
+    
+    matches = list(iter_matches(io.BytesIO(data)))
+    
+    assert matches == match_set_1
+    
+def test_iter_matches_zstd_frames(match_set_1, tmp_path):
+    zstandard = pytest.importorskip("zstandard")
+    
+    # Each match is compressed in its own frame, as when appending to a file
+    path = str(tmp_path / "matches.ndjson.zst")
+    with open(path, "wb") as f:
+        for m in match_set_1:
+            f.write(zstandard.ZstdCompressor().compress((json.dumps(m) + "\n").encode("utf-8")))
+    
+    with open(path, "rb") as f:
+        matches = list(iter_matches(f))
+    
+    assert matches == match_set_1
+    
+def test_iter_matches_zstd_missing(match_set_1, monkeypatch):
+    # The compressed stream is recognized, but can't be read without the package
+    monkeypatch.setitem(sys.modules, "zstandard", None)
+    
+    with pytest.raises(ImportError):
+        list(iter_matches(io.BytesIO(b"\x28\xb5\x2f\xfd" + bytes(16))))
+    
+def test_iter_matches_truncated(match_set_1):
+    stream = io.StringIO(json.dumps(match_set_1)[:-100])
+    
+    with pytest.raises(ValueError):
+        list(iter_matches(stream))
+    
+def test_iter_matches_corrupt(match_set_1):
+    lines = [json.dumps(m) for m in match_set_1] * 50
+    lines[len(lines) // 2] = lines[len(lines) // 2][:-10] + ", oops}"
+    stream = io.StringIO("\n".join(lines))
+
+    matches = iter_matches(stream, chunk_size=1000)
+    with pytest.raises(ValueError):
+        for i in range(len(lines)):
+            next(matches)
+    
+    # The error is raised without reading the rest of the stream
+    assert i == len(lines) // 2
+    assert stream.tell() <= len("\n".join(lines[:i + 1])) + 1000
+
+def test_iter_matches_small_chunks(match_set_1):
+    stream = io.StringIO("\n".join([json.dumps(m) for m in match_set_1]))
+    
+    assert list(iter_matches(stream, chunk_size=7)) == match_set_1
+    
+def test_leona_push_match_file(match_set_1, tmp_path):
+    l = Leona([
+        ChampionPickrate(),
+        ChampionWinrate()
+    ])
+    
+    for m in match_set_1:
+        l.push_match(m)
+    
+    path = tmp_path / "matches.ndjson.gz"
+    with gzip.open(path, "wt", encoding="utf-8") as f:
+        for m in match_set_1:
+            f.write(json.dumps(m) + "\n")
+    
+    l2 = Leona([
+        ChampionPickrate(),
+        ChampionWinrate()
+    ])
+    l2.push_match_file(path, batch_size=2)
+    
+    assert l2.get_match_count() == 3
+    assert l.get_stats().equals(l2.get_stats())
+    
+def test_leona_push_match_stream(match_set_1):
+    l = Leona([
+        ChampionPickrate()
+    ])
+    
+    with open(MATCH_SET_1, "rb") as f:
+        l.push_match_stream(f)
+    
+    assert l.get_match_count() == 3
@@ -0,0 +1,73 @@
+import pytest
+from datetime import timedelta
+from solari import Leona
+from solari.exceptions import MismatchingLeona
+from solari.stats import ChampionPickrate
+
+def in_window(matches, hours):
+    end = max([m["gameCreation"] for m in matches])
+    return [m for m in matches if m["gameCreation"] >= end - hours * 3600 * 1000]
+
+def test_window(match_set_2, leagues, get_stats, assert_same_stats):
+    matches = sorted(match_set_2, key=lambda m: m["gameCreation"])
+    
+    l = Leona(get_stats())
+    l2 = Leona(get_stats(), window=timedelta(hours=20))
+    for i in leagues:
+        l.push_league(i)
+        l2.push_league(i)
+    
+    l.push_matches(in_window(matches, 20))
+    
+    # Stats are requested while games enter and leave the window
+    for m in matches:
+        l2.push_match(m)
+        l2.get_stats()
+    
+    assert l2.get_match_count() == len(in_window(matches, 20))
+    assert_same_stats(l.get_stats(), l2.get_stats())
+    
+def test_window_unordered(match_set_2, get_stats, assert_same_stats):
+    l = Leona(get_stats())
+    l2 = Leona(get_stats(), window=timedelta(hours=20))
+    
+    l.push_matches(in_window(match_set_2, 20))
+    l2.push_matches(match_set_2, batch_size=4)
+    
+    assert_same_stats(l.get_stats(), l2.get_stats())
+    
+def test_window_old_game(match_set_2):
+    matches = sorted(match_set_2, key=lambda m: m["gameCreation"])
+    
+    l = Leona([ChampionPickrate()], window=timedelta(hours=20))
+    
+    l.push_matches(matches)
+    
+    # Games already out of the window are ignored
+    l.push_match(matches[0])
+    
+    assert l.get_match_count() == len(in_window(matches, 20))
+    assert l.get_duplicate_count() == 0
+    
+def test_window_merge(match_set_2, get_stats, assert_same_stats):
+    l = Leona(get_stats())
+    l2 = Leona(get_stats(), window=timedelta(hours=20))
+    l3 = Leona(get_stats(), window=timedelta(hours=20))
+    
+    l.push_matches(in_window(match_set_2, 20))
+    
+    # The newest games are only in l3, so the window of l2 moves at merge
+    matches = sorted(match_set_2, key=lambda m: m["gameCreation"])
+    l2.push_matches(matches[:16])
+    l3.push_matches(matches[10:])
+    l2.merge(l3)
+    
+    assert l2.get_match_count() == len(in_window(match_set_2, 20))
+    assert_same_stats(l.get_stats(), l2.get_stats())
+    
+def test_window_mismatch():
+    l = Leona([ChampionPickrate()], window=timedelta(hours=20))
+    l2 = Leona([ChampionPickrate()])
+    
+    with pytest.raises(MismatchingLeona):
+        l.merge(l2)